@@ -0,0 +1,368 @@
+"""
+HTTP load benchmark for the API.
+
+Seeds a SQLite database with owners, tenants, properties, bookings and
+invoices, boots the app under uvicorn in a background thread and drives the
+key routes with concurrent clients. Reports latency percentiles, throughput
+and SQL queries per request for every route as JSON keyed by git commit, so
+runs on different commits can be compared.
+
+    cd app
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/api_benchmark.py --properties 2000 --concurrency 32 --output before.json
+    python benchmarks/api_benchmark.py --reuse --compare before.json
+
+Pass ``--url`` to load an already running server (e.g. one backed by MySQL)
+instead; tokens are then minted with the local SECRET_KEY and queries per
+request are not reported.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+ROUTES = {
+    "search": ("tenant", "/properties/search", {"city": "Lahore", "limit": 20}),
+    "properties": ("anonymous", "/properties/", {"limit": 20}),
+    "my_bookings": ("owner", "/bookings/my-bookings", {}),
+    "my_invoices": ("tenant", "/invoices/my-invoices", {}),
+    "owner_report": ("owner", "/reports/owner", {}),
+}
+CITIES = ["Lahore", "Karachi", "Islamabad", "Rawalpindi", "Faisalabad", "Multan"]
+CHUNK = 20_000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the API routes")
+    parser.add_argument("--owners", type=int, default=20)
+    parser.add_argument("--tenants", type=int, default=200)
+    parser.add_argument("--properties", type=int, default=500)
+    parser.add_argument("--units-per-property", type=int, default=4)
+    parser.add_argument("--invoices-per-booking", type=int, default=6)
+    parser.add_argument("--requests", type=int, default=500, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per route")
+    parser.add_argument("--routes", default=",".join(ROUTES), help="comma separated subset of: " + ", ".join(ROUTES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "api_benchmark.sqlite"))
+    parser.add_argument("--reuse", action="store_true", help="keep an existing database instead of reseeding")
+    parser.add_argument("--url", help="benchmark a running server instead of booting one")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="previous JSON report to print deltas against")
+    return parser.parse_args()
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=APP_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _insert_chunked(connection, model, rows) -> None:
+    from sqlalchemy import insert
+
+    for start in range(0, len(rows), CHUNK):
+        connection.execute(insert(model), rows[start:start + CHUNK])
+
+
+def seed(args) -> dict:
+    """Fill the benchmark database. Returns the seeded user emails."""
+    from database.init import Base, SessionLocal, engine
+    from database.models import Booking, Floor, Invoice, Property, Unit, User
+    from enums.booking_status import BookingStatus
+    from enums.invoice_status import InvoiceStatus
+    from enums.property_type import PropertyType
+    from enums.unit_type import UnitType
+    from services.report_service import ReportService
+
+    owners = [f"owner{i}@example.com" for i in range(args.owners)]
+    tenants = [f"tenant{i}@example.com" for i in range(args.tenants)]
+    Base.metadata.create_all(engine)
+    if args.reuse and SessionLocal().query(User).count():
+        SessionLocal.remove()
+        return {"owner": owners, "tenant": tenants}
+    SessionLocal.remove()
+
+    rng = random.Random(args.seed)
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        _insert_chunked(connection, User, [
+            {"name": email.split("@")[0], "email": email, "hashed_password": "x", "city": rng.choice(CITIES)}
+            for email in owners + tenants
+        ])
+        owner_ids = range(1, args.owners + 1)
+        tenant_ids = list(range(args.owners + 1, args.owners + args.tenants + 1))
+
+        _insert_chunked(connection, Property, [
+            {
+                "name": f"Property {i}", "city": rng.choice(CITIES), "property_type": rng.choice(list(PropertyType)),
+                "address": f"{i} Main road", "total_area": 500.0, "monthly_rent": rng.randint(20, 300) * 1000,
+                "is_published": rng.random() < 0.9, "owner_id": rng.choice(owner_ids), "is_occupied": False,
+            }
+            for i in range(args.properties)
+        ])
+        _insert_chunked(connection, Floor, [
+            {"number": 1, "name": "Ground", "property_id": p} for p in range(1, args.properties + 1)
+        ])
+        _insert_chunked(connection, Unit, [
+            {
+                "property_id": p, "floor_id": p, "name": f"U{p}-{u}", "unit_type": rng.choice(list(UnitType)),
+                "area": 50.0, "monthly_rent": rng.randint(5, 80) * 1000, "is_occupied": False,
+            }
+            for p in range(1, args.properties + 1)
+            for u in range(args.units_per_property)
+        ])
+
+        # Each tenant books a few units, each booking has a run of monthly invoices
+        bookings = []
+        units = args.properties * args.units_per_property
+        for tenant_id in tenant_ids:
+            for _ in range(rng.randint(1, 3)):
+                unit_id = rng.randint(1, units)
+                start = today - timedelta(days=30 * args.invoices_per_booking)
+                bookings.append({
+                    "tenant_id": tenant_id, "property_id": (unit_id - 1) // args.units_per_property + 1,
+                    "floor_id": (unit_id - 1) // args.units_per_property + 1, "unit_id": unit_id,
+                    "start_date": start, "end_date": start + timedelta(days=365), "total_price": 120_000.0,
+                    "status": rng.choice(list(BookingStatus)).value, "created_at": start,
+                })
+        _insert_chunked(connection, Booking, bookings)
+
+        statuses = [status.value for status in InvoiceStatus]
+        _insert_chunked(connection, Invoice, [
+            {
+                "booking_id": booking_id, "amount": 10_000.0, "due_date": today - timedelta(days=30 * m),
+                "status": rng.choice(statuses), "reference_number": f"{booking_id:05d}{m:03d}",
+                "month": (today - timedelta(days=30 * m)).date().replace(day=1),
+            }
+            for booking_id in range(1, len(bookings) + 1)
+            for m in range(args.invoices_per_booking)
+        ])
+
+    db = SessionLocal()
+    try:
+        ReportService(db).rebuild_rollups()
+    finally:
+        SessionLocal.remove()
+    print(f"Seeded {args.properties} properties, {len(bookings)} bookings in {time.perf_counter() - started:.1f}s")
+    return {"owner": owners, "tenant": tenants}
+
+
+class QueryCounter:
+    """Counts statements executed on the app engine while a route is loaded."""
+
+    def __init__(self, engine):
+        self.count = 0
+        self._lock = threading.Lock()
+        from sqlalchemy import event
+
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_):
+        with self._lock:
+            self.count += 1
+
+    def reset(self) -> int:
+        with self._lock:
+            count, self.count = self.count, 0
+        return count
+
+
+def boot_server():
+    """Start the app under uvicorn on a free port. Returns (server, thread, base url)."""
+    import socket
+
+    import uvicorn
+    import main
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise SystemExit("The server failed to start")
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+async def load_route(client, path, params, tokens, total, concurrency, rng):
+    """Send ``total`` requests with ``concurrency`` clients. Returns latencies and status counts."""
+    latencies, statuses = [], {}
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            headers = {"Authorization": f"Bearer {rng.choice(tokens)}"} if tokens else {}
+            started = time.perf_counter()
+            response = await client.get(path, params=params, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses
+
+
+def _summary(latencies, statuses, elapsed, queries):
+    ordered = sorted(latencies)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "requests": len(ordered),
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "rps": len(ordered) / elapsed if elapsed else None,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000,
+        "queries_per_request": queries / len(ordered) if queries is not None else None,
+    }
+
+
+async def run_routes(args, base_url, users, counter):
+    import httpx
+    from utils.dependencies import create_access_token
+
+    rng = random.Random(args.seed)
+    tokens = {
+        role: [create_access_token({"sub": email}) for email in emails]
+        for role, emails in users.items()
+    }
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        for name in args.routes.split(","):
+            role, path, params = ROUTES[name]
+            role_tokens = tokens.get(role, [])
+            await load_route(client, path, params, role_tokens, args.warmup, args.concurrency, rng)
+            _flush_buffers()
+            if counter:
+                counter.reset()
+
+            started = time.perf_counter()
+            latencies, statuses = await load_route(
+                client, path, params, role_tokens, args.requests, args.concurrency, rng
+            )
+            elapsed = time.perf_counter() - started
+            _flush_buffers()
+            results[name] = _summary(latencies, statuses, elapsed, counter.reset() if counter else None)
+
+            result = results[name]
+            print(
+                f"{name:13} {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f}ms  "
+                f"p95 {result['p95_ms']:7.1f}ms  p99 {result['p99_ms']:7.1f}ms  "
+                f"queries/req {result['queries_per_request'] if counter else '-'}  errors {result['errors']}"
+            )
+    return results
+
+
+def _flush_buffers():
+    # Count buffered search history writes against the route that produced them
+    if "services.search_history_service" in sys.modules:
+        sys.modules["services.search_history_service"].search_history_buffer.flush()
+
+
+def compare(report, previous_path):
+    with open(previous_path) as f:
+        previous = json.load(f)
+    print(f"\nChange vs {previous['meta']['git_commit'] or previous_path}:")
+    for name, result in report["routes"].items():
+        before = previous.get("routes", {}).get(name)
+        if not before:
+            continue
+        deltas = []
+        for key in ("rps", "p50_ms", "p95_ms", "p99_ms", "queries_per_request"):
+            if result.get(key) is not None and before.get(key):
+                deltas.append(f"{key} {100 * (result[key] - before[key]) / before[key]:+.1f}%")
+        print(f"  {name:13} " + "  ".join(deltas))
+
+
+def main() -> int:
+    args = parse_args()
+    unknown = set(args.routes.split(",")) - set(ROUTES)
+    if unknown:
+        raise SystemExit(f"Unknown routes: {', '.join(sorted(unknown))}")
+
+    if not args.url:
+        if not args.reuse and os.path.exists(args.db):
+            os.remove(args.db)
+        # Configure the app before any of its modules are imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+        os.environ.setdefault("SCHEMA_CHECK_MODE", "off")
+        os.environ.setdefault("RECOMMENDER_REFRESH_ON_STARTUP", "false")
+        # main.py writes app.log and uploads/ to the working directory
+        os.chdir(tempfile.mkdtemp(prefix="api_benchmark_"))
+
+    counter = None
+    server = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+        users = {
+            "owner": [f"owner{i}@example.com" for i in range(args.owners)],
+            "tenant": [f"tenant{i}@example.com" for i in range(args.tenants)],
+        }
+    else:
+        users = seed(args)
+        from database.init import engine
+
+        counter = QueryCounter(engine)
+        server, thread, base_url = boot_server()
+
+    try:
+        results = asyncio.run(run_routes(args, base_url, users, counter))
+    finally:
+        if server:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+    report = {
+        "meta": {
+            "git_commit": _git("rev-parse", "--short", "HEAD"),
+            "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.url or "sqlite",
+        },
+        "params": {
+            key: getattr(args, key)
+            for key in ("owners", "tenants", "properties", "units_per_property", "invoices_per_booking",
+                        "requests", "concurrency", "warmup", "seed")
+        },
+        "routes": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+    return 1 if any(result["errors"] for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Import-time benchmark for the API worker.
+
+Imports ``main`` in a fresh interpreter with ``python -X importtime``, runs the
+app's startup hooks and waits for the threads they start, then reports the
+total import time, peak RSS and the slowest packages. The run fails when one
+of the heavy ML/LLM packages is imported by then or the import time exceeds
+the budget, so regressions show up in CI.
+
+    cd app
+    python benchmarks/import_time_benchmark.py --runs 3 --budget-ms 4000
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages that must only be imported when a recommendation or AI email is made
+LAZY_PACKAGES = ("pandas", "sklearn", "joblib", "scipy", "openai")
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+# Threads started by startup hooks that load modules or models
+STARTUP_THREADS = ("recommendation-refresh",)
+
+
+def measure(module: str, startup: bool = True) -> dict:
+    """
+    Import ``module`` once in a child interpreter, optionally run its app's
+    startup hooks, and parse the importtime log.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = APP_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    # Startup must not depend on a reachable database
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SCHEMA_CHECK_MODE", "off")
+
+    code = f"import resource, sys, threading; import {module}; "
+    if startup:
+        code += (
+            f"import asyncio; asyncio.run({module}.app.router.startup()); "
+            f"[t.join() for t in threading.enumerate() if t.name in {STARTUP_THREADS!r}]; "
+        )
+    code += "sys.stdout.write(str(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))"
+    with tempfile.TemporaryDirectory() as workdir:
+        # Run outside the app directory so app.log and uploads/ are not touched
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=workdir,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr[-4000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "top_level": len(indent) == 1,
+            })
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    max_rss = int(result.stdout.strip().splitlines()[-1])
+    rss_mb = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+    return {
+        "total_ms": sum(m["cumulative_ms"] for m in modules if m["top_level"]),
+        "rss_mb": rss_mb,
+        "modules": modules,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the import time of the API worker")
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to average over")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, help="fail when the median import time is higher")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file")
+    parser.add_argument(
+        "--skip-startup", action="store_true", help="only import the module, without running startup hooks"
+    )
+    args = parser.parse_args()
+
+    runs = [measure(args.module, startup=not args.skip_startup) for _ in range(args.runs)]
+    phase = "import" if args.skip_startup else "import + startup"
+    totals = [run["total_ms"] for run in runs]
+    last = runs[-1]
+    median = statistics.median(totals)
+
+    print(f"{phase} {args.module}: median {median:.0f}ms over {len(runs)} runs "
+          f"(min {min(totals):.0f}ms, max {max(totals):.0f}ms), peak RSS {last['rss_mb']:.0f}MB")
+    # Self time summed per top-level package: what each dependency costs in total
+    packages = {}
+    for entry in last["modules"]:
+        package = entry["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + entry["self_ms"]
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[: args.top]
+
+    print("\nSlowest packages (self time):")
+    for package, self_ms in slowest:
+        print(f"  {self_ms:9.1f}ms  {package}")
+
+    imported = {m["module"].split(".")[0] for m in last["modules"]}
+    eager = sorted(set(LAZY_PACKAGES) & imported)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "module": args.module,
+                "startup_hooks": not args.skip_startup,
+                "runs_ms": totals,
+                "median_ms": median,
+                "rss_mb": last["rss_mb"],
+                "eager_heavy_packages": eager,
+                "packages_ms": dict(slowest),
+            }, f, indent=2)
+
+    failed = False
+    if eager:
+        print(f"\nFAIL: imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"\nFAIL: median import time {median:.0f}ms is over the {args.budget_ms:.0f}ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+Benchmark for PropertyRecommendationSystem.
+
+Generates synthetic users, searches and properties into a SQLite file, then
+times model training, loading, single and batch matching, and reports the
+memory footprint. The report is JSON so runs on different commits can be
+compared.
+
+    cd app
+    python benchmarks/recommender_benchmark.py --searches 100000 --output bench.json
+    python benchmarks/recommender_benchmark.py --searches 1000000 --reuse
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, func, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database.init import Base  # noqa: E402
+from database.models import Property, SearchHistory, User  # noqa: E402
+from enums.property_type import PropertyType  # noqa: E402
+from services.property_recommendation_service import PropertyRecommendationSystem  # noqa: E402
+
+CITIES = [
+    "Lahore", "Karachi", "Islamabad", "Rawalpindi", "Faisalabad", "Multan", "Peshawar",
+    "Quetta", "Sialkot", "Gujranwala", "Hyderabad", "Abbottabad", "Bahawalpur", "Sargodha",
+]
+WORDS = [
+    "apartment", "office", "shop", "studio", "house", "villa", "penthouse", "room",
+    "luxury", "family", "furnished", "corner", "commercial", "garden", "downtown",
+    "plaza", "tower", "heights", "residency", "court", "market", "mall", "square",
+]
+CHUNK = 20_000
+
+
+def _rss_mb() -> float:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _phrase(rng: random.Random) -> str:
+    return " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+
+
+def _insert_chunked(connection, model, rows_iter) -> None:
+    batch = []
+    for row in rows_iter:
+        batch.append(row)
+        if len(batch) == CHUNK:
+            connection.execute(insert(model), batch)
+            batch = []
+    if batch:
+        connection.execute(insert(model), batch)
+
+
+def generate(engine, users: int, searches: int, properties: int, seed: int) -> float:
+    """Fill the database with synthetic data. Returns the elapsed seconds."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+
+    with engine.begin() as connection:
+        _insert_chunked(connection, User, (
+            {
+                "name": f"User {i}", "email": f"user{i}@bench.local",
+                "hashed_password": "x", "city": rng.choice(CITIES),
+            }
+            for i in range(users)
+        ))
+
+        def search_rows():
+            for _ in range(searches):
+                low = rng.choice([0, 0, 10_000, 25_000, 50_000])
+                seen = now - timedelta(minutes=rng.randint(0, 30 * 24 * 60 - 1))
+                yield {
+                    "user_id": rng.randint(1, users),
+                    "query_name": _phrase(rng) if rng.random() < 0.8 else None,
+                    "query_city": rng.choice(CITIES) if rng.random() < 0.9 else None,
+                    "monthly_rent_gt": low or None,
+                    "monthly_rent_lt": low + rng.choice([20_000, 50_000, 100_000, 500_000]),
+                    "created_at": seen,
+                    "last_seen_at": seen,
+                    "hit_count": 1,
+                }
+
+        _insert_chunked(connection, SearchHistory, search_rows())
+
+        _insert_chunked(connection, Property, (
+            {
+                "name": f"{_phrase(rng)} {i}".title(), "city": rng.choice(CITIES),
+                "property_type": PropertyType.APARTMENT, "address": "Main road",
+                "monthly_rent": rng.randint(5, 300) * 1000, "is_published": True,
+                "owner_id": rng.randint(1, users), "is_occupied": False,
+            }
+            for i in range(properties)
+        ))
+
+    return time.perf_counter() - started
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+    }
+
+
+def run(args) -> dict:
+    engine = create_engine(f"sqlite:///{args.db}")
+
+    @event.listens_for(engine, "connect")
+    def _fast_sqlite(dbapi_connection, _):
+        # Throwaway database: trade durability for generation speed
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=OFF")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.close()
+
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    existing = db.query(func.count(SearchHistory.id)).scalar()
+    generation_s = None
+    if not (args.reuse and existing == args.searches):
+        if existing:
+            db.close()
+            engine.dispose()
+            os.remove(args.db)
+            return run(args)
+        users = args.users or max(100, args.searches // 20)
+        print(f"Generating {users} users, {args.searches} searches, {args.properties} properties...")
+        generation_s = generate(engine, users, args.searches, args.properties, args.seed)
+
+    listings = [
+        {"id": p.id, "name": p.name, "city": p.city, "monthly_rent": p.monthly_rent}
+        for p in db.query(Property).order_by(Property.id).limit(args.match_samples)
+    ]
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        system = PropertyRecommendationSystem(model_path=model_dir)
+        rss_before = _rss_mb()
+
+        started = time.perf_counter()
+        system.train_model(db)
+        train_s = time.perf_counter() - started
+        rss_after_train = _rss_mb()
+
+        model_file = os.path.join(model_dir, "recommendation_model.pkl")
+        model_file_mb = os.path.getsize(model_file) / (1024 * 1024)
+
+        fresh = PropertyRecommendationSystem(model_path=model_dir)
+        started = time.perf_counter()
+        fresh.load_model()
+        load_s = time.perf_counter() - started
+
+        model = system.model
+        history_mb = model.search_history.memory_usage(deep=True).sum() / (1024 * 1024)
+        # Precomputed search vectors and batch matching are optional, so the
+        # same benchmark runs against recommender versions without them
+        vectors = getattr(model, "search_vectors", None)
+        vectors_mb = None
+        if vectors is not None:
+            vectors_mb = (vectors.data.nbytes + vectors.indices.nbytes + vectors.indptr.nbytes) / (1024 * 1024)
+
+        single = []
+        matched_users = 0
+        for listing in listings:
+            started = time.perf_counter()
+            matched_users += len(system.match_property_with_searches(listing))
+            single.append(time.perf_counter() - started)
+
+        batch_results = None
+        batch_s = None
+        if hasattr(system, "match_properties_with_searches"):
+            started = time.perf_counter()
+            batch_results = system.match_properties_with_searches(listings)
+            batch_s = time.perf_counter() - started
+
+    db.close()
+    return {
+        "meta": {
+            "git_commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "params": {
+            "searches": args.searches,
+            "properties": args.properties,
+            "match_samples": len(listings),
+            "seed": args.seed,
+        },
+        "results": {
+            "generation_s": generation_s,
+            "train_s": train_s,
+            "load_s": load_s,
+            "match_single": _percentiles(single) if single else None,
+            "match_batch": {
+                "total_ms": batch_s * 1000,
+                "per_property_ms": batch_s * 1000 / max(len(listings), 1),
+            } if batch_s is not None else None,
+            "matched_users": matched_users,
+            "batch_matches_agree": (
+                matched_users == sum(len(r) for r in batch_results) if batch_results is not None else None
+            ),
+            "memory": {
+                "rss_before_train_mb": rss_before,
+                "rss_peak_mb": rss_after_train,
+                "search_history_frame_mb": history_mb,
+                "search_vectors_mb": vectors_mb,
+                "model_file_mb": model_file_mb,
+            },
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the property recommender")
+    parser.add_argument("--searches", type=int, default=10_000, help="search history rows (10k-10M)")
+    parser.add_argument("--users", type=int, help="users (default: searches / 20)")
+    parser.add_argument("--properties", type=int, default=1_000)
+    parser.add_argument("--match-samples", type=int, default=200, help="properties to match")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "recommender_benchmark.sqlite"))
+    parser.add_argument("--reuse", action="store_true", help="reuse the database if it has the same size")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args)
+    results = report["results"]
+    single = results["match_single"] or {}
+    batch = results["match_batch"]
+    print(
+        f"train {results['train_s']:.2f}s, load {results['load_s']:.2f}s, "
+        f"match p50 {single.get('p50_ms', 0):.1f}ms p95 {single.get('p95_ms', 0):.1f}ms, "
+        + (f"batch {batch['per_property_ms']:.2f}ms/property, " if batch else "no batch matching, ")
+        + f"peak RSS {results['memory']['rss_peak_mb']:.0f}MB"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,106 @@ BASE_URL = os.getenv("BASE_URL", "http://localhost:8000")
 # Upload configuration
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
 
+# Response compression configuration
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_EXCLUDED_PATHS = [
+    path.strip()
+    for path in os.getenv("COMPRESSION_EXCLUDED_PATHS", f"/{UPLOAD_DIR}").split(",")
+    if path.strip()
+]
+
+# HTTP caching configuration (Cache-Control header per route)
+CACHE_CONTROL_PROPERTY_DETAIL = os.getenv(
+    "CACHE_CONTROL_PROPERTY_DETAIL", "public, max-age=0, must-revalidate"
+)
+CACHE_CONTROL_PROPERTY_LIST = os.getenv(
+    "CACHE_CONTROL_PROPERTY_LIST", "public, max-age=30, must-revalidate"
+)
+
+# Response cache configuration (REDIS_URL enables the shared tier)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+# Cached per-property interval index of unit bookings for calendar lookups;
+# keyed on a version every booking or unit write bumps in the database
+AVAILABILITY_CACHE_TTL_SECONDS = int(os.getenv("AVAILABILITY_CACHE_TTL_SECONDS", "300"))
+AVAILABILITY_CACHE_MAX_ENTRIES = int(os.getenv("AVAILABILITY_CACHE_MAX_ENTRIES", "2048"))
+
+# Booking creation holds a lock on the unit (SELECT ... FOR UPDATE) from the
+# availability check to the insert; deadlocks and lock wait timeouts are
+# retried up to BOOKING_LOCK_RETRIES times with a growing, jittered delay
+BOOKING_LOCK_RETRIES = int(os.getenv("BOOKING_LOCK_RETRIES", "3"))
+BOOKING_LOCK_RETRY_DELAY_MS = int(os.getenv("BOOKING_LOCK_RETRY_DELAY_MS", "50"))
+
+# Report rollups are rebuilt from the source tables every night at this UTC hour
+REPORT_ROLLUP_RECONCILE_HOUR = int(os.getenv("REPORT_ROLLUP_RECONCILE_HOUR", "3"))
+
+# Cache of finished months in the owner time series report
+REPORT_CLOSED_MONTH_CACHE_TTL_SECONDS = int(os.getenv("REPORT_CLOSED_MONTH_CACHE_TTL_SECONDS", "86400"))
+REPORT_CLOSED_MONTH_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CLOSED_MONTH_CACHE_MAX_ENTRIES", "4096"))
+
+# Recommendation model: API workers load the persisted model on first use and
+# reload it whenever the file changes; the job worker retrains it when it
+# starts; REFRESH_ON_STARTUP makes every API worker retrain it too.
+# /health/ready reports the model as stale once it is older than
+# MAX_AGE_MINUTES
+RECOMMENDER_REFRESH_ON_STARTUP = os.getenv("RECOMMENDER_REFRESH_ON_STARTUP", "false").lower() == "true"
+RECOMMENDER_MODEL_MAX_AGE_MINUTES = int(os.getenv("RECOMMENDER_MODEL_MAX_AGE_MINUTES", "1440"))
+
+# Scheduled jobs (new listing recommendations, nightly report rollup rebuild,
+# search history compaction) run in the single process started with
+# `python manage.py worker`. Enable to run them in the API process instead,
+# e.g. a one-process development server; never with several API workers
+BACKGROUND_JOBS_ENABLED = os.getenv("BACKGROUND_JOBS_ENABLED", "false").lower() == "true"
+
+# Search history events are buffered in memory and written in bulk every
+# FLUSH_ROWS events or FLUSH_INTERVAL_MS, whichever comes first
+SEARCH_HISTORY_BUFFER_ENABLED = os.getenv("SEARCH_HISTORY_BUFFER_ENABLED", "true").lower() == "true"
+SEARCH_HISTORY_BUFFER_CAPACITY = int(os.getenv("SEARCH_HISTORY_BUFFER_CAPACITY", "10000"))
+SEARCH_HISTORY_FLUSH_ROWS = int(os.getenv("SEARCH_HISTORY_FLUSH_ROWS", "200"))
+SEARCH_HISTORY_FLUSH_INTERVAL_MS = int(os.getenv("SEARCH_HISTORY_FLUSH_INTERVAL_MS", "1000"))
+
+# Nightly search history compaction (UTC hour): repeated searches are merged
+# and searches not repeated within the retention window are deleted
+SEARCH_HISTORY_COMPACTION_HOUR = int(os.getenv("SEARCH_HISTORY_COMPACTION_HOUR", "4"))
+SEARCH_HISTORY_RETENTION_DAYS = int(os.getenv("SEARCH_HISTORY_RETENTION_DAYS", "90"))
+
+# Per-request SQL query counting: requests over WARN_THRESHOLD statements, or
+# repeating one statement N_PLUS_ONE_THRESHOLD times, are logged as warnings.
+# The counts are sent as X-DB-* response headers when QUERY_COUNTER_HEADERS is on.
+QUERY_COUNTER_ENABLED = os.getenv("QUERY_COUNTER_ENABLED", "true").lower() == "true"
+QUERY_COUNTER_HEADERS = os.getenv("QUERY_COUNTER_HEADERS", str(DEBUG)).lower() == "true"
+QUERY_COUNT_WARN_THRESHOLD = int(os.getenv("QUERY_COUNT_WARN_THRESHOLD", "50"))
+QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "5"))
+
+# Logging: records are queued and written by a background thread, as JSON
+# or text, to stdout and LOG_FILE (rotated by size or time; empty disables it)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_ROTATION = os.getenv("LOG_ROTATION", "size").lower()
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+SQL_LOG_LEVEL = os.getenv("SQL_LOG_LEVEL", "WARNING").upper()
+
+# Administrators (comma separated emails) may use operational endpoints
+ADMIN_EMAILS = {
+    email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()
+}
+
+# On-demand stack sampling profiler for admins (/profiling); sessions are
+# capped at PROFILING_MAX_SECONDS
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "true").lower() == "true"
+PROFILING_MAX_SECONDS = float(os.getenv("PROFILING_MAX_SECONDS", "300"))
+PROFILING_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILING_SAMPLE_INTERVAL_MS", "5"))
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 # Email configuration
@@ -40,7 +140,14 @@ EMAIL_FROM_NAME = os.getenv("EMAIL_FROM_NAME", "AI PRES")
 EMAIL_PORT = int(os.getenv("EMAIL_PORT", "1025"))
 EMAIL_SERVER = os.getenv("EMAIL_SERVER", "mailhog")
 
-# Database URL
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Database URL (DATABASE_URL overrides the MySQL settings, e.g. for scripts)
+DATABASE_URL = (
+    os.getenv("DATABASE_URL")
+    or f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+# Schema version check at startup: strict (refuse to start), warn or off.
+# The schema itself is managed with `python manage.py migrate`.
+SCHEMA_CHECK_MODE = os.getenv("SCHEMA_CHECK_MODE", "warn").lower()
 
 
@@ -12,8 +12,10 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
 
 def get_db():
-    db = SessionLocal()
+    # A session of its own per request: the scoped registry is keyed by thread,
+    # and async routes for concurrent requests all run on the event loop thread
+    db = SessionLocal.session_factory()
     try:
         yield db
     finally:
-        SessionLocal.remove()
+        db.close()
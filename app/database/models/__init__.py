@@ -8,6 +8,7 @@ from .invoice_line_item_model import InvoiceLineItem
 from .payment_model import Payment
 from .payment_method_model import PaymentMethod
 from .search_history_model import SearchHistory
+from .report_rollup_model import OwnerReportRollup, TenantReportRollup
 #         Generate a notification for a new {item_type} that matches your search criteria.
 
-__all__ = ["User", "Property", "Floor", "Unit", "PropertyImage", "UnitImage", "TenantRequest", "Booking", "Invoice", "InvoiceLineItem", "Payment", "PaymentMethod", "SearchHistory" ]    
\ No newline at end of file
+__all__ = ["User", "Property", "Floor", "Unit", "PropertyImage", "UnitImage", "TenantRequest", "Booking", "Invoice", "InvoiceLineItem", "Payment", "PaymentMethod", "SearchHistory", "OwnerReportRollup", "TenantReportRollup" ]    
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -8,6 +8,12 @@ from enums.booking_status import BookingStatus
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_property_status", "property_id", "status"),
+        Index("ix_bookings_tenant_status", "tenant_id", "status"),
+        # Availability checks: overlapping active bookings of a unit
+        Index("ix_bookings_unit_status_dates", "unit_id", "status", "start_date", "end_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(Integer, ForeignKey("users.id"), nullable=True)
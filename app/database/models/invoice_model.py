@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..init import Base
@@ -8,6 +8,11 @@ from enums.invoice_status import InvoiceStatus
 
 class Invoice(Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        # Report time series: invoices of a booking per billing month
+        Index("ix_invoices_booking_month_status", "booking_id", "month", "status"),
+        Index("ix_invoices_month", "month"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     booking_id = Column(Integer, ForeignKey("bookings.id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 
@@ -7,6 +7,11 @@ from enums.payment_status import PaymentStatus
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Owner/tenant reports: payments of a booking by status and month
+        Index("ix_payments_booking_status_date", "booking_id", "status", "payment_date"),
+        Index("ix_payments_invoice_id", "invoice_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     booking_id = Column(Integer, ForeignKey("bookings.id"), nullable=False)
@@ -7,6 +7,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Enum,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -18,6 +19,10 @@ from datetime import datetime, timezone
 
 class Unit(Base):
     __tablename__ = "units"
+    __table_args__ = (
+        Index("ix_units_floor_id", "floor_id"),
+        Index("ix_units_property_occupied", "property_id", "is_occupied"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     property_id = Column(Integer, ForeignKey("properties.id"))
@@ -60,6 +65,11 @@ class Floor(Base):
 
 class Property(Base):
     __tablename__ = "properties"
+    __table_args__ = (
+        Index("ix_properties_owner_occupied", "owner_id", "is_occupied"),
+        # Public listing: published properties paged by id
+        Index("ix_properties_published_id", "is_published", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), index=True)
@@ -74,6 +84,9 @@ class Property(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     is_occupied = Column(Boolean, default=False)
+    # Bumped by every write to the property's bookings or units; keys the
+    # cached availability index
+    availability_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     floors = relationship(
         "Floor", back_populates="property", cascade="all, delete-orphan"
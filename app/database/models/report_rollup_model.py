@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..init import Base
+
+
+class OwnerReportRollup(Base):
+    """Precomputed owner dashboard figures, one row per owner."""
+
+    __tablename__ = "owner_report_rollups"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    property_count = Column(Integer, nullable=False, default=0)
+    bookings_total = Column(Integer, nullable=False, default=0)
+    bookings_active = Column(Integer, nullable=False, default=0)
+    bookings_closed = Column(Integer, nullable=False, default=0)
+    upcoming_total = Column(Float, nullable=False, default=0.0)
+    payments_received = Column(Float, nullable=False, default=0.0)
+    payments_pending = Column(Float, nullable=False, default=0.0)
+    invoices_paid = Column(Integer, nullable=False, default=0)
+    invoices_overdue = Column(Integer, nullable=False, default=0)
+    # Bumped by every write to the owner's figures; keys the cached time series months
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<OwnerReportRollup(owner_id={self.owner_id})>"
+
+
+class TenantReportRollup(Base):
+    """Precomputed tenant dashboard figures, one row per tenant."""
+
+    __tablename__ = "tenant_report_rollups"
+
+    tenant_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    bookings_total = Column(Integer, nullable=False, default=0)
+    bookings_active = Column(Integer, nullable=False, default=0)
+    bookings_closed = Column(Integer, nullable=False, default=0)
+    upcoming_total = Column(Float, nullable=False, default=0.0)
+    payments_given = Column(Float, nullable=False, default=0.0)
+    payments_pending = Column(Float, nullable=False, default=0.0)
+    invoices_paid = Column(Integer, nullable=False, default=0)
+    invoices_overdue = Column(Integer, nullable=False, default=0)
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<TenantReportRollup(tenant_id={self.tenant_id})>"
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import datetime
 from datetime import timezone
 from database.init import Base
@@ -7,6 +8,11 @@ from database.models.user_model import User
 
 class SearchHistory(Base):
     __tablename__ = 'search_history'
+    __table_args__ = (
+        Index('ix_search_history_user_created', 'user_id', 'created_at'),
+        # Recommender training and retention read by last use across all users
+        Index('ix_search_history_last_seen_at', 'last_seen_at'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=True)
@@ -15,6 +21,9 @@ class SearchHistory(Base):
     monthly_rent_gt = Column(Float, nullable=True)
     monthly_rent_lt = Column(Float, nullable=True)
     created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    # Identical searches are collapsed by the compaction job into one row
+    hit_count = Column(Integer, nullable=False, default=1, server_default="1")
+    last_seen_at = Column(DateTime, default=func.now())
 
     user = relationship('User', back_populates='search_histories')
 
@@ -0,0 +1,79 @@
+import logging
+import os
+from typing import Any, Dict
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+from config import SCHEMA_CHECK_MODE
+from .init import engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised at startup when the database is not at the latest migration."""
+
+
+def alembic_config() -> Config:
+    return Config(ALEMBIC_INI)
+
+
+def head_revision() -> str:
+    """Latest migration shipped with the code, read from the migration files."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision() -> str:
+    """Migration the database is at, or None when it has never been migrated."""
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def check_schema_version(mode: str = SCHEMA_CHECK_MODE) -> Dict[str, Any]:
+    """
+    Compare the database revision with the latest migration.
+
+    This is a single read of the ``alembic_version`` table; creating or
+    altering tables is left to ``python manage.py migrate``.
+
+    Args:
+        mode: ``strict`` raises on a mismatch, ``warn`` logs it, ``off`` skips the check
+
+    Returns:
+        Dict: The mode, both revisions and whether the schema is up to date
+
+    Raises:
+        SchemaVersionError: In strict mode, if the schema is behind or unreadable
+    """
+    if mode == "off":
+        return {"mode": mode, "checked": False}
+
+    expected = head_revision()
+    try:
+        current = current_revision()
+    except Exception as e:
+        if mode == "strict":
+            raise SchemaVersionError(f"Could not read the schema version: {e}")
+        logger.warning(f"Could not read the schema version: {e}")
+        return {"mode": mode, "checked": False, "expected": expected, "error": str(e)}
+
+    status = {
+        "mode": mode,
+        "checked": True,
+        "current": current,
+        "expected": expected,
+        "up_to_date": current == expected,
+    }
+    if current != expected:
+        message = (
+            f"Database schema is at revision {current or 'none'}, expected {expected}. "
+            "Run `python manage.py migrate`."
+        )
+        if mode == "strict":
+            raise SchemaVersionError(message)
+        logger.warning(message)
+    return status
@@ -1,3 +1,4 @@
+from utils.startup import startup_timer
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -8,7 +9,20 @@ import os
 from config import UPLOAD_DIR
 
 from config import DEBUG, APP_HOST, APP_PORT
-from database.init import Base, engine
+from config import (
+    COMPRESSION_ENABLED,
+    COMPRESSION_MINIMUM_SIZE,
+    COMPRESSION_LEVEL,
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_EXCLUDED_PATHS,
+    QUERY_COUNTER_ENABLED,
+    QUERY_COUNTER_HEADERS,
+    QUERY_COUNT_WARN_THRESHOLD,
+    QUERY_N_PLUS_ONE_THRESHOLD,
+    PROFILING_ENABLED,
+    BACKGROUND_JOBS_ENABLED,
+)
+from database.schema import check_schema_version
 from routes import (
     auth_routes,
     property_routes,
@@ -19,7 +33,21 @@ from routes import (
     payment_routes,
     payment_method_routes,
     report_routes,
+    metrics_routes,
+    health_routes,
+    profiling_routes,
 )
+from middleware.compression import CompressionMiddleware
+from middleware.query_counter import QueryCounterMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.profiling import ProfilingMiddleware
+from middleware.request_id import RequestIdMiddleware
+from utils.logging_config import setup_logging, shutdown_logging
+from utils.metrics import register_state_collector
+from database.init import engine
+from services.search_history_service import search_history_buffer
+from services.report_service import register_rollup_maintenance
+from services.availability_service import register_availability_versioning
 
 import logging
 
@@ -30,18 +58,17 @@ def custom_json_encoder(obj: Any) -> Any:
     raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
+# Logging is written by a background thread, never on the event loop
+setup_logging()
 logger = logging.getLogger(__name__)
+startup_timer.mark("imports")
 
-Base.metadata.create_all(bind=engine)
+# Tables are created and altered by `python manage.py migrate`, not at import
+startup_timer.details["schema"] = check_schema_version()
+# Report rollups and availability versions follow every ORM write made by this worker
+register_rollup_maintenance()
+register_availability_versioning()
+startup_timer.mark("database")
 
 app = FastAPI(title="AI Pres API")
 
@@ -50,9 +77,11 @@ os.makedirs(uploads_dir, exist_ok=True)
 
 app.mount(f"/{UPLOAD_DIR}", StaticFiles(directory=uploads_dir), name=UPLOAD_DIR)
 
-# Initialize background tasks scheduler
-from services.background_tasks import BackgroundTasks
-background_tasks = BackgroundTasks()
+# Scheduled jobs run in the job worker (manage.py worker), not in every API worker
+if BACKGROUND_JOBS_ENABLED:
+    from services.background_tasks import BackgroundTasks
+    background_tasks = BackgroundTasks()
+startup_timer.mark("model_load")
 
 app.add_middleware(
     CORSMiddleware,
@@ -62,6 +91,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_MINIMUM_SIZE,
+        gzip_level=COMPRESSION_LEVEL,
+        brotli_quality=COMPRESSION_BROTLI_QUALITY,
+        excluded_paths=COMPRESSION_EXCLUDED_PATHS,
+    )
+
+if QUERY_COUNTER_ENABLED:
+    app.add_middleware(
+        QueryCounterMiddleware,
+        engine=engine,
+        expose_headers=QUERY_COUNTER_HEADERS,
+        warn_threshold=QUERY_COUNT_WARN_THRESHOLD,
+        n_plus_one_threshold=QUERY_N_PLUS_ONE_THRESHOLD,
+    )
+
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Outermost, so the latency includes compression and query counting
+app.add_middleware(MetricsMiddleware)
+# Set before anything below logs for the request
+app.add_middleware(RequestIdMiddleware)
+register_state_collector(engine)
+
 app.include_router(auth_routes.router)
 app.include_router(property_routes.router)
 app.include_router(image_routes.router)
@@ -71,6 +127,23 @@ app.include_router(invoice_routes.router)
 app.include_router(payment_routes.router)
 app.include_router(payment_method_routes.router)
 app.include_router(report_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(health_routes.router)
+if PROFILING_ENABLED:
+    app.include_router(profiling_routes.router)
+startup_timer.mark("routers")
+startup_timer.finish()
+
+@app.on_event("shutdown")
+def flush_search_history():
+    search_history_buffer.stop()
+
+
+@app.on_event("shutdown")
+def stop_logging():
+    # Registered last so records logged by the other shutdown hooks are written
+    shutdown_logging()
+
 
 @app.get("/")
 def read_root():
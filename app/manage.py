@@ -0,0 +1,100 @@
+"""
+Management commands.
+
+    python manage.py migrate              # upgrade the database to the latest migration
+    python manage.py migrate <revision>   # upgrade to a given revision
+    python manage.py downgrade <revision> # downgrade to a given revision ("base" drops everything)
+    python manage.py current              # print the database and code revisions
+    python manage.py makemigrations "msg" # autogenerate a migration from the models
+    python manage.py worker               # run the scheduled jobs; start exactly one
+"""
+
+import argparse
+import sys
+
+from alembic import command
+
+from database.schema import alembic_config, current_revision, head_revision
+
+
+def migrate(args) -> int:
+    command.upgrade(alembic_config(), args.revision)
+    return 0
+
+
+def downgrade(args) -> int:
+    command.downgrade(alembic_config(), args.revision)
+    return 0
+
+
+def current(args) -> int:
+    database, code = current_revision(), head_revision()
+    print(f"database: {database or 'none'}")
+    print(f"code:     {code}")
+    return 0 if database == code else 1
+
+
+def makemigrations(args) -> int:
+    command.revision(alembic_config(), message=args.message, autogenerate=True)
+    return 0
+
+
+def worker(args) -> int:
+    """
+    Run the scheduled jobs in this process: new listing recommendations,
+    the nightly report rollup rebuild and search history compaction. The
+    recommendation model is loaded and retrained in the background first.
+    """
+    import asyncio
+
+    from services.background_tasks import BackgroundTasks
+    from services.recommendation_provider import start_background_refresh
+    from services.availability_service import register_availability_versioning
+    from services.report_service import register_rollup_maintenance
+    from utils.logging_config import setup_logging, shutdown_logging
+
+    async def run() -> None:
+        register_rollup_maintenance()
+        register_availability_versioning()
+        BackgroundTasks()
+        start_background_refresh()
+        await asyncio.Event().wait()
+
+    setup_logging()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_logging()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="AI Pres management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="apply migrations")
+    migrate_parser.add_argument("revision", nargs="?", default="head")
+    migrate_parser.set_defaults(func=migrate)
+
+    downgrade_parser = subparsers.add_parser("downgrade", help="revert migrations")
+    downgrade_parser.add_argument("revision")
+    downgrade_parser.set_defaults(func=downgrade)
+
+    current_parser = subparsers.add_parser("current", help="show schema revisions")
+    current_parser.set_defaults(func=current)
+
+    makemigrations_parser = subparsers.add_parser("makemigrations", help="create a migration")
+    makemigrations_parser.add_argument("message")
+    makemigrations_parser.set_defaults(func=makemigrations)
+
+    worker_parser = subparsers.add_parser("worker", help="run the scheduled jobs")
+    worker_parser.set_defaults(func=worker)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
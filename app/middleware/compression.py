@@ -0,0 +1,268 @@
+import gzip
+import threading
+import zlib
+from typing import Dict, Iterable, Optional
+
+from utils.routing import route_template
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+DEFAULT_EXCLUDED_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-brotli",
+    "application/pdf",
+    "application/octet-stream",
+)
+
+
+class CompressionStats:
+    """Thread-safe per-route counters for compressed responses."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, int]] = {}
+
+    def record(self, route: str, encoding: str, bytes_in: int, bytes_out: int) -> None:
+        with self._lock:
+            stats = self._routes.setdefault(
+                route,
+                {"responses": 0, "bytes_in": 0, "bytes_out": 0, "gzip": 0, "br": 0},
+            )
+            stats["responses"] += 1
+            stats["bytes_in"] += bytes_in
+            stats["bytes_out"] += bytes_out
+            stats[encoding] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return a copy of the counters with the compression ratio per route.
+
+        Returns:
+            Dict keyed by route template with byte counts, saved bytes and ratio
+        """
+        with self._lock:
+            routes = {route: dict(stats) for route, stats in self._routes.items()}
+
+        for stats in routes.values():
+            stats["bytes_saved"] = stats["bytes_in"] - stats["bytes_out"]
+            stats["ratio"] = (
+                round(stats["bytes_out"] / stats["bytes_in"], 4)
+                if stats["bytes_in"]
+                else 1.0
+            )
+        return routes
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with brotli (when installed) or gzip.
+
+    Responses smaller than ``minimum_size``, responses that already carry a
+    Content-Encoding, already-compressed media types and excluded path
+    prefixes (static uploads) are sent untouched.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        excluded_paths: Iterable[str] = (),
+        excluded_content_types: Iterable[str] = DEFAULT_EXCLUDED_CONTENT_TYPES,
+        stats: CompressionStats = compression_stats,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_paths = tuple(p for p in excluded_paths if p)
+        self.excluded_content_types = tuple(excluded_content_types)
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def select_encoding(self, scope) -> Optional[str]:
+        """Pick the best encoding the client accepts, preferring brotli."""
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1").lower()
+                break
+
+        accepted = set()
+        for part in accept_encoding.split(","):
+            token, _, params = part.strip().partition(";")
+            params = params.replace(" ", "")
+            if params.startswith("q="):
+                try:
+                    if float(params[2:]) <= 0:
+                        continue
+                except ValueError:
+                    pass
+            accepted.add(token.strip())
+
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def is_compressible(self, headers: Dict[str, str]) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return not content_type.startswith(self.excluded_content_types)
+
+    def compressor(self, encoding: str):
+        if encoding == "br":
+            return brotli.Compressor(quality=self.brotli_quality)
+        # wbits=31 produces a gzip container instead of a raw zlib stream
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope, send, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self.downstream_send = send
+        self.encoding = encoding
+        self.start_message = None
+        self.headers: Dict[str, str] = {}
+        self.passthrough = False
+        self.streamer = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            self.headers = {
+                name.decode("latin-1").lower(): value.decode("latin-1")
+                for name, value in message.get("headers", [])
+            }
+            status = message["status"]
+            self.passthrough = (
+                status < 200
+                or status in (204, 304)
+                or not self.middleware.is_compressible(self.headers)
+            )
+            return
+
+        if message_type != "http.response.body":
+            await self.downstream_send(message)
+            return
+
+        if self.passthrough:
+            await self._flush_start()
+            await self.downstream_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.streamer is None and not more_body:
+            await self._send_whole(body)
+            return
+
+        await self._send_chunk(body, more_body)
+
+    async def _send_whole(self, body: bytes):
+        if len(body) < self.middleware.minimum_size:
+            await self._flush_start()
+            await self.downstream_send({"type": "http.response.body", "body": body})
+            return
+
+        compressed = self.middleware.compress(self.encoding, body)
+        self._set_encoding_headers(len(compressed))
+        await self._flush_start()
+        await self.downstream_send({"type": "http.response.body", "body": compressed})
+        self._record(len(body), len(compressed))
+
+    async def _send_chunk(self, body: bytes, more_body: bool):
+        if self.streamer is None:
+            self.streamer = self.middleware.compressor(self.encoding)
+            self._set_encoding_headers(None)
+            await self._flush_start()
+
+        if self.encoding == "br":
+            chunk = self.streamer.process(body)
+            if not more_body:
+                chunk += self.streamer.finish()
+        else:
+            chunk = self.streamer.compress(body)
+            chunk += self.streamer.flush(zlib.Z_FINISH if not more_body else zlib.Z_SYNC_FLUSH)
+
+        self.bytes_in += len(body)
+        self.bytes_out += len(chunk)
+        await self.downstream_send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+        if not more_body:
+            self._record(self.bytes_in, self.bytes_out)
+
+    def _set_encoding_headers(self, content_length: Optional[int]):
+        headers = [
+            (name, value)
+            for name, value in self.start_message.get("headers", [])
+            if name.lower() not in (b"content-length", b"vary", b"etag")
+        ]
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        etag = self.headers.get("etag")
+        if etag:
+            # The compressed bytes differ from the tagged representation
+            if not etag.startswith("W/"):
+                etag = f"W/{etag}"
+            headers.append((b"etag", etag.encode("latin-1")))
+        vary = self.headers.get("vary")
+        if vary and "accept-encoding" not in vary.lower():
+            vary = f"{vary}, Accept-Encoding"
+        headers.append((b"vary", (vary or "Accept-Encoding").encode("latin-1")))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+        self.start_message = {**self.start_message, "headers": headers}
+
+    async def _flush_start(self):
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            await self.downstream_send(start_message)
+
+    def _record(self, bytes_in: int, bytes_out: int):
+        if self.middleware.stats is not None:
+            self.middleware.stats.record(
+                route_template(self.scope), self.encoding, bytes_in, bytes_out
+            )
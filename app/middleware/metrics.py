@@ -0,0 +1,39 @@
+import time
+
+from utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+from utils.routing import route_template
+
+
+class MetricsMiddleware:
+    """
+    Record the latency of every HTTP request by route template and status,
+    and the number of requests in flight.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            HTTP_REQUEST_DURATION.labels(method, route_template(scope), str(status)).observe(
+                time.perf_counter() - started
+            )
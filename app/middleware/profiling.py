@@ -0,0 +1,28 @@
+from utils.profiler import Profiler, profiler as default_profiler
+
+
+class ProfilingMiddleware:
+    """
+    Mark requests that the active profiling session should sample.
+
+    Without an active session the request is passed straight through.
+    """
+
+    def __init__(self, app, profiler: Profiler = default_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        session = self.profiler.session
+        if session is None or not session.active or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not session.claim(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session.release()
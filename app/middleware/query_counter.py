@@ -0,0 +1,188 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from utils.metrics import DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST
+from utils.routing import route_template
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists ("IN (?, ?, ?)") render a different statement per list
+# length; collapse them so they count as one shape
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise a SQL statement so repeated executions of one query compare equal."""
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+
+
+class RequestQueries:
+    """Statements executed while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """Statement shapes executed at least ``threshold`` times: probable N+1s."""
+        return {shape: n for shape, n in self.shapes.most_common() if n >= threshold}
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+_installed = set()
+
+
+def install_query_listeners(engine: Engine) -> None:
+    """
+    Attribute every statement executed on ``engine`` to the current request.
+
+    Statements run outside a request (background jobs, buffer flush threads)
+    are ignored. Installing twice on the same engine is a no-op.
+    """
+    if id(engine) in _installed:
+        return
+    _installed.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        queries = _current.get()
+        if queries is None:
+            return
+        started = conn.info.get("query_started")
+        duration = time.perf_counter() - started.pop() if started else 0.0
+        queries.record(statement, duration)
+
+
+class QueryStats:
+    """Thread-safe per-route query counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, float]] = {}
+
+    def record(self, route: str, queries: RequestQueries, n_plus_one: bool) -> None:
+        with self._lock:
+            stats = self._routes.setdefault(
+                route,
+                {"requests": 0, "queries": 0, "max_queries": 0, "db_time_ms": 0.0, "n_plus_one": 0},
+            )
+            stats["requests"] += 1
+            stats["queries"] += queries.count
+            stats["max_queries"] = max(stats["max_queries"], queries.count)
+            stats["db_time_ms"] += queries.duration * 1000
+            stats["n_plus_one"] += int(n_plus_one)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return a copy of the counters with per-request averages.
+
+        Returns:
+            Dict keyed by route template with totals, averages and N+1 hits
+        """
+        with self._lock:
+            routes = {route: dict(stats) for route, stats in self._routes.items()}
+
+        for stats in routes.values():
+            stats["avg_queries"] = round(stats["queries"] / stats["requests"], 2)
+            stats["avg_db_time_ms"] = round(stats["db_time_ms"] / stats["requests"], 3)
+            stats["db_time_ms"] = round(stats["db_time_ms"], 3)
+        return routes
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+query_stats = QueryStats()
+
+
+class QueryCounterMiddleware:
+    """
+    Count the SQL statements and database time of every request.
+
+    A statement shape repeated ``n_plus_one_threshold`` times in one request
+    is reported as a probable N+1, and requests over ``warn_threshold``
+    statements are logged as warnings. With ``expose_headers`` (debug mode)
+    the counts are also sent as X-DB-* response headers.
+    """
+
+    def __init__(
+        self,
+        app,
+        engine: Engine,
+        expose_headers: bool = False,
+        warn_threshold: int = 50,
+        n_plus_one_threshold: int = 5,
+        stats: QueryStats = query_stats,
+    ):
+        self.app = app
+        self.expose_headers = expose_headers
+        self.warn_threshold = warn_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.stats = stats
+        install_query_listeners(engine)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and self.expose_headers:
+                repeated = queries.repeated(self.n_plus_one_threshold)
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(queries.count).encode("latin-1")))
+                headers.append((b"x-db-time-ms", f"{queries.duration * 1000:.2f}".encode("latin-1")))
+                if repeated:
+                    headers.append((b"x-db-n-plus-one", str(max(repeated.values())).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            self._report(scope, queries)
+
+    def _report(self, scope, queries: RequestQueries) -> None:
+        route = route_template(scope)
+        repeated = queries.repeated(self.n_plus_one_threshold)
+        if self.stats is not None:
+            self.stats.record(route, queries, bool(repeated))
+        DB_QUERIES_PER_REQUEST.labels(route).observe(queries.count)
+        DB_TIME_PER_REQUEST.labels(route).observe(queries.duration)
+
+        summary = (
+            f"{scope['method']} {route}: {queries.count} queries "
+            f"in {queries.duration * 1000:.1f}ms"
+        )
+        if repeated:
+            shape, times = next(iter(repeated.items()))
+            logger.warning(f"Probable N+1 on {summary}; {times}x {shape[:300]}")
+        elif queries.count > self.warn_threshold:
+            logger.warning(f"High query count on {summary}")
+        else:
+            logger.debug(summary)
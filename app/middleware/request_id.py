@@ -0,0 +1,46 @@
+import re
+import uuid
+
+from utils.logging_config import request_id_var
+
+# Accept IDs from a proxy or client, but nothing that could forge log lines
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Give every request a correlation ID for the logs.
+
+    An incoming X-Request-ID header is reused when it is well formed,
+    otherwise a new ID is generated. The ID is echoed in the response.
+    """
+
+    def __init__(self, app, header: str = "x-request-id"):
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = [(name, value) for name, value in message.get("headers", []) if name != self.header]
+                headers.append((self.header, request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,361 @@
+"""baseline schema
+
+Creates every table as ``Base.metadata.create_all`` used to. Tables that
+already exist are left alone, so databases that were bootstrapped by the app
+before migrations existed can simply be upgraded from here.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [
+    "users",
+    "payment_methods",
+    "properties",
+    "floors",
+    "units",
+    "property_images",
+    "unit_images",
+    "tenant_requests",
+    "bookings",
+    "invoices",
+    "invoice_line_items",
+    "payments",
+    "search_history",
+    "owner_report_rollups",
+    "tenant_report_rollups",
+]
+
+
+def _missing(bind, table: str) -> bool:
+    return not sa.inspect(bind).has_table(table)
+
+
+def _cyclic_foreign_keys(bind):
+    # tenant_requests and bookings reference each other. SQLite accepts a
+    # reference to a table that does not exist yet; other backends get the
+    # constraint added once bookings has been created.
+    if bind.dialect.name == "sqlite":
+        return [sa.ForeignKeyConstraint(["booking_id"], ["bookings.id"])]
+    return []
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    create_booking_fk = _missing(bind, "tenant_requests") and bind.dialect.name != "sqlite"
+
+    if _missing(bind, "users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=100), nullable=False),
+            sa.Column("email", sa.String(length=100), nullable=False),
+            sa.Column("cnic", sa.String(length=16), nullable=True),
+            sa.Column("gender", sa.String(length=10), nullable=True),
+            sa.Column("phone", sa.String(length=15), nullable=True),
+            sa.Column("nature_of_business", sa.String(length=100), nullable=True),
+            sa.Column("hashed_password", sa.String(length=100), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("city", sa.String(length=100), nullable=False),
+            sa.Column("booked_by_owner", sa.Boolean(), nullable=True),
+            sa.Column("created_by_owner_id", sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(["created_by_owner_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+        op.create_index("ix_users_id", "users", ["id"])
+
+    if _missing(bind, "payment_methods"):
+        op.create_table(
+            "payment_methods",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=100), nullable=True),
+            sa.Column("type", sa.Enum("JAZZCASH", "EASYPAISA", "CASH", name="paymentmethodtype"), nullable=True),
+            sa.Column("key", sa.String(length=100), nullable=True),
+            sa.Column("status", sa.Enum("ACTIVE", "INACTIVE", name="paymentmethodstatus"), nullable=True),
+            sa.Column("category", sa.Enum("MOBILE_WALLET", "CASH_PAYMENT", name="paymentmethodcategory"), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_payment_methods_id", "payment_methods", ["id"])
+        op.create_index("ix_payment_methods_key", "payment_methods", ["key"], unique=True)
+        op.create_index("ix_payment_methods_name", "payment_methods", ["name"])
+        op.create_index("ix_payment_methods_type", "payment_methods", ["type"])
+
+    if _missing(bind, "properties"):
+        op.create_table(
+            "properties",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=100), nullable=True),
+            sa.Column("city", sa.String(length=100), nullable=True),
+            sa.Column("property_type", sa.Enum("BUILDING", "HOUSE", "APARTMENT", name="propertytype"), nullable=True),
+            sa.Column("address", sa.String(length=255), nullable=True),
+            sa.Column("description", sa.String(length=2000), nullable=True),
+            sa.Column("total_area", sa.Float(), nullable=True),
+            sa.Column("monthly_rent", sa.Float(), nullable=True),
+            sa.Column("is_published", sa.Boolean(), nullable=True),
+            sa.Column("owner_id", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("is_occupied", sa.Boolean(), nullable=True),
+            sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_properties_id", "properties", ["id"])
+        op.create_index("ix_properties_name", "properties", ["name"])
+
+    if _missing(bind, "floors"):
+        op.create_table(
+            "floors",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("number", sa.Integer(), nullable=True),
+            sa.Column("name", sa.String(length=100), nullable=True),
+            sa.Column("description", sa.String(length=2000), nullable=True),
+            sa.Column("area", sa.Float(), nullable=True),
+            sa.Column("property_id", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["property_id"], ["properties.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_floors_id", "floors", ["id"])
+
+    if _missing(bind, "units"):
+        op.create_table(
+            "units",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("property_id", sa.Integer(), nullable=True),
+            sa.Column("floor_id", sa.Integer(), nullable=True),
+            sa.Column("name", sa.String(length=100), nullable=True),
+            sa.Column("unit_type", sa.Enum("OFFICE", "SHOP", "ROOM", name="unittype"), nullable=True),
+            sa.Column("area", sa.Float(), nullable=True),
+            sa.Column("description", sa.String(length=2000), nullable=True),
+            sa.Column("monthly_rent", sa.Integer(), nullable=False),
+            sa.Column("is_occupied", sa.Boolean(), nullable=True),
+            sa.Column("has_washroom", sa.Boolean(), nullable=True),
+            sa.Column("has_air_conditioning", sa.Boolean(), nullable=True),
+            sa.Column("has_internet", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["floor_id"], ["floors.id"]),
+            sa.ForeignKeyConstraint(["property_id"], ["properties.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_units_id", "units", ["id"])
+        op.create_index("ix_units_name", "units", ["name"])
+
+    if _missing(bind, "property_images"):
+        op.create_table(
+            "property_images",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("property_id", sa.Integer(), nullable=True),
+            sa.Column("image_path", sa.String(length=500), nullable=True),
+            sa.Column("is_thumbnail", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["property_id"], ["properties.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_property_images_id", "property_images", ["id"])
+
+    if _missing(bind, "unit_images"):
+        op.create_table(
+            "unit_images",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("unit_id", sa.Integer(), nullable=True),
+            sa.Column("image_path", sa.String(length=500), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["unit_id"], ["units.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_unit_images_id", "unit_images", ["id"])
+
+    if _missing(bind, "tenant_requests"):
+        op.create_table(
+            "tenant_requests",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("tenant_id", sa.Integer(), nullable=False),
+            sa.Column("owner_id", sa.Integer(), nullable=False),
+            sa.Column("property_id", sa.Integer(), nullable=True),
+            sa.Column("floor_id", sa.Integer(), nullable=True),
+            sa.Column("unit_id", sa.Integer(), nullable=True),
+            sa.Column("booking_id", sa.Integer(), nullable=True),
+            sa.Column("message", sa.Text(), nullable=True),
+            sa.Column("status", sa.String(length=50), nullable=False),
+            sa.Column("type", sa.String(length=50), nullable=False),
+            sa.Column("is_seen", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("preferred_move_in", sa.DateTime(), nullable=True),
+            sa.Column("monthly_offer", sa.Integer(), nullable=True),
+            sa.Column("start_date", sa.DateTime(), nullable=True),
+            sa.Column("end_date", sa.DateTime(), nullable=True),
+            sa.Column("contact_method", sa.String(length=50), nullable=True),
+            sa.ForeignKeyConstraint(["floor_id"], ["floors.id"]),
+            sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+            sa.ForeignKeyConstraint(["property_id"], ["properties.id"]),
+            sa.ForeignKeyConstraint(["tenant_id"], ["users.id"]),
+            sa.ForeignKeyConstraint(["unit_id"], ["units.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            *_cyclic_foreign_keys(bind),
+        )
+        op.create_index("ix_tenant_requests_id", "tenant_requests", ["id"])
+
+    if _missing(bind, "bookings"):
+        op.create_table(
+            "bookings",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("tenant_id", sa.Integer(), nullable=True),
+            sa.Column("property_id", sa.Integer(), nullable=False),
+            sa.Column("floor_id", sa.Integer(), nullable=True),
+            sa.Column("unit_id", sa.Integer(), nullable=True),
+            sa.Column("tenant_request_id", sa.Integer(), nullable=True),
+            sa.Column("booked_by_owner", sa.Boolean(), nullable=True),
+            sa.Column("start_date", sa.DateTime(), nullable=False),
+            sa.Column("end_date", sa.DateTime(), nullable=True),
+            sa.Column("total_price", sa.Float(), nullable=False),
+            sa.Column("status", sa.String(length=50), nullable=False),
+            sa.Column("notes", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["floor_id"], ["floors.id"]),
+            sa.ForeignKeyConstraint(["property_id"], ["properties.id"]),
+            sa.ForeignKeyConstraint(["tenant_id"], ["users.id"]),
+            sa.ForeignKeyConstraint(["tenant_request_id"], ["tenant_requests.id"]),
+            sa.ForeignKeyConstraint(["unit_id"], ["units.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_bookings_id", "bookings", ["id"])
+
+    if _missing(bind, "invoices"):
+        op.create_table(
+            "invoices",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("booking_id", sa.Integer(), nullable=True),
+            sa.Column("amount", sa.Float(), nullable=True),
+            sa.Column("due_date", sa.DateTime(), nullable=True),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("reference_number", sa.String(length=8), nullable=False),
+            sa.Column("month", sa.Date(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["booking_id"], ["bookings.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_invoices_id", "invoices", ["id"])
+        op.create_index("ix_invoices_reference_number", "invoices", ["reference_number"], unique=True)
+
+    if _missing(bind, "invoice_line_items"):
+        op.create_table(
+            "invoice_line_items",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("invoice_id", sa.Integer(), nullable=False),
+            sa.Column("description", sa.String(length=255), nullable=False),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["invoice_id"], ["invoices.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_invoice_line_items_id", "invoice_line_items", ["id"])
+
+    if _missing(bind, "payments"):
+        op.create_table(
+            "payments",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("booking_id", sa.Integer(), nullable=False),
+            sa.Column("invoice_id", sa.Integer(), nullable=True),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("payment_method_id", sa.Integer(), nullable=False),
+            sa.Column("transaction_id", sa.String(length=255), nullable=True),
+            sa.Column("status", sa.Enum("PENDING", "COMPLETED", "FAILED", "CANCELLED", name="paymentstatus"), nullable=False),
+            sa.Column("payment_date", sa.DateTime(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["booking_id"], ["bookings.id"]),
+            sa.ForeignKeyConstraint(["invoice_id"], ["invoices.id"]),
+            sa.ForeignKeyConstraint(["payment_method_id"], ["payment_methods.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("transaction_id"),
+        )
+        op.create_index("ix_payments_id", "payments", ["id"])
+
+    if _missing(bind, "search_history"):
+        op.create_table(
+            "search_history",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=True),
+            sa.Column("query_name", sa.String(length=100), nullable=True),
+            sa.Column("query_city", sa.String(length=100), nullable=True),
+            sa.Column("monthly_rent_gt", sa.Float(), nullable=True),
+            sa.Column("monthly_rent_lt", sa.Float(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_search_history_id", "search_history", ["id"])
+
+    if _missing(bind, "owner_report_rollups"):
+        op.create_table(
+            "owner_report_rollups",
+            sa.Column("owner_id", sa.Integer(), nullable=False),
+            sa.Column("property_count", sa.Integer(), nullable=False),
+            sa.Column("bookings_total", sa.Integer(), nullable=False),
+            sa.Column("bookings_active", sa.Integer(), nullable=False),
+            sa.Column("bookings_closed", sa.Integer(), nullable=False),
+            sa.Column("upcoming_total", sa.Float(), nullable=False),
+            sa.Column("payments_received", sa.Float(), nullable=False),
+            sa.Column("payments_pending", sa.Float(), nullable=False),
+            sa.Column("invoices_paid", sa.Integer(), nullable=False),
+            sa.Column("invoices_overdue", sa.Integer(), nullable=False),
+            sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(["owner_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("owner_id"),
+        )
+
+    if _missing(bind, "tenant_report_rollups"):
+        op.create_table(
+            "tenant_report_rollups",
+            sa.Column("tenant_id", sa.Integer(), nullable=False),
+            sa.Column("bookings_total", sa.Integer(), nullable=False),
+            sa.Column("bookings_active", sa.Integer(), nullable=False),
+            sa.Column("bookings_closed", sa.Integer(), nullable=False),
+            sa.Column("upcoming_total", sa.Float(), nullable=False),
+            sa.Column("payments_given", sa.Float(), nullable=False),
+            sa.Column("payments_pending", sa.Float(), nullable=False),
+            sa.Column("invoices_paid", sa.Integer(), nullable=False),
+            sa.Column("invoices_overdue", sa.Integer(), nullable=False),
+            sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(["tenant_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("tenant_id"),
+        )
+
+    if create_booking_fk:
+        op.create_foreign_key(
+            "fk_tenant_requests_booking_id", "tenant_requests", "bookings", ["booking_id"], ["id"]
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite" and not _missing(bind, "tenant_requests"):
+        for fk in sa.inspect(bind).get_foreign_keys("tenant_requests"):
+            if fk["referred_table"] == "bookings" and fk.get("name"):
+                op.drop_constraint(fk["name"], "tenant_requests", type_="foreignkey")
+
+    for table in reversed(TABLES):
+        if not _missing(bind, table):
+            op.drop_table(table)
@@ -0,0 +1,98 @@
+"""hot filter indexes
+
+Composite indexes shaped after the filters the services actually run. The
+leading columns are the equality filters, followed by the range or ordering
+column, so one index serves both the lookup and the sort.
+
+``properties.city`` is deliberately not indexed: the listing searches it with
+``LIKE '%city%'``, which no B-tree index can serve.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns). The first column of each index is also a foreign key,
+# so on MySQL the index takes over from the implicit foreign key index.
+INDEXES = [
+    # Overlap check when booking a unit, availability lookups
+    ("ix_bookings_unit_status_dates", "bookings", ["unit_id", "status", "start_date", "end_date"]),
+    # Owner reports and per-property booking lists filtered by status
+    ("ix_bookings_property_status", "bookings", ["property_id", "status"]),
+    # Tenant bookings and tenant reports
+    ("ix_bookings_tenant_status", "bookings", ["tenant_id", "status"]),
+    # Invoice generation checks (booking, month) and overdue/paid counts
+    ("ix_invoices_booking_month_status", "invoices", ["booking_id", "month", "status"]),
+    # Payment totals per booking and the monthly time series
+    ("ix_payments_booking_status_date", "payments", ["booking_id", "status", "payment_date"]),
+    ("ix_payments_invoice_id", "payments", ["invoice_id"]),
+    # Recent searches of a user, newest first
+    ("ix_search_history_user_created", "search_history", ["user_id", "created_at"]),
+    ("ix_units_floor_id", "units", ["floor_id"]),
+    # Vacant units of a property
+    ("ix_units_property_occupied", "units", ["property_id", "is_occupied"]),
+    # Owner property lists and vacancy counts
+    ("ix_properties_owner_occupied", "properties", ["owner_id", "is_occupied"]),
+]
+
+# Indexes whose first column is not a foreign key
+PLAIN_INDEXES = [
+    # Invoice generation job scans by month
+    ("ix_invoices_month", "invoices", ["month"]),
+    # Recommendation training window
+    ("ix_search_history_created_at", "search_history", ["created_at"]),
+    # Public listing: published properties paged by id
+    ("ix_properties_published_id", "properties", ["is_published", "id"]),
+]
+
+# Superseded by ix_properties_owner_occupied
+LEGACY_INDEXES = [
+    ("ix_properties_owner_id", "properties", ["owner_id"]),
+]
+
+
+def _index_names(bind, table: str) -> set:
+    return {index["name"] for index in sa.inspect(bind).get_indexes(table)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    for name, table, columns in INDEXES + PLAIN_INDEXES:
+        if name not in _index_names(bind, table):
+            op.create_index(name, table, columns)
+
+    for name, table, _ in LEGACY_INDEXES:
+        if name in _index_names(bind, table):
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    for name, table, columns in LEGACY_INDEXES:
+        if name not in _index_names(bind, table):
+            op.create_index(name, table, columns)
+
+    for name, table, columns in reversed(INDEXES + PLAIN_INDEXES):
+        existing = _index_names(bind, table)
+        if name not in existing:
+            continue
+        if bind.dialect.name == "mysql" and (name, table, columns) in INDEXES:
+            # MySQL refuses to drop the only index backing a foreign key
+            fallback = f"ix_{table}_{columns[0]}"
+            if fallback not in existing:
+                op.create_index(fallback, table, [columns[0]])
+        op.drop_index(name, table_name=table)
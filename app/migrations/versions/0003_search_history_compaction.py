@@ -0,0 +1,66 @@
+"""search history hit count and last seen
+
+Adds the columns the compaction job folds duplicate searches into, and moves
+the time index from created_at (first seen) to last_seen_at, which is what
+recommender training and retention filter on.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(bind) -> set:
+    return {column["name"] for column in sa.inspect(bind).get_columns("search_history")}
+
+
+def _indexes(bind) -> set:
+    return {index["name"] for index in sa.inspect(bind).get_indexes("search_history")}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = _columns(bind)
+
+    with op.batch_alter_table("search_history") as batch_op:
+        if "hit_count" not in columns:
+            batch_op.add_column(
+                sa.Column("hit_count", sa.Integer(), nullable=False, server_default="1")
+            )
+        if "last_seen_at" not in columns:
+            batch_op.add_column(sa.Column("last_seen_at", sa.DateTime(), nullable=True))
+
+    op.execute(
+        "UPDATE search_history SET last_seen_at = created_at WHERE last_seen_at IS NULL"
+    )
+
+    indexes = _indexes(bind)
+    if "ix_search_history_last_seen_at" not in indexes:
+        op.create_index("ix_search_history_last_seen_at", "search_history", ["last_seen_at"])
+    if "ix_search_history_created_at" in indexes:
+        op.drop_index("ix_search_history_created_at", table_name="search_history")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    indexes = _indexes(bind)
+    if "ix_search_history_created_at" not in indexes:
+        op.create_index("ix_search_history_created_at", "search_history", ["created_at"])
+    if "ix_search_history_last_seen_at" in indexes:
+        op.drop_index("ix_search_history_last_seen_at", table_name="search_history")
+
+    with op.batch_alter_table("search_history") as batch_op:
+        batch_op.drop_column("last_seen_at")
+        batch_op.drop_column("hit_count")
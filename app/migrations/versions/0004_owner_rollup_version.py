@@ -0,0 +1,40 @@
+"""owner rollup version
+
+Adds the counter that every write to an owner's figures bumps. The owner time
+series keys its cached months on it, so all workers see the same version
+instead of a per-process generation.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(bind) -> set:
+    return {column["name"] for column in sa.inspect(bind).get_columns("owner_report_rollups")}
+
+
+def upgrade() -> None:
+    if "version" in _columns(op.get_bind()):
+        return
+    with op.batch_alter_table("owner_report_rollups") as batch_op:
+        batch_op.add_column(
+            sa.Column("version", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("owner_report_rollups") as batch_op:
+        batch_op.drop_column("version")
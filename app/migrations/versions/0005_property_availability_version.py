@@ -0,0 +1,40 @@
+"""property availability version
+
+Adds the counter that every write to a property's bookings or units bumps.
+The availability calendar keys its cached interval indexes on it, so all
+workers see the same version instead of a per-process generation.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(bind) -> set:
+    return {column["name"] for column in sa.inspect(bind).get_columns("properties")}
+
+
+def upgrade() -> None:
+    if "availability_version" in _columns(op.get_bind()):
+        return
+    with op.batch_alter_table("properties") as batch_op:
+        batch_op.add_column(
+            sa.Column("availability_version", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("properties") as batch_op:
+        batch_op.drop_column("availability_version")
@@ -21,6 +21,7 @@ def build_response(
     message: str = None,
     data: Any = None,
     error: Optional[str] = None,
+    meta: Optional[dict] = None,
 ) -> Response:
     if status_code == 204:
         return Response(status_code=204)
@@ -60,6 +61,9 @@ def build_response(
     if error is not None:
         response["error"] = error
 
+    if meta is not None:
+        response["meta"] = meta
+
     return JSONResponse(
         content=response, 
         status_code=status_code, 
@@ -54,3 +54,13 @@ def forbidden_error(error: str = "Access denied"):
         error="forbidden",
         message=error,
     )
+
+
+def service_unavailable_error(error: str = "Service unavailable", data=None):
+    return build_response(
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        "failure",
+        error="service_unavailable",
+        message=error,
+        data=data,
+    )
@@ -1,3 +1,4 @@
+from fastapi import Response
 from .base import build_response
 from pydantic import BaseModel
 from typing import Any
@@ -11,5 +12,28 @@ def data_response(data=None):
     return build_response(200, data=data)
 
 
+def paginated_response(data=None, next_cursor: str = None, total: int = None):
+    meta = {"next_cursor": next_cursor}
+    if total is not None:
+        meta["total"] = total
+    return build_response(200, data=data, meta=meta)
+
+
 def empty_response():
     return build_response(204)
+
+
+def not_modified_response(etag: str, cache_control: str = None):
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=304, headers=headers)
+
+
+def cached_response(body: bytes, etag: str = None, cache_control: str = None):
+    headers = {"X-Cache": "HIT"}
+    if etag:
+        headers["ETag"] = etag
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 import traceback
@@ -63,16 +64,12 @@ async def get_my_bookings(
             db.query(Booking).filter(Booking.property_id.in_(owner_property_ids)).all()
         )
 
-        formatted_bookings = []
-        for booking in bookings:
-            response = booking_service.format_booking_response(booking, db)
+        formatted_bookings = booking_service.format_booking_responses(
+            db, bookings, owner_properties
+        )
+        for booking, response in zip(bookings, formatted_bookings):
             if booking.unit_id:
                 response["unit_id"] = generate_unit_id(booking.unit_id)
-            if booking.tenant_request and booking.tenant_request.unit_id:
-                response["tenant_request"]["unit_id"] = generate_unit_id(
-                    booking.tenant_request.unit_id
-                )
-            formatted_bookings.append(response)
         return data_response(formatted_bookings)
     except Exception as e:
         traceback.print_exc()
@@ -102,9 +99,7 @@ async def get_tenant_bookings(
                 )
                 .all()
             )
-            return data_response(
-                [booking_service.format_booking_response(b, db) for b in bookings]
-            )
+            return data_response(booking_service.format_booking_responses(db, bookings))
 
         if booking_service.is_property_owner(db, current_user.id):
             owner_properties = (
@@ -120,16 +115,12 @@ async def get_tenant_bookings(
                 )
                 .all()
             )
-            bookings_response = []
-            for b in bookings:
-                response = booking_service.format_booking_response(b, db)
+            bookings_response = booking_service.format_booking_responses(
+                db, bookings, owner_properties
+            )
+            for b, response in zip(bookings, bookings_response):
                 if b.unit_id:
                     response["unit_id"] = generate_unit_id(b.unit_id)
-                if b.tenant_request and b.tenant_request.unit_id:
-                    response["tenant_request"]["unit_id"] = generate_unit_id(
-                        b.tenant_request.unit_id
-                    )
-                bookings_response.append(response)
             return data_response(bookings_response)
 
         return forbidden_error("You are not authorized to view these bookings")
@@ -168,10 +159,9 @@ async def get_bookings_for_property(
         if not all_bookings:
             return data_response([])
 
-        formatted_bookings = [
-            booking_service.format_booking_response(booking, db, property_obj)
-            for booking in all_bookings
-        ]
+        formatted_bookings = booking_service.format_booking_responses(
+            db, all_bookings, [property_obj]
+        )
 
         return data_response(formatted_bookings)
     except Exception as e:
@@ -276,16 +266,19 @@ async def delete_booking(
         if not booking:
             return not_found_error(f"Booking {booking_id} not found")
 
-        result = booking_service.delete_booking(db, booking_id, current_user.id)
+        is_owner = bool(booking.property and booking.property.owner_id == current_user.id)
+        tenant_email = booking.tenant.email if booking.tenant else None
+
+        result = booking_service.delete(db, booking_id, current_user.id, is_owner)
         if not result:
             return not_found_error(
                 f"Booking with ID {booking_id} not found or you are not authorized to delete it."
             )
 
         # Send email to tenant about booking deletion
-        if booking.tenant and booking.tenant.email:
+        if tenant_email:
             await email_service.send_delete_action_email(
-                booking.tenant.email,
+                tenant_email,
                 "Booking",
                 booking_id
             )
@@ -330,7 +323,9 @@ async def create_bookings(
             ):
                 return conflict_error("Invalid unit or floor configuration")
 
-        created_booking = booking_service.create(
+        # Waits on the unit lock and sleeps between retries, so off the event loop
+        created_booking = await run_in_threadpool(
+            booking_service.create,
             db,
             booking_in,
             actual_tenant_id=booking_in.tenant_id,
@@ -0,0 +1,47 @@
+from fastapi import APIRouter
+from sqlalchemy import text
+
+from database.init import engine
+from responses.error import service_unavailable_error
+from responses.success import data_response
+from services.recommendation_provider import recommendation_status
+from utils.startup import startup_timer
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live")
+async def get_liveness():
+    """The worker is up and serving requests"""
+    return data_response({"status": "ok"})
+
+
+@router.get("/ready")
+def get_readiness():
+    """
+    Whether the worker can serve API traffic (database reachable).
+
+    The recommendation model is reported separately: a worker whose model is
+    still loading or stale is ready, it just returns fewer recommendations.
+    """
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        database = {"status": "ok"}
+    except Exception as e:
+        database = {"status": "unavailable", "error": str(e)}
+
+    report = {
+        "status": "ok" if database["status"] == "ok" else "unavailable",
+        "database": database,
+        "recommendation_model": recommendation_status(),
+    }
+    if database["status"] != "ok":
+        return service_unavailable_error("Database is unreachable", data=report)
+    return data_response(report)
+
+
+@router.get("/startup")
+async def get_startup_report():
+    """How long each phase of this worker's startup took, plus the schema check result"""
+    return data_response(startup_timer.report())
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import traceback
 import asyncio
 
@@ -17,8 +17,14 @@ from services.invoice_service import InvoiceService
 from services.booking_service import BookingService
 from utils.dependencies import get_current_user
 from utils import generate_property_id
-from responses.error import not_found_error, internal_server_error, forbidden_error
-from responses.success import data_response
+from responses.error import (
+    bad_request_error,
+    not_found_error,
+    internal_server_error,
+    forbidden_error,
+)
+from responses.success import data_response, paginated_response
+from utils.pagination import InvalidCursorError
 from schemas.auth_schema import UserMinimumResponse
 from services.email_service import EmailService
 
@@ -33,6 +39,9 @@ def format_invoice_response(db, invoice):
     Format an invoice into a consistent InvoiceResponse object with properly formatted
     booking, property, and tenant information.
 
+    Related rows are read through the relationships, so invoices loaded with
+    INVOICE_RESPONSE_OPTIONS are formatted without further queries.
+
     Args:
         db: Database session
         invoice: The invoice object to format
@@ -50,16 +59,12 @@ def format_invoice_response(db, invoice):
         mode="json"
     )
 
-    if booking.tenant_id:
-        tenant_user = db.query(User).filter(User.id == booking.tenant_id).first()
-        if tenant_user:
-            response.tenant = UserMinimumResponse.model_validate(tenant_user)
+    if booking.tenant_id and booking.tenant:
+        response.tenant = UserMinimumResponse.model_validate(booking.tenant)
 
-    property_obj = db.query(Property).filter(Property.id == booking.property_id).first()
-    if property_obj:
-        owner_obj = db.query(User).filter(User.id == property_obj.owner_id).first()
-        if owner_obj:
-            response.owner = UserMinimumResponse.model_validate(owner_obj)
+    property_obj = booking.property
+    if property_obj and property_obj.owner:
+        response.owner = UserMinimumResponse.model_validate(property_obj.owner)
 
     if (
         "property" in booking_data
@@ -76,18 +81,10 @@ def format_invoice_response(db, invoice):
 
     tenant_request = None
     if hasattr(booking, "tenant_request_id") and booking.tenant_request_id:
-        tenant_request = (
-            db.query(TenantRequest)
-            .filter(TenantRequest.id == booking.tenant_request_id)
-            .first()
-        )
+        tenant_request = booking.tenant_request
 
-        if tenant_request and not response.tenant and tenant_request.tenant_id:
-            tenant_user = (
-                db.query(User).filter(User.id == tenant_request.tenant_id).first()
-            )
-            if tenant_user:
-                response.tenant = UserMinimumResponse.model_validate(tenant_user)
+        if tenant_request and not response.tenant and tenant_request.tenant:
+            response.tenant = UserMinimumResponse.model_validate(tenant_request.tenant)
 
         if tenant_request and "property" not in booking_data:
             property_response = PropertyMinimumResponse.model_validate(
@@ -119,6 +116,23 @@ def format_invoice_response(db, invoice):
     return response
 
 
+def format_invoice_responses(db, invoices):
+    """
+    Format a page of invoices as JSON-ready dicts.
+
+    Args:
+        db: Database session
+        invoices: Invoices loaded with INVOICE_RESPONSE_OPTIONS
+
+    Returns:
+        List of dicts in the order of ``invoices``
+    """
+    return [
+        format_invoice_response(db, invoice).model_dump(mode="json")
+        for invoice in invoices
+    ]
+
+
 @router.post("/create_invoice", response_model=InvoiceResponse)
 async def create_invoice(
     invoice: InvoiceCreate,
@@ -149,22 +163,21 @@ async def create_invoice(
 def read_invoices(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     if not isinstance(current_user, User):
         return current_user
     try:
-        invoices = invoice_service.get_for_user(
-            db, current_user=current_user, skip=skip, limit=limit
+        page = invoice_service.get_for_user(
+            db, current_user=current_user, skip=skip, limit=limit, after=after
         )
 
-        formatted_invoices = []
-        for invoice in invoices:
-            response = format_invoice_response(db, invoice)
-            formatted_invoices.append(response.model_dump(mode="json"))
-
-        return data_response(formatted_invoices)
+        formatted_invoices = format_invoice_responses(db, page.items)
+        return paginated_response(formatted_invoices, page.next_cursor)
+    except InvalidCursorError as e:
+        return bad_request_error(str(e))
     except Exception as e:
         traceback.print_exc()
         return internal_server_error(str(e))
@@ -224,13 +237,7 @@ async def get_tenant_invoices(
             db, tenant_id
         )
         
-        # Format each invoice response
-        formatted_invoices = []
-        for invoice in invoices:
-            response = format_invoice_response(db, invoice)
-            formatted_invoices.append(response.model_dump(mode="json"))
-        
-        return data_response(formatted_invoices)
+        return data_response(format_invoice_responses(db, invoices))
 
     except Exception as e:
         traceback.print_exc()
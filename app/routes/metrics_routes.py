@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from middleware.compression import compression_stats
+from middleware.query_counter import query_stats
+from responses.success import data_response
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("")
+def get_prometheus_metrics():
+    """Prometheus exposition of this worker's metrics, for scraping"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@router.get("/compression")
+async def get_compression_metrics():
+    """Per-route response compression counters and ratios since worker start"""
+    return data_response(compression_stats.snapshot())
+
+
+@router.get("/queries")
+async def get_query_metrics():
+    """Per-route SQL query counts, database time and N+1 detections since worker start"""
+    return data_response(query_stats.snapshot())
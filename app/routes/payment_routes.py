@@ -4,7 +4,7 @@ from schemas.auth_schema import UserMinimumResponse
 from fastapi import APIRouter, Depends, HTTPException
 from starlette.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from database.init import get_db
 from database.models.user_model import User
@@ -16,8 +16,10 @@ from schemas.booking_response import PaymentResponse
 from services.email_service import EmailService
 from services.payment_service import PaymentService
 from utils.dependencies import get_current_user
-from responses.success import data_response
+from responses.success import data_response, paginated_response
+from utils.pagination import InvalidCursorError
 from responses.error import (
+    bad_request_error,
     not_found_error,
     conflict_error,
     forbidden_error,
@@ -189,6 +191,7 @@ def get_payments_for_booking_route(
     current_user=Depends(get_current_user),
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
 ):
     if not isinstance(current_user, User):
         return current_user
@@ -213,17 +216,20 @@ def get_payments_for_booking_route(
         traceback.print_exc()
         return internal_server_error(str(e))
 
-    payments = payment_service.get_payments_for_booking(db, booking_id, skip, limit)
-    
+    try:
+        page = payment_service.get_payments_for_booking(
+            db, booking_id, skip, limit, after=after
+        )
+    except InvalidCursorError as e:
+        return bad_request_error(str(e))
+
     payments_list = []
-    for p in payments:
+    for p in page.items:
         res = PaymentResponse.model_validate(p).model_dump(mode="json")
         res["owner"] = UserMinimumResponse.model_validate(property_obj.owner).model_dump(mode="json")
         res["tenant"] = UserMinimumResponse.model_validate(p.booking.tenant).model_dump(mode="json")
         payments_list.append(res)
-    return data_response(
-        payments_list
-    )
+    return paginated_response(payments_list, page.next_cursor)
 
 @router.get("/owner/me", response_model=List[PaymentResponse])
 def get_payments_for_owner_route(
@@ -231,20 +237,25 @@ def get_payments_for_owner_route(
     current_user=Depends(get_current_user),
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
 ):
     if not isinstance(current_user, User):
         return current_user
 
-    payments = payment_service.get_payments_for_owner(db, current_user.id, skip, limit)
+    try:
+        page = payment_service.get_payments_for_owner(
+            db, current_user.id, skip, limit, after=after
+        )
+    except InvalidCursorError as e:
+        return bad_request_error(str(e))
+
     payments_list = []
-    for p in payments:
+    for p in page.items:
         res = PaymentResponse.model_validate(p).model_dump(mode="json")
         res["owner"] = UserMinimumResponse.model_validate(current_user).model_dump(mode="json")
         res["tenant"] = UserMinimumResponse.model_validate(p.booking.tenant).model_dump(mode="json")
         payments_list.append(res)
-    return data_response(
-        payments_list
-    )
+    return paginated_response(payments_list, page.next_cursor)
 
 @router.get("/invoice/{invoice_id}", response_model=List[PaymentResponse])
 def get_payments_for_invoice_route(
@@ -253,6 +264,7 @@ def get_payments_for_invoice_route(
     current_user=Depends(get_current_user),
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
 ):
     if not isinstance(current_user, User):
         return current_user
@@ -284,16 +296,20 @@ def get_payments_for_invoice_route(
         traceback.print_exc()
         return internal_server_error(str(e))
 
-    payments = payment_service.get_payments_for_invoice(db, invoice_id, skip, limit)
+    try:
+        page = payment_service.get_payments_for_invoice(
+            db, invoice_id, skip, limit, after=after
+        )
+    except InvalidCursorError as e:
+        return bad_request_error(str(e))
+
     payments_list = []
-    for p in payments:
+    for p in page.items:
         res = PaymentResponse.model_validate(p).model_dump(mode="json")
         res["owner"] = UserMinimumResponse.model_validate(property_obj.owner).model_dump(mode="json")
         res["tenant"] = UserMinimumResponse.model_validate(p.booking.tenant).model_dump(mode="json")
         payments_list.append(res)
-    return data_response(
-        payments_list
-    )
+    return paginated_response(payments_list, page.next_cursor)
 
 
 @router.get("/user/me", response_model=List[PaymentResponse])
@@ -302,19 +318,25 @@ def get_my_payments(
     current_user=Depends(get_current_user),
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
 ):
     if not isinstance(current_user, User):
         return current_user
     try:
-        payments = payment_service.get_payments_by_user(
-            db, current_user.id, skip, limit
+        page = payment_service.get_payments_by_user(
+            db, current_user.id, skip, limit, after=after
         )
-        return data_response(
+        total = payment_service.count_payments_by_user(db, current_user.id)
+        return paginated_response(
             [
                 PaymentResponse.model_validate(p).model_dump(mode="json")
-                for p in payments
-            ]
+                for p in page.items
+            ],
+            page.next_cursor,
+            total,
         )
+    except InvalidCursorError as e:
+        return bad_request_error(str(e))
     except Exception as e:
         traceback.print_exc()
         return internal_server_error(str(e))
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from config import PROFILING_MAX_SECONDS, PROFILING_SAMPLE_INTERVAL_MS
+from database.models.user_model import User
+from responses.error import conflict_error, not_found_error
+from responses.success import data_response
+from schemas.profiling_schema import ProfilingStartRequest
+from utils.dependencies import admin_required
+from utils.profiler import profiler
+
+router = APIRouter(prefix="/profiling", tags=["Profiling"])
+
+
+@router.post("/start")
+async def start_profiling(payload: ProfilingStartRequest, current_user: User = Depends(admin_required)):
+    """
+    Start sampling the stacks of this worker for the next N requests matching
+    a route, or for a time window. Sessions never run longer than
+    PROFILING_MAX_SECONDS.
+    """
+    seconds = min(payload.seconds or PROFILING_MAX_SECONDS, PROFILING_MAX_SECONDS)
+    try:
+        session = profiler.start(
+            route=payload.route,
+            requests=payload.requests,
+            seconds=seconds,
+            interval_ms=payload.interval_ms or PROFILING_SAMPLE_INTERVAL_MS,
+        )
+    except RuntimeError as e:
+        return conflict_error(str(e))
+    return data_response(session.status())
+
+
+@router.post("/stop")
+async def stop_profiling(current_user: User = Depends(admin_required)):
+    """Stop the running session; its samples stay available"""
+    session = profiler.stop()
+    if session is None:
+        return not_found_error("No profiling session has been started")
+    return data_response(session.status())
+
+
+@router.get("")
+async def get_profiling_status(current_user: User = Depends(admin_required)):
+    """State of the current or last profiling session"""
+    if profiler.session is None:
+        return not_found_error("No profiling session has been started")
+    return data_response(profiler.session.status())
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def get_profile(current_user: User = Depends(admin_required)):
+    """
+    Samples of the current or last session in folded stack format:
+    pipe into flamegraph.pl or load into speedscope.app.
+    """
+    if profiler.session is None:
+        return not_found_error("No profiling session has been started")
+    return PlainTextResponse(profiler.session.folded())
@@ -1,19 +1,25 @@
+import logging
 from schemas.image_response import PropertyImageResponse, UnitImageResponse
 from database.models.user_model import User
 from database.models.image_model import PropertyImage, UnitImage
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
+from datetime import date, datetime, time, timedelta, timezone
+from dateutil.relativedelta import relativedelta
 from database.init import get_db
 from services.property_service import PropertyService
-from services.search_history_service import create_search_history
+from services.availability_service import AvailabilityService
+from services.cache_service import CachedResponse, property_listing_cache, property_tag
+from services.search_history_service import record_search
 from schemas.search_history_schema import SearchHistoryCreate
 from schemas.auth_schema import UserMinimumResponse
 from schemas.property_response import ItemsResponse
 from services.floor_service import FloorService
 from services.unit_service import UnitService
 from schemas.property_schema import PropertyCreate, FloorCreate, UnitCreate
+from schemas.availability_schema import PropertyAvailabilityResponse
 from schemas.property_response import (
     PropertyResponse,
     PropertyListResponse,
@@ -27,36 +33,56 @@ from schemas.property_response import (
 )
 
 from responses.error import (
+    bad_request_error,
     internal_server_error,
     conflict_error,
     forbidden_error,
     not_found_error,
 )
-from responses.success import data_response, empty_response
+from responses.success import (
+    cached_response,
+    data_response,
+    empty_response,
+    not_modified_response,
+    paginated_response,
+)
 from utils.dependencies import get_current_user
+from utils.http_cache import body_etag, etag_matches
+from utils.pagination import InvalidCursorError
+from config import (
+    CACHE_CONTROL_PROPERTY_DETAIL,
+    CACHE_CONTROL_PROPERTY_LIST,
+    RECOMMENDER_REFRESH_ON_STARTUP,
+)
 from utils import generate_property_id
 from utils.id_generator import generate_unit_id
 import traceback
 from services.email_service import EmailService
-from services.property_recommendation_service import PropertyRecommendationSystem
+from services.recommendation_provider import get_recommendation_system, start_background_refresh
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/properties", tags=["Properties"])
 
 property_service = PropertyService()
 floor_service = FloorService()
 unit_service = UnitService()
+availability_service = AvailabilityService()
 email_service = EmailService()
-property_recommendation_system = PropertyRecommendationSystem()
 
+AVAILABILITY_MAX_MONTHS = 36
 
-# Initialize the recommendation system when the app starts
+
+# API workers load the model on first use and the job worker retrains it;
+# only with RECOMMENDER_REFRESH_ON_STARTUP does every API worker retrain it
 @router.on_event("startup")
 async def initialize_recommendation_system():
+    if not RECOMMENDER_REFRESH_ON_STARTUP:
+        return
     try:
-        db = next(get_db())
-        property_recommendation_system.train_model(db)
+        start_background_refresh()
     except Exception as e:
-        print(f"Error initializing recommendation system: {str(e)}")
+        logger.error(f"Error initializing recommendation system: {str(e)}")
 
 
 @router.get("/train_model", response_model=PropertyResponse)
@@ -68,7 +94,7 @@ async def update_property_publish_status(
     if not isinstance(current_user, User):
         return current_user
     try:
-        property_recommendation_system.train_model(db)
+        get_recommendation_system().train_model(db)
         return data_response("Model trained successfully")
     except Exception as e:
         traceback.print_exc()
@@ -96,7 +122,7 @@ async def get_property_recommendations(
         }
 
         # Get recommendations using the initialized system
-        users_to_notify = property_recommendation_system.match_property_with_searches(
+        users_to_notify = get_recommendation_system().match_property_with_searches(
             property_data
         )
         return data_response(users_to_notify)
@@ -164,7 +190,7 @@ async def search_properties(
             monthly_rent_lt=float(monthly_rent_lt) if monthly_rent_lt else None,
             user_id=user_id,
         )
-        create_search_history(db, search_data)
+        record_search(db, search_data)
         query = db.query(property_service.model)
         query = query.filter(property_service.model.is_occupied == False)
         query = query.filter(property_service.model.is_published == True)
@@ -232,7 +258,7 @@ async def search_properties_and_units(
             monthly_rent_lt=monthly_rent_lt,
             user_id=user_id,
         )
-        create_search_history(db, search_data)
+        record_search(db, search_data)
         query = db.query(property_service.model)
         query = query.filter(property_service.model.is_occupied == False)
         query = query.filter(property_service.model.is_published == True)
@@ -357,17 +383,31 @@ async def create_property(
 
 @router.get("/", response_model=List[PropertyListResponse])
 async def get_properties(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     city: Optional[str] = None,
+    after: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     """Get all published properties"""
 
     try:
-        properties = property_service.get_properties(
-            db, skip, limit, city, is_published=True
+        cache_key = property_listing_cache.make_key(
+            skip=skip, limit=limit, city=city, after=after
         )
+        cached = property_listing_cache.get(cache_key)
+        if cached is not None:
+            if etag_matches(request.headers.get("if-none-match"), cached.etag):
+                return not_modified_response(cached.etag, CACHE_CONTROL_PROPERTY_LIST)
+            return cached_response(cached.body, cached.etag, CACHE_CONTROL_PROPERTY_LIST)
+
+        # Read before querying so a write landing mid-request isn't cached
+        cache_generation = property_listing_cache.generation
+        page = property_service.get_properties(
+            db, skip, limit, city=city, is_published=True, after=after
+        )
+        properties = page.items
 
         property_responses = []
         for property in properties:
@@ -429,15 +469,25 @@ async def get_properties(
             property_data["meta"]["total_units"] = total_units
             property_data["meta"]["total_unoccupied_units"] = total_unoccupied_units
 
-        search_data = SearchHistoryCreate(
-            query_city=city,
-            monthly_rent_gt=monthly_rent_gt,
-            monthly_rent_lt=monthly_rent_lt,
-            user_id=user_id,
+            property_responses.append(property_data)
+
+        response = paginated_response(property_responses, page.next_cursor)
+        # Hashed from the body, so owner details and same-second edits count too
+        etag = body_etag(response.body)
+        property_listing_cache.set(
+            cache_key,
+            CachedResponse(etag, response.body),
+            tags=[property_tag(property.id) for property in properties],
+            generation=cache_generation,
         )
-        create_search_history(db, search_data)
-        property_responses.append(property_data)
-        return data_response(property_responses)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified_response(etag, CACHE_CONTROL_PROPERTY_LIST)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL_PROPERTY_LIST
+        response.headers["X-Cache"] = "MISS"
+        return response
+    except InvalidCursorError as e:
+        return bad_request_error(str(e))
     except Exception as e:
         traceback.print_exc()
         return internal_server_error(str(e))
@@ -448,6 +498,7 @@ async def get_my_properties(
     skip: int = 0,
     limit: int = 100,
     city: Optional[str] = None,
+    after: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -456,9 +507,10 @@ async def get_my_properties(
         return current_user
 
     try:
-        properties = property_service.get_properties(
-            db, skip, limit, city, owner_id=current_user.id
+        page = property_service.get_properties(
+            db, skip, limit, city=city, owner_id=current_user.id, after=after
         )
+        properties = page.items
 
         property_responses = []
         for property in properties:
@@ -538,14 +590,18 @@ async def get_my_properties(
             property_data["meta"]["total_unoccupied_units"] = total_unoccupied_units
 
             property_responses.append(property_data)
-        return data_response(property_responses)
+        return paginated_response(property_responses, page.next_cursor)
+    except InvalidCursorError as e:
+        return bad_request_error(str(e))
     except Exception as e:
         traceback.print_exc()
         return internal_server_error(str(e))
 
 
 @router.get("/{property_id}", response_model=PropertyResponse)
-async def get_property(property_id: int, db: Session = Depends(get_db)):
+async def get_property(
+    property_id: int, request: Request, db: Session = Depends(get_db)
+):
     try:
         property = property_service.get_property(db, property_id)
         if not property:
@@ -601,7 +657,58 @@ async def get_property(property_id: int, db: Session = Depends(get_db)):
                 thumbnail
             )
 
-        return data_response(property_response.model_dump(mode="json"))
+        response = data_response(property_response.model_dump(mode="json"))
+        # Hashed from the body, so same-second edits never share a tag
+        etag = body_etag(response.body)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified_response(etag, CACHE_CONTROL_PROPERTY_DETAIL)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL_PROPERTY_DETAIL
+        return response
+    except Exception as e:
+        traceback.print_exc()
+        return internal_server_error(str(e))
+
+
+@router.get("/{property_id}/availability", response_model=PropertyAvailabilityResponse)
+async def get_property_availability(
+    property_id: int,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Get the free and busy periods of every unit of a property between two
+    dates (inclusive). Defaults to the next 12 months from today.
+    """
+    if not isinstance(current_user, User):
+        return current_user
+
+    from_date = from_date or datetime.now(timezone.utc).date()
+    to_date = to_date or (from_date + relativedelta(months=12) - timedelta(days=1))
+    if from_date > to_date:
+        return bad_request_error("'from' must not be after 'to'")
+    if to_date >= from_date + relativedelta(months=AVAILABILITY_MAX_MONTHS):
+        return bad_request_error(f"Date range is limited to {AVAILABILITY_MAX_MONTHS} months")
+
+    try:
+        property = property_service.get_property(db, property_id)
+        if not property:
+            return not_found_error(f"No property found with id {property_id}")
+
+        availability = availability_service.get_property_availability(db, property_id)
+        response = PropertyAvailabilityResponse(
+            property_id=property_id,
+            from_date=from_date,
+            to_date=to_date,
+            units=availability.calendar(
+                datetime.combine(from_date, time.min),
+                datetime.combine(to_date + timedelta(days=1), time.min),
+            ),
+            generated_at=availability.built_at,
+        )
+        return data_response(response.model_dump(mode="json"))
     except Exception as e:
         traceback.print_exc()
         return internal_server_error(str(e))
@@ -804,7 +911,7 @@ async def get_available_properties_and_units(
             db, 
           is_occupied=False,
           owner_id=current_user.id
-        )
+        ).items
         units = unit_service.get_all_available_units(
             db, 
         )
@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from dateutil.relativedelta import relativedelta
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from services.report_service import ReportService
+from services.report_service import ReportService, month_range
 from schemas.report_schema import (
     OwnerReportResponse,
+    OwnerTimeseriesResponse,
     TenantReportResponse,
 )
 from utils.dependencies import get_db, get_current_user
 from database.models.user_model import User
 from responses.success import data_response
+from responses.error import bad_request_error
+
+TIMESERIES_GRANULARITIES = ("month",)
+TIMESERIES_MAX_MONTHS = 120
 
 router = APIRouter(
     prefix="/reports",
@@ -29,6 +38,40 @@ async def get_owner_report(
     return data_response(report_data)
 
 
+@router.get("/owner/timeseries", response_model=OwnerTimeseriesResponse)
+async def get_owner_timeseries(
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    granularity: str = "month",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get revenue, invoicing and occupancy per month for a property owner.
+    Defaults to the last 12 months including the current one.
+    """
+    if not isinstance(current_user, User):
+        return current_user
+
+    if granularity not in TIMESERIES_GRANULARITIES:
+        return bad_request_error(
+            f"Unsupported granularity '{granularity}'. Supported: {', '.join(TIMESERIES_GRANULARITIES)}"
+        )
+
+    to_date = to_date or datetime.now(timezone.utc).date()
+    from_date = from_date or (to_date.replace(day=1) - relativedelta(months=11))
+    if from_date > to_date:
+        return bad_request_error("'from' must not be after 'to'")
+    if len(month_range(from_date, to_date)) > TIMESERIES_MAX_MONTHS:
+        return bad_request_error(f"Time range is limited to {TIMESERIES_MAX_MONTHS} months")
+
+    report_service = ReportService(db)
+    report_data = report_service.get_owner_timeseries(
+        owner_id=current_user.id, start=from_date, end=to_date
+    )
+    return data_response(report_data)
+
+
 @router.get("/tenant", response_model=TenantReportResponse)
 async def get_tenant_report(
     db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
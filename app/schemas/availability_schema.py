@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+
+
+class AvailabilityInterval(BaseModel):
+    """Half-open period ``[start, end)`` in UTC"""
+    start: datetime
+    end: datetime
+
+
+class UnitAvailability(BaseModel):
+    unit_id: int
+    name: Optional[str] = None
+    floor_id: Optional[int] = None
+    is_free: bool
+    busy: List[AvailabilityInterval] = []
+    free: List[AvailabilityInterval] = []
+
+
+class PropertyAvailabilityResponse(BaseModel):
+    """Free and busy periods of every unit of a property within a date range"""
+    property_id: int
+    from_date: date
+    to_date: date
+    units: List[UnitAvailability] = []
+    generated_at: datetime
@@ -0,0 +1,12 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfilingStartRequest(BaseModel):
+    """Which requests to profile; without route or requests the whole window is sampled"""
+
+    route: Optional[str] = Field(None, description="Path or route template, e.g. /properties/search")
+    requests: Optional[int] = Field(None, ge=1, description="Stop after this many matching requests")
+    seconds: Optional[float] = Field(None, gt=0, description="Stop after this many seconds")
+    interval_ms: Optional[float] = Field(None, ge=1, le=1000, description="Time between stack samples")
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from pydantic import Field
 
 class BookingStats(BaseModel):
     total: int = 0
@@ -10,10 +11,12 @@ class BookingStats(BaseModel):
 class PaymentStats(BaseModel):
     total_received: float = 0.0
     total_upcoming: float = 0.0
+    total_pending: float = 0.0
 
 class TenantPaymentStats(BaseModel):
     total_given: float = 0.0
     total_upcoming: float = 0.0
+    total_pending: float = 0.0
 
 class InvoiceStats(BaseModel):
     total_paid: int = 0
@@ -49,5 +52,26 @@ class TenantReportResponse(BaseReportResponse):
     class Config:
         from_attributes = True
 
+class TimeseriesBucket(BaseModel):
+    """One calendar month of an owner's figures"""
+    period: str
+    revenue: float = 0.0
+    payments_completed: int = 0
+    invoiced: float = 0.0
+    invoices_paid: int = 0
+    invoices_overdue: int = 0
+    billed_bookings: int = 0
+    # Units with an invoiced booking; whole-property bookings only count in billed_bookings
+    occupied_units: int = 0
+    occupancy_rate: float = 0.0
+
+class OwnerTimeseriesResponse(BaseModel):
+    """Response model for the owner monthly time series"""
+    granularity: str = "month"
+    from_: Optional[str] = Field(None, alias="from")
+    to: Optional[str] = None
+    total_units: int = 0
+    buckets: List[TimeseriesBucket] = []
+
 # For backward compatibility
 ReportResponse = OwnerReportResponse
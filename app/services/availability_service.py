@@ -0,0 +1,405 @@
+"""
+Unit availability.
+
+Free units of a property or a city are found with one NOT EXISTS query that
+the ``(unit_id, status, start_date, end_date)`` booking index answers. For
+repeated calendar lookups on one property, the active bookings of all its
+units are read in a single scan into an interval index that is cached until
+a booking or unit of the property changes.
+
+Intervals are half-open, ``[start, end)``; a booking without an end date
+occupies its unit indefinitely.
+"""
+
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, event, exists, func, inspect, or_, update
+from sqlalchemy.orm import Session
+
+from config import AVAILABILITY_CACHE_MAX_ENTRIES, AVAILABILITY_CACHE_TTL_SECONDS
+from database.models.booking_model import Booking
+from database.models.property_model import Property, Unit
+from enums.booking_status import BookingStatus
+from services.cache_service import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the end of open-ended bookings in the interval index
+OPEN_END = datetime.max
+
+Interval = Tuple[datetime, Optional[datetime]]
+
+# Interval indexes per property; keys carry the property's availability
+# version, which every write to its bookings or units bumps in its own
+# transaction. Each worker reads the version from the database, so no worker
+# serves an index built before a write another worker committed.
+availability_cache = LRUTTLCache(
+    max_entries=AVAILABILITY_CACHE_MAX_ENTRIES,
+    ttl=AVAILABILITY_CACHE_TTL_SECONDS,
+)
+
+# Columns the interval index is built from; a flush that changes any of them
+# bumps the version of the properties the rows belong to before and after
+_INDEXED_COLUMNS = {
+    Booking: ("unit_id", "property_id", "status", "start_date", "end_date"),
+    Unit: ("property_id", "name", "floor_id"),
+}
+# Columns that place a row in a property; their old value is loaded when they
+# are set on an expired object, so the property a row leaves is bumped too
+_PLACEMENT_COLUMNS = {
+    Booking: ("unit_id", "property_id"),
+    Unit: ("property_id",),
+}
+
+
+def to_naive_utc(value) -> Optional[datetime]:
+    """Bookings are stored as naive UTC; bring dates and aware datetimes in line."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def overlapping_bookings(start, end=None):
+    """
+    SQL condition for active bookings overlapping ``[start, end)``.
+
+    Args:
+        start: Start of the period
+        end: End of the period, or None for an open-ended period
+
+    Returns:
+        A condition to pass to ``filter`` or ``where``
+    """
+    conditions = [
+        Booking.status == BookingStatus.ACTIVE.value,
+        or_(Booking.end_date.is_(None), Booking.end_date > to_naive_utc(start)),
+    ]
+    if end is not None:
+        conditions.append(Booking.start_date < to_naive_utc(end))
+    return and_(*conditions)
+
+
+def _unit_booked(start, end=None):
+    """Correlated EXISTS: the unit in the outer query has a booking overlapping the period."""
+    return exists().where(Booking.unit_id == Unit.id, overlapping_bookings(start, end))
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+def _bump_availability_versions(session: Session, flush_context, instances) -> None:
+    """Bump the availability version of every property whose index this flush changes."""
+    property_ids, unit_ids = set(), set()
+    for obj in (*session.new, *session.deleted, *session.dirty):
+        columns = _INDEXED_COLUMNS.get(type(obj))
+        if columns is None:
+            continue
+        attrs = inspect(obj).attrs
+        if obj in session.dirty and obj not in session.deleted and not any(
+            attrs[column].history.has_changes() for column in columns
+        ):
+            continue
+        for column in _PLACEMENT_COLUMNS[type(obj)]:
+            values = {getattr(obj, column), *attrs[column].history.deleted}
+            (unit_ids if column == "unit_id" else property_ids).update(values)
+
+    # Bookings are indexed under their unit's property
+    unit_ids.discard(None)
+    if unit_ids:
+        property_ids.update(
+            property_id
+            for (property_id,) in session.query(Unit.property_id).filter(Unit.id.in_(unit_ids))
+        )
+    property_ids.discard(None)
+    if not property_ids:
+        return
+    session.connection().execute(
+        update(Property)
+        .where(Property.id.in_(sorted(property_ids)))
+        # updated_at is the listing's last edit, not the last booking
+        .values(availability_version=Property.availability_version + 1, updated_at=Property.updated_at)
+    )
+
+
+def register_availability_versioning() -> None:
+    """
+    Bump property availability versions on every ORM flush in this process.
+
+    Called once at startup by the API (main.py), the job worker and the
+    tests; calling it again does nothing. Bulk ``query.update()`` /
+    ``query.delete()`` and raw SQL on bookings or units bypass the flush and
+    must bump ``properties.availability_version`` themselves.
+    """
+    if event.contains(Session, "before_flush", _bump_availability_versions):
+        return
+    for model, columns in _PLACEMENT_COLUMNS.items():
+        for column in columns:
+            event.listen(getattr(model, column), "set", _keep_old_value, active_history=True)
+    event.listen(Session, "before_flush", _bump_availability_versions)
+
+
+class UnitIntervals:
+    """
+    Booked intervals of one unit sorted by start date.
+
+    Alongside the starts it keeps the running maximum of the ends, so whether
+    any interval overlaps a period is two binary searches rather than a scan.
+    """
+
+    __slots__ = ("starts", "ends", "max_ends", "booking_ids")
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, Optional[datetime], int]]):
+        intervals = sorted(intervals, key=lambda interval: interval[0])
+        self.starts = [start for start, _, _ in intervals]
+        self.ends = [end or OPEN_END for _, end, _ in intervals]
+        self.booking_ids = [booking_id for _, _, booking_id in intervals]
+        self.max_ends = list(accumulate(self.ends, max))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _candidates(self, start: datetime, end: Optional[datetime]) -> range:
+        # Intervals from ``hi`` on start at or after ``end``; those before ``lo``
+        # (and every earlier one) have ended by ``start``
+        hi = bisect_left(self.starts, end) if end is not None else len(self.starts)
+        lo = bisect_right(self.max_ends, start, 0, hi)
+        return range(lo, hi)
+
+    def overlaps(
+        self, start: datetime, end: Optional[datetime] = None, exclude_booking_id: Optional[int] = None
+    ) -> bool:
+        candidates = self._candidates(start, end)
+        if exclude_booking_id is None:
+            return len(candidates) > 0
+        return any(
+            self.ends[i] > start and self.booking_ids[i] != exclude_booking_id for i in candidates
+        )
+
+    def busy(self, start: datetime, end: Optional[datetime] = None) -> List[Interval]:
+        """Intervals overlapping ``[start, end)`` in start order; open ends are None."""
+        return [
+            (self.starts[i], None if self.ends[i] is OPEN_END else self.ends[i])
+            for i in self._candidates(start, end)
+            if self.ends[i] > start
+        ]
+
+    def free(self, start: datetime, end: datetime) -> List[Interval]:
+        """Gaps between the booked intervals within ``[start, end)``."""
+        gaps = []
+        cursor = start
+        for i in self._candidates(start, end):
+            if self.starts[i] > cursor:
+                gaps.append((cursor, self.starts[i]))
+            cursor = max(cursor, self.ends[i])
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+
+class PropertyAvailability:
+    """Interval index of the active bookings of every unit of one property."""
+
+    def __init__(self, property_id: int, units: Iterable[Tuple], bookings: Iterable[Tuple]):
+        """
+        Args:
+            property_id: The property
+            units: ``(unit_id, name, floor_id)`` of all units, booked or not
+            bookings: ``(unit_id, start_date, end_date, booking_id)`` rows
+        """
+        self.property_id = property_id
+        self.unit_details: Dict[int, Tuple[Optional[str], Optional[int]]] = {
+            unit_id: (name, floor_id) for unit_id, name, floor_id in units
+        }
+        by_unit: Dict[int, list] = {unit_id: [] for unit_id in self.unit_details}
+        for unit_id, start, end, booking_id in bookings:
+            by_unit.setdefault(unit_id, []).append((start, end, booking_id))
+        self.units: Dict[int, UnitIntervals] = {
+            unit_id: UnitIntervals(intervals) for unit_id, intervals in by_unit.items()
+        }
+        self.built_at = datetime.now(timezone.utc)
+
+    @property
+    def unit_ids(self) -> List[int]:
+        return sorted(self.units)
+
+    def is_unit_free(self, unit_id: int, start, end=None, exclude_booking_id: Optional[int] = None) -> bool:
+        intervals = self.units.get(unit_id)
+        if intervals is None:
+            return False
+        return not intervals.overlaps(to_naive_utc(start), to_naive_utc(end), exclude_booking_id)
+
+    def free_unit_ids(self, start, end=None) -> List[int]:
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        return [unit_id for unit_id in self.unit_ids if not self.units[unit_id].overlaps(start, end)]
+
+    def busy_intervals(self, unit_id: int, start, end=None) -> List[Interval]:
+        intervals = self.units.get(unit_id)
+        if intervals is None:
+            return []
+        return intervals.busy(to_naive_utc(start), to_naive_utc(end))
+
+    def calendar(self, start, end) -> List[dict]:
+        """
+        Busy and free intervals of every unit within ``[start, end)``, clipped
+        to the window.
+        """
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        calendar = []
+        for unit_id in self.unit_ids:
+            intervals = self.units[unit_id]
+            name, floor_id = self.unit_details.get(unit_id, (None, None))
+            busy = [
+                (max(busy_start, start), min(busy_end or OPEN_END, end))
+                for busy_start, busy_end in intervals.busy(start, end)
+            ]
+            free = intervals.free(start, end)
+            calendar.append(
+                {
+                    "unit_id": unit_id,
+                    "name": name,
+                    "floor_id": floor_id,
+                    "is_free": bool(free) and free[0] == (start, end),
+                    "busy": [{"start": s, "end": e} for s, e in busy],
+                    "free": [{"start": s, "end": e} for s, e in free],
+                }
+            )
+        return calendar
+
+
+class AvailabilityService:
+    def is_unit_available(
+        self,
+        db: Session,
+        unit_id: int,
+        start_date,
+        end_date=None,
+        exclude_booking_id: Optional[int] = None,
+        locking: bool = False,
+    ) -> bool:
+        """
+        Check a unit against the database; use this before writing a booking.
+
+        Args:
+            db: Database session
+            unit_id: The unit
+            start_date: Start of the period
+            end_date: End of the period, or None for an open-ended stay
+            exclude_booking_id: Booking to ignore, when moving its dates
+            locking: Read with FOR SHARE, so that inside a transaction the check
+                sees bookings committed after the transaction's snapshot
+
+        Returns:
+            True if no active booking of the unit overlaps the period
+        """
+        query = db.query(Booking.id).filter(
+            Booking.unit_id == unit_id, overlapping_bookings(start_date, end_date)
+        )
+        if exclude_booking_id:
+            query = query.filter(Booking.id != exclude_booking_id)
+        if locking:
+            query = query.with_for_update(read=True)
+        return query.first() is None
+
+    def free_units(
+        self,
+        db: Session,
+        start_date,
+        end_date=None,
+        property_id: Optional[int] = None,
+        city: Optional[str] = None,
+    ) -> List[Unit]:
+        """
+        Units of a property, or of all properties in a city, that are free for
+        the whole period, in one query.
+
+        Args:
+            db: Database session
+            start_date: Start of the period
+            end_date: End of the period, or None for an open-ended stay
+            property_id: Only units of this property
+            city: Only units of properties in this city (matched like the listing filter)
+
+        Returns:
+            The free units ordered by property and id
+        """
+        query = db.query(Unit)
+        if property_id is not None:
+            query = query.filter(Unit.property_id == property_id)
+        if city:
+            query = query.join(Property, Unit.property_id == Property.id).filter(
+                func.lower(Property.city).like(f"%{city.lower()}%")
+            )
+        query = query.filter(~_unit_booked(start_date, end_date))
+        return query.order_by(Unit.property_id, Unit.id).all()
+
+    def is_property_fully_occupied(self, db: Session, property_id: int, start_date, end_date=None) -> bool:
+        """
+        True if the property has units and none of them is free for the period.
+        Counted in one query.
+        """
+        booked = _unit_booked(start_date, end_date)
+        units, free = (
+            db.query(func.count(Unit.id), func.sum(case((~booked, 1), else_=0)))
+            .filter(Unit.property_id == property_id)
+            .one()
+        )
+        return units > 0 and not free
+
+    def get_property_availability(self, db: Session, property_id: int) -> PropertyAvailability:
+        """
+        Interval index of a property's units for calendar lookups, built from
+        one scan of its active bookings and cached until they change.
+
+        The cache is keyed on the property's availability version, read from
+        the database, so a booking committed by any worker is seen on the
+        next lookup. Still check with ``is_unit_available`` before writing.
+        """
+        version = (
+            db.query(Property.availability_version)
+            .filter(Property.id == property_id)
+            .scalar()
+        )
+        key = f"{property_id}:{version}"
+        index = availability_cache.get(key)
+        if index is not None:
+            return index
+
+        rows = (
+            db.query(
+                Unit.id,
+                Unit.name,
+                Unit.floor_id,
+                Booking.unit_id,
+                Booking.start_date,
+                Booking.end_date,
+                Booking.id,
+            )
+            .outerjoin(
+                Booking,
+                and_(
+                    Booking.unit_id == Unit.id,
+                    Booking.status == BookingStatus.ACTIVE.value,
+                ),
+            )
+            .filter(Unit.property_id == property_id)
+            .all()
+        )
+        index = PropertyAvailability(
+            property_id,
+            {row[:3] for row in rows},
+            (row[3:] for row in rows if row[3] is not None),
+        )
+        availability_cache.set(key, index)
+        return index
+
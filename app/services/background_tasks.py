@@ -1,18 +1,24 @@
+import logging
 from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy.orm import Session
-from database.init import get_db
-from services.property_recommendation_service import PropertyRecommendationSystem
+from database.init import get_db, SessionLocal
+from config import REPORT_ROLLUP_RECONCILE_HOUR, SEARCH_HISTORY_COMPACTION_HOUR
+from services.recommendation_provider import get_recommendation_system
 from services.email_service import EmailService
 from database.models import Property as PropertyModel
 from database.models import SearchHistory
 from database.models.user_model import User
+from services.report_service import ReportService
+from services.search_history_service import compact_search_history
+from utils.metrics import time_job
+
+logger = logging.getLogger(__name__)
 
 class BackgroundTasks:
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
         self.scheduler.start()
-        self.property_service = PropertyRecommendationSystem()
         self.email_service = EmailService()
         
         # Schedule the property recommendation task to run every minute
@@ -22,8 +28,28 @@ class BackgroundTasks:
             minutes=1,
             id='property_recommendation_task'
         )
+
+        # Rebuild report rollups nightly to repair any missed incremental refresh
+        self.scheduler.add_job(
+            self.reconcile_report_rollups,
+            'cron',
+            hour=REPORT_ROLLUP_RECONCILE_HOUR,
+            minute=0,
+            timezone='UTC',
+            id='report_rollup_reconcile_task'
+        )
+
+        # Merge repeated searches and drop expired ones to keep training scans small
+        self.scheduler.add_job(
+            self.compact_search_history,
+            'cron',
+            hour=SEARCH_HISTORY_COMPACTION_HOUR,
+            minute=0,
+            timezone='UTC',
+            id='search_history_compaction_task'
+        )
         
-        print("Background tasks initialized and scheduled")
+        logger.info("Background tasks initialized and scheduled")
 
     async def process_new_properties(self):
         """Process new properties created in the last minute and send recommendations."""
@@ -40,40 +66,85 @@ class BackgroundTasks:
             ).all()
             
             if not new_properties:
-                print("No new properties found in the last minute")
+                logger.debug("No new properties found in the last minute")
                 return
             
-            print(f"Found {len(new_properties)} new properties to process")
+            logger.info(f"Found {len(new_properties)} new properties to process")
             
-            # Process each new property
-            for property in new_properties:
-                await self.process_property_recommendations(db, property)
+            with time_job("property_recommendations"):
+                # Match every new property against the searches in one pass
+                matches = get_recommendation_system().match_properties_with_searches(
+                    [self._property_data(property) for property in new_properties]
+                )
+                
+                # Process each new property
+                for property, users_to_notify in zip(new_properties, matches):
+                    await self.process_property_recommendations(db, property, users_to_notify)
                 
         except Exception as e:
-            print(f"Error in process_new_properties: {e}")
+            logger.exception(f"Error in process_new_properties: {e}")
+
+    def reconcile_report_rollups(self):
+        """Recompute every owner and tenant report rollup from the source tables."""
+        db = SessionLocal()
+        try:
+            with time_job("report_rollup_reconcile"):
+                counts = ReportService(db).rebuild_rollups()
+            logger.info(f"Rebuilt report rollups for {counts['owners']} owners and {counts['tenants']} tenants")
+        except Exception as e:
+            logger.exception(f"Error in reconcile_report_rollups: {e}")
+        finally:
+            SessionLocal.remove()
+
+    def compact_search_history(self):
+        """Collapse repeated searches and delete searches past retention."""
+        db = SessionLocal()
+        try:
+            with time_job("search_history_compaction"):
+                stats = compact_search_history(db)
+            logger.info(
+                f"Compacted search history: {stats['expired']} expired, "
+                f"{stats['merged']} merged into {stats['groups']} searches"
+            )
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"Error in compact_search_history: {e}")
+        finally:
+            SessionLocal.remove()
+
+    @staticmethod
+    def _property_data(property: PropertyModel) -> dict:
+        """Convert a property model to the dictionary the recommender and emails use."""
+        return {
+            'id': property.id,
+            'name': property.name,
+            'city': property.city,
+            'monthly_rent': property.monthly_rent,
+            'property_type': str(property.property_type),
+            'description': property.description or '',
+            'is_published': property.is_published
+        }
+
+    async def process_property_recommendations(self, db: Session, property: PropertyModel, users_to_notify=None):
+        """Process recommendations for a single property.
 
-    async def process_property_recommendations(self, db: Session, property: PropertyModel):
-        """Process recommendations for a single property."""
+        Args:
+            db: Database session
+            property: The new property
+            users_to_notify: Matches already computed by a batch match, if any
+        """
         try:
-            # Convert property model to dictionary
-            property_data = {
-                'id': property.id,
-                'name': property.name,
-                'city': property.city,
-                'monthly_rent': property.monthly_rent,
-                'property_type': str(property.property_type),
-                'description': property.description or '',
-                'is_published': property.is_published
-            }
+            property_data = self._property_data(property)
             
             # Get users who should be notified
-            users_to_notify = self.property_service.match_property_with_searches(property_data)
+            if users_to_notify is None:
+                users_to_notify = get_recommendation_system().match_property_with_searches(property_data)
             
             if not users_to_notify:
-                print(f"No users to notify for property {property.name}")
+                logger.debug(f"No users to notify for property {property.name}")
                 return
             
-            print(f"Found {len(users_to_notify)} users to notify for property {property.name}")
+            logger.info(f"Found {len(users_to_notify)} users to notify for property {property.name}")
             
             # Send emails to each user
             for user_data in users_to_notify:
@@ -99,7 +170,7 @@ class BackgroundTasks:
                             property_data=property_data,
                             search_data=search_data
                         )
-                        print(f"Sent recommendation email to user {user_id} for property {property.name}")
+                        logger.info(f"Sent recommendation email to user {user_id} for property {property.name}")
                     
         except Exception as e:
-            print(f"Error processing recommendations for property {property.name}: {e}")
+            logger.exception(f"Error processing recommendations for property {property.name}: {e}")
@@ -1,6 +1,7 @@
 from typing import Type, TypeVar, Optional, List
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from utils.pagination import Page, paginate
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
@@ -42,8 +43,10 @@ class BaseService:
     def get(self, db: Session, id: int) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+    def get_all(
+        self, db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None
+    ) -> Page:
+        return paginate(db.query(self.model), [self.model.id], limit, after=after, skip=skip)
 
     def update(
         self, db: Session, db_obj: ModelType, obj_in: UpdateSchemaType
@@ -1,6 +1,12 @@
-from sqlalchemy.orm import Session
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import or_
-from typing import List, Optional
+from sqlalchemy.exc import OperationalError
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime, timezone, timedelta
 
 from database.models.booking_model import Booking
@@ -19,15 +25,62 @@ from schemas.property_response import (
 from schemas.auth_schema import UserMinimumResponse
 from utils.id_generator import generate_property_id, generate_unit_id
 from services.invoice_service import InvoiceService
+from services.availability_service import AvailabilityService
+from services.cache_service import invalidate_property_listings
 from services.email_service import EmailService
 from dateutil.relativedelta import relativedelta  
 from responses.error import forbidden_error, not_found_error, bad_request_error 
+from utils.metrics import BOOKING_LOCK_CONFLICTS
+from config import BOOKING_LOCK_RETRIES, BOOKING_LOCK_RETRY_DELAY_MS
+
+logger = logging.getLogger(__name__)
+
+# MySQL deadlock and lock wait timeout
+_LOCK_CONFLICT_ERRORS = {1205, 1213}
+
+# Databases without SELECT ... FOR UPDATE (SQLite) serialize bookings of a
+# unit with a fixed pool of locks striped by unit id instead; they only cover
+# this process. Units sharing a stripe merely wait for each other
+_UNIT_LOCK_STRIPES = 64
+_unit_locks = [threading.Lock() for _ in range(_UNIT_LOCK_STRIPES)]
+
+
+def _is_lock_conflict(error: OperationalError) -> bool:
+    args = getattr(error.orig, "args", ())
+    return (bool(args) and args[0] in _LOCK_CONFLICT_ERRORS) or "database is locked" in str(error.orig)
+
+
+@contextmanager
+def _locked_unit(db: Session, unit_id: Optional[int]):
+    """
+    Lock a unit until the current transaction ends and yield it; yields None
+    without locking when there is no unit.
+    """
+    if not unit_id:
+        yield None
+        return
+    query = db.query(Unit).filter(Unit.id == unit_id)
+    if db.get_bind().dialect.name != "sqlite":
+        yield query.with_for_update().first()
+        return
+    with _unit_locks[unit_id % _UNIT_LOCK_STRIPES]:
+        yield query.first()
+
+
+def _load_by_id(db: Session, model, ids, *options) -> dict:
+    """Load the rows of ``model`` with the given ids in one query, keyed by id."""
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    rows = db.query(model).options(*options).filter(model.id.in_(ids)).all()
+    return {row.id: row for row in rows}
 
 
 class BookingService:
     def __init__(self):
         self.invoice_service = InvoiceService()
         self.email_service = EmailService()
+        self.availability_service = AvailabilityService()
 
     def get(self, db: Session, booking_id: int) -> Optional[Booking]:
         return db.query(Booking).filter(Booking.id == booking_id).first()
@@ -95,19 +148,9 @@ class BookingService:
         exclude_booking_id: Optional[int] = None,
     ) -> bool:
         """Checks if the unit is available for the given period, excluding a specific booking (for updates)."""
-        query = db.query(Booking).filter(
-            Booking.unit_id == unit_id,
-            Booking.status.in_(
-                [BookingStatus.ACTIVE]
-            ),
-            end_date and Booking.start_date < end_date,
-            end_date and Booking.end_date > start_date,
+        return self.availability_service.is_unit_available(
+            db, unit_id, start_date, end_date, exclude_booking_id
         )
-        if exclude_booking_id:
-            query = query.filter(Booking.id != exclude_booking_id)
-
-        conflicting_booking = query.first()
-        return conflicting_booking is None
 
     def is_property_occupied(
         self,
@@ -135,17 +178,9 @@ class BookingService:
         Check if all units in the property are occupied during the given time period
         Returns True if all units are occupied, False if any unit is available
         """
-        # Get all units for the property
-        units = db.query(Unit).filter(Unit.property_id == property_id).all()
-        if not units:
-            return False
-
-        # Check each unit's availability
-        for unit in units:
-            if self.is_unit_available(db, unit.id, start_date, end_date):
-                return False  # If any unit is available, property is not fully occupied
-
-        return True
+        return self.availability_service.is_property_fully_occupied(
+            db, property_id, start_date, end_date
+        )
 
     def create(
         self,
@@ -172,21 +207,17 @@ class BookingService:
         else:
             status = BookingStatus.ACTIVE.value
 
-        if booking_in.unit_id:
-            if not self.is_unit_available(
-                db, booking_in.unit_id, booking_in.start_date, booking_in.end_date
-            ):
-                print(
-                    f"INFO: Unit {booking_in.unit_id} is not available for the requested period"
-                )
-                return "Unit is not available for the requested period"
-            
-        elif booking_in.property_id:
+        # Unit availability is checked in _insert_booking, under the unit lock
+        if not booking_in.unit_id:
+            if not booking_in.property_id:
+                logger.error("Neither unit_id nor property_id provided")
+                return "Neither unit_id nor property_id provided"
+
             if self.is_property_occupied(
                 db, booking_in.property_id, booking_in.start_date, booking_in.end_date
             ):
-                print(
-                    f"INFO: Property {booking_in.property_id} has occupied units for the requested period"
+                logger.info(
+                    f"Property {booking_in.property_id} has occupied units for the requested period"
                 )
                 return f"Property has occupied units for the requested period"
 
@@ -196,35 +227,32 @@ class BookingService:
                         db, actual_tenant_id, booking_in.property_id
                     )
                 except ValueError as e:
-                    print(f"INFO: {str(e)}")
+                    logger.info(str(e))
                     return str(e)
-        else:
-            print("ERROR: Neither unit_id nor property_id provided")
-            return "Neither unit_id nor property_id provided"
 
         # Set the status before creating booking
         booking_in.status = status
-        if booking_in.unit_id:
-            unit = db.query(Unit).filter(Unit.id == booking_in.unit_id).first()
-            booking_in.property_id = unit.property_id
-            booking_in.floor_id = unit.floor_id
-        
-        # Create the booking
-        booking = Booking(
-            tenant_id=actual_tenant_id,
-            property_id=booking_in.property_id,
-            floor_id=booking_in.floor_id,
-            unit_id=booking_in.unit_id,
-            start_date=booking_in.start_date,
-            end_date=booking_in.end_date,
-            total_price=booking_in.total_price,
-            notes=booking_in.notes,
-            booked_by_owner=booked_by_owner,
-            status=status,  # Add status here
-        )
-        db.add(booking)
-        db.commit()
-        db.refresh(booking)
+
+        attempt = 0
+        while True:
+            try:
+                booking = self._insert_booking(
+                    db, booking_in, actual_tenant_id, booked_by_owner, status
+                )
+                break
+            except OperationalError as e:
+                db.rollback()
+                if attempt >= BOOKING_LOCK_RETRIES or not _is_lock_conflict(e):
+                    raise
+                attempt += 1
+                BOOKING_LOCK_CONFLICTS.inc()
+                logger.warning(
+                    f"Booking insert hit a lock conflict, retrying ({attempt}/{BOOKING_LOCK_RETRIES}): {e.orig}"
+                )
+                time.sleep(BOOKING_LOCK_RETRY_DELAY_MS / 1000 * attempt * random.uniform(0.5, 1.5))
+
+        if isinstance(booking, str):
+            return booking
 
         if booking_in.unit_id:
             self.update_unit_occupancy(db, booking_in.unit_id, True)
@@ -233,11 +261,61 @@ class BookingService:
 
         return booking
 
+    def _insert_booking(
+        self,
+        db: Session,
+        booking_in: BookingCreate,
+        actual_tenant_id: Optional[int],
+        booked_by_owner: bool,
+        status: str,
+    ):
+        """
+        Insert the booking in one transaction. For a unit booking the unit row
+        is locked from the availability check until the commit, so concurrent
+        requests for the same unit cannot both pass the check.
+
+        Returns:
+            The booking, or an error message if the unit is missing or taken
+        """
+        with _locked_unit(db, booking_in.unit_id) as unit:
+            if booking_in.unit_id:
+                if unit is None:
+                    db.rollback()
+                    return f"Unit {booking_in.unit_id} not found"
+                if not self.availability_service.is_unit_available(
+                    db, unit.id, booking_in.start_date, booking_in.end_date, locking=True
+                ):
+                    db.rollback()
+                    logger.info(
+                        f"Unit {booking_in.unit_id} is not available for the requested period"
+                    )
+                    return "Unit is not available for the requested period"
+                booking_in.property_id = unit.property_id
+                booking_in.floor_id = unit.floor_id
+
+            booking = Booking(
+                tenant_id=actual_tenant_id,
+                property_id=booking_in.property_id,
+                floor_id=booking_in.floor_id,
+                unit_id=booking_in.unit_id,
+                start_date=booking_in.start_date,
+                end_date=booking_in.end_date,
+                total_price=booking_in.total_price,
+                notes=booking_in.notes,
+                booked_by_owner=booked_by_owner,
+                status=status,
+            )
+            db.add(booking)
+            db.commit()
+        db.refresh(booking)
+        return booking
+
     def update_unit_occupancy(self, db: Session, unit_id: int, is_occupied: bool):
         unit = db.query(Unit).filter(Unit.id == unit_id).first()
         if unit:
             unit.is_occupied = is_occupied
             db.commit()
+            invalidate_property_listings(unit.property_id)
 
     def update_property_occupancy(
         self, db: Session, property_id: int, is_occupied: bool
@@ -246,6 +324,7 @@ class BookingService:
         if property:
             property.is_occupied = is_occupied
             db.commit()
+            invalidate_property_listings(property_id)
 
     async def update(
         self, db: Session, booking_id: int, booking_in: BookingUpdate, is_owner: bool, new_status: str = None,
@@ -257,7 +336,7 @@ class BookingService:
                 return None
             
             if not is_owner:
-                print("Only property owners can modify bookings")
+                logger.warning("Only property owners can modify bookings")
             update_data = {}
             if booking_in:
                 update_data = booking_in.model_dump(exclude_unset=True)
@@ -276,7 +355,7 @@ class BookingService:
                     new_end,
                     exclude_booking_id=booking_id,
                 ):
-                    print("Date update failed: Unit not available for selected dates")
+                    logger.info("Date update failed: Unit not available for selected dates")
 
             if "status" in update_data:
                 new_status = BookingStatus(update_data["status"])
@@ -289,7 +368,7 @@ class BookingService:
                 
                 if (current_status not in allowed_status_changes or 
                     new_status not in allowed_status_changes[current_status]):
-                     print(f"Invalid status transition from {current_status} to {new_status}")
+                     logger.info(f"Invalid status transition from {current_status} to {new_status}")
 
                 # if new_status == BookingStatus.ACTIVE:
                 #     try:
@@ -317,7 +396,7 @@ class BookingService:
             db.refresh(db_booking)
             return db_booking
         except Exception as e:
-            print(f"Update failed: {str(e)}")
+            logger.exception(f"Update failed: {str(e)}")
             db.rollback()
             return None
 
@@ -381,23 +460,70 @@ class BookingService:
 
     def format_booking_response(
         self, booking: Booking, db: Session, property_obj: Property = None
+    ) -> dict:
+        properties = [property_obj] if property_obj else []
+        return self.format_booking_responses(db, [booking], properties)[0]
+
+    def format_booking_responses(
+        self, db: Session, bookings: List[Booking], properties: Iterable[Property] = ()
+    ) -> List[dict]:
+        """
+        Format bookings for the API, loading their related rows in bulk.
+
+        Properties, owners and tenants, floors and units (with images) are
+        fetched with one IN query each instead of several queries per booking.
+
+        Args:
+            db: Database session
+            bookings: Bookings to format
+            properties: Properties the caller already loaded, so they are not queried again
+
+        Returns:
+            List of response dicts, in the order of ``bookings``
+        """
+        property_map = {p.id: p for p in properties}
+        property_map.update(
+            _load_by_id(db, Property, {b.property_id for b in bookings} - property_map.keys())
+        )
+        users = _load_by_id(
+            db,
+            User,
+            {b.tenant_id for b in bookings} | {p.owner_id for p in property_map.values()},
+        )
+        # Floor and unit are only shown for bookings made from tenant requests
+        requested = [b for b in bookings if not b.booked_by_owner]
+        floors = _load_by_id(db, Floor, {b.floor_id for b in requested})
+        units = _load_by_id(
+            db, Unit, {b.unit_id for b in requested}, selectinload(Unit.images)
+        )
+
+        return [
+            self._booking_response_dict(
+                booking, property_map.get(booking.property_id), users, floors, units
+            )
+            for booking in bookings
+        ]
+
+    def _booking_response_dict(
+        self,
+        booking: Booking,
+        property_obj: Optional[Property],
+        users: Dict[int, User],
+        floors: Dict[int, Floor],
+        units: Dict[int, Unit],
     ) -> dict:
         response_dict = {}
 
         # Add required fields
         response_dict["id"] = booking.id
+        tenant = users.get(booking.tenant_id)
         response_dict["tenant"] = (
-            UserMinimumResponse.model_validate(booking.tenant).model_dump()
-            if booking.tenant
+            UserMinimumResponse.model_validate(tenant).model_dump()
+            if tenant
             else None
         )
 
         # Add property and owner info
-        if not property_obj:
-            property_obj = (
-                db.query(Property).filter(Property.id == booking.property_id).first()
-            )
-
         if property_obj:
             prop_response = PropertyMinimumResponse.model_validate(property_obj)
             prop_dict = prop_response.model_dump()
@@ -405,7 +531,7 @@ class BookingService:
             response_dict["property"] = prop_dict
 
             # Add owner info
-            owner = db.query(User).filter(User.id == property_obj.owner_id).first()
+            owner = users.get(property_obj.owner_id)
             response_dict["owner"] = (
                 UserMinimumResponse.model_validate(owner).model_dump()
                 if owner
@@ -414,15 +540,17 @@ class BookingService:
 
         # Add floor and unit info for tenant requests
         if not booking.booked_by_owner:
-            if booking.floor:
+            floor = floors.get(booking.floor_id)
+            if floor:
                 response_dict["floor"] = FloorMinimumResponse.model_validate(
-                    booking.floor
+                    floor
                 ).model_dump()
 
-            if booking.unit:
-                unit_response = UnitMinimumResponse.model_validate(booking.unit)
+            unit = units.get(booking.unit_id)
+            if unit:
+                unit_response = UnitMinimumResponse.model_validate(unit)
                 unit_dict = unit_response.model_dump()
-                unit_dict["unit_id"] = generate_unit_id(booking.unit.id)
+                unit_dict["unit_id"] = generate_unit_id(unit.id)
                 response_dict["unit"] = unit_dict
 
         response_dict["booked_by_owner"] = booking.booked_by_owner
@@ -532,7 +660,7 @@ class BookingService:
     ) -> Optional[Booking]:
         """Create a booking automatically from an accepted tenant request"""
         try:
-            print(f"Creating booking for tenant request {tenant_request.id}")
+            logger.info(f"Creating booking for tenant request {tenant_request.id}")
 
             current_date = datetime.now(timezone.utc)
             start_date = tenant_request.start_date.replace(tzinfo=timezone.utc)
@@ -542,7 +670,7 @@ class BookingService:
                 min_duration = start_date + relativedelta(months=1)
                 
                 if end_date.date() < (start_date + relativedelta(months=1)).date():
-                    print(f"Booking duration must be at least one full calendar month but got {min_duration}")  
+                    logger.info(f"Booking duration must be at least one full calendar month but got {min_duration}")  
                     return None
                 
                 status = (
@@ -572,7 +700,7 @@ class BookingService:
                     start_date, 
                     tenant_request.end_date
                 ):
-                    print(f"Unit {tenant_request.unit_id} is not available for the requested period")
+                    logger.info(f"Unit {tenant_request.unit_id} is not available for the requested period")
                     return "Unit is not available for the requested period"
             elif tenant_request.property_id:
                 if self.is_property_occupied(
@@ -581,7 +709,7 @@ class BookingService:
                     start_date,
                     tenant_request.end_date
                 ):
-                    print(f"Property {tenant_request.property_id} is occupied for the requested period")
+                    logger.info(f"Property {tenant_request.property_id} is occupied for the requested period")
                     return "Property is occupied for the requested period"
 
             return self.create(
@@ -592,7 +720,7 @@ class BookingService:
                 booked_by_owner=False,
             )
         except Exception as e:
-            print(
+            logger.exception(
                 f"Error creating booking from tenant request {tenant_request.id}: {str(e)}"
             )
             return str(e)
\ No newline at end of file
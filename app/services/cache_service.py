@@ -0,0 +1,299 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from config import (
+    REDIS_URL,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+
+try:
+    import redis
+except ImportError:  # the shared tier is optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+ALL_TAG = "*"
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    body: bytes
+
+
+class LRUTTLCache:
+    """In-process LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def keys(self) -> Set[str]:
+        with self._lock:
+            return set(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedCacheTier:
+    """
+    Redis-backed tier shared by all workers. Tag membership is kept in Redis
+    sets and invalidations are broadcast so every worker drops its local copies.
+    """
+
+    def __init__(self, url: str, namespace: str, ttl: int):
+        self.client = redis.Redis.from_url(url)
+        self.namespace = namespace
+        self.ttl = ttl
+        self.channel = f"{namespace}:invalidate"
+        self._listener = None
+
+    def _key(self, key: str) -> str:
+        # v2 entries are "etag\ntag,tag\nbody"; the tags let a worker that
+        # fills its local tier from here drop the copy on tag invalidation
+        return f"{self.namespace}:entry:v2:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    def get(self, key: str) -> Optional[Tuple[CachedResponse, List[str]]]:
+        """The entry and the tags it was stored with."""
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            return None
+        etag, _, rest = raw.partition(b"\n")
+        tags, _, body = rest.partition(b"\n")
+        return CachedResponse(etag.decode("latin-1"), body), tags.decode("utf-8").split(",")
+
+    def set(self, key: str, value: CachedResponse, tags: Iterable[str]) -> None:
+        pipe = self.client.pipeline()
+        tags = sorted(tags)
+        raw = b"\n".join([value.etag.encode("latin-1"), ",".join(tags).encode("utf-8"), value.body])
+        pipe.setex(self._key(key), self.ttl, raw)
+        for tag in tags:
+            pipe.sadd(self._tag(tag), key)
+            pipe.expire(self._tag(tag), self.ttl)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        keys = set()
+        for tag in tags:
+            keys.update(k.decode("utf-8") for k in self.client.smembers(self._tag(tag)))
+        pipe = self.client.pipeline()
+        if keys:
+            pipe.delete(*[self._key(key) for key in keys])
+        pipe.delete(*[self._tag(tag) for tag in tags])
+        pipe.publish(self.channel, ",".join(tags))
+        pipe.execute()
+
+    def subscribe(self, callback) -> None:
+        """Call ``callback(tags)`` whenever any worker invalidates tags."""
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+
+        def handle(message):
+            callback(message["data"].decode("utf-8").split(","))
+
+        pubsub.subscribe(**{self.channel: handle})
+        self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+
+class ResponseCache:
+    """
+    Two-tier cache for serialized responses keyed by route and normalized
+    query parameters. Entries carry tags so writes can invalidate only the
+    pages they affect; the ``*`` tag is attached to every entry.
+    """
+
+    def __init__(
+        self,
+        route: str,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl: int = RESPONSE_CACHE_TTL_SECONDS,
+        enabled: bool = RESPONSE_CACHE_ENABLED,
+        shared_url: str = REDIS_URL,
+    ):
+        self.route = route
+        self.enabled = enabled
+        self.local = LRUTTLCache(max_entries=max_entries, ttl=ttl)
+        self.shared = None
+        self.generation = 0
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if enabled and shared_url:
+            if redis is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed")
+            else:
+                try:
+                    self.shared = SharedCacheTier(shared_url, f"response_cache:{route}", ttl)
+                    self.shared.subscribe(self._drop_local)
+                except Exception as e:
+                    logger.warning(f"Shared response cache unavailable: {e}")
+                    self.shared = None
+
+    def make_key(self, **params) -> str:
+        """Build a cache key from query parameters, ignoring unset values."""
+        normalized = []
+        for name in sorted(params):
+            value = params[name]
+            if value is None or value == "":
+                continue
+            if isinstance(value, str):
+                value = value.strip().lower()
+            normalized.append(f"{name}={value}")
+        return f"{self.route}?{'&'.join(normalized)}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            generation = self.generation
+            shared = None
+            try:
+                shared = self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"Shared response cache read failed: {e}")
+            if shared is not None:
+                value, tags = shared
+                self._store_local(key, value, tags, generation)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: CachedResponse,
+        tags: Iterable[str] = (),
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store a response. Pass the ``generation`` read before computing the
+        response so a result computed across an invalidation is not cached.
+        """
+        if not self.enabled:
+            return
+
+        tags = set(tags) | {ALL_TAG}
+        if not self._store_local(key, value, tags, generation):
+            return
+
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value, tags)
+            except Exception as e:
+                logger.warning(f"Shared response cache write failed: {e}")
+
+    def _store_local(
+        self, key: str, value: CachedResponse, tags: Iterable[str], generation: Optional[int]
+    ) -> bool:
+        """
+        Put an entry in the local tier under its tags, unless an invalidation
+        happened since ``generation`` was read. Returns whether it was stored.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self.local.set(key, value)
+            for tag in set(tags) | {ALL_TAG}:
+                self._tags.setdefault(tag, set()).add(key)
+            if len(self._tags[ALL_TAG]) > 2 * self.local.max_entries:
+                self._prune_tags()
+        return True
+
+    def invalidate(self, tags: Iterable[str] = (ALL_TAG,)) -> None:
+        tags = list(tags)
+        self._drop_local(tags)
+        if self.shared is not None:
+            try:
+                self.shared.invalidate(tags)
+            except Exception as e:
+                logger.warning(f"Shared response cache invalidation failed: {e}")
+
+    def _prune_tags(self) -> None:
+        """Forget tag membership of keys the LRU tier has already evicted."""
+        live = self.local.keys()
+        for tag in list(self._tags):
+            self._tags[tag] &= live
+            if not self._tags[tag]:
+                del self._tags[tag]
+        self._tags.setdefault(ALL_TAG, set())
+
+    def _drop_local(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            self.generation += 1
+            tags = list(tags)
+            if ALL_TAG in tags:
+                self._tags.clear()
+                self.local.clear()
+                return
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.pop(tag, ()))
+        self.local.delete(keys)
+
+
+property_listing_cache = ResponseCache("properties:list")
+
+
+def property_tag(property_id: int) -> str:
+    return f"property:{property_id}"
+
+
+def invalidate_property_listings(property_id: Optional[int] = None) -> None:
+    """
+    Drop cached listing pages after a write.
+
+    Args:
+        property_id: Only drop pages containing this property. Leave empty when
+            the write can change which properties a page contains (create,
+            delete, publish, city change).
+    """
+    if property_id is None:
+        property_listing_cache.invalidate()
+    else:
+        property_listing_cache.invalidate([property_tag(property_id)])
@@ -1,6 +1,9 @@
+import logging
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 from config import EMAIL_FROM, EMAIL_FROM_NAME, EMAIL_PORT, EMAIL_SERVER, OPENAI_API_KEY
-import openai
+from utils.metrics import EMAIL_OUTBOX_DEPTH, EMAILS_SENT
+
+logger = logging.getLogger(__name__)
 
 
 class EmailService:
@@ -22,6 +25,19 @@ class EmailService:
         except Exception as e:
             raise Exception(f"Failed to initialize email service: {str(e)}")
 
+    async def _deliver(self, message: MessageSchema):
+        """Hand a message to the SMTP server, tracking how many are still in flight"""
+        EMAIL_OUTBOX_DEPTH.inc()
+        try:
+            await self.mailer.send_message(message)
+        except Exception:
+            EMAILS_SENT.labels("failed").inc()
+            raise
+        else:
+            EMAILS_SENT.labels("sent").inc()
+        finally:
+            EMAIL_OUTBOX_DEPTH.dec()
+
     async def send_email(self, to_email: str, subject: str, body: str):
         """Send a generic email"""
         message = MessageSchema(
@@ -30,7 +46,7 @@ class EmailService:
             body=body,
             subtype="plain",
         )
-        await self.mailer.send_message(message)
+        await self._deliver(message)
 
     async def send_new_tenant_created_email(self, email: str, password: str, owner_name: str):
         message = MessageSchema(
@@ -46,7 +62,7 @@ Best regards,
 The Support Team""",
             subtype="plain",
         )
-        await self.mailer.send_message(message)
+        await self._deliver(message)
 
     async def send_new_password_email(self, email: str, new_password: str):
         message = MessageSchema(
@@ -66,7 +82,7 @@ Best regards,
 The Support Team""",
             subtype="plain",
         )
-        await self.mailer.send_message(message)
+        await self._deliver(message)
 
     async def send_create_action_email(
         self, 
@@ -100,7 +116,7 @@ Best regards,
 The Support Team""",
             subtype="plain",
         )
-        await self.mailer.send_message(message)
+        await self._deliver(message)
 
     async def send_delete_action_email(self, email: str, entity: str, entity_id: int):
         message = MessageSchema(
@@ -118,7 +134,7 @@ Best regards,
 The Support Team""",
             subtype="plain",
         )
-        await self.mailer.send_message(message)
+        await self._deliver(message)
 
     async def send_property_recommendation_email(self, email: str, property_data: dict, search_data: dict):
         """
@@ -129,6 +145,9 @@ The Support Team""",
             property_data: Dictionary containing property information
             search_data: Dictionary containing user's search history
         """
+        # Imported here so API workers that never send recommendations skip the OpenAI client
+        import openai
+
         # Configure OpenAI
         openai.api_key = OPENAI_API_KEY
         
@@ -204,10 +223,10 @@ Your Real Estate Team"""
                 body=body,
                 subtype="plain",
             )
-            await self.mailer.send_message(message)
+            await self._deliver(message)
             
         except Exception as e:
-            print(f"Error generating or sending recommendation email: {e}")
+            logger.warning(f"Error generating or sending recommendation email: {e}")
             # Fallback to default email if OpenAI fails
             message = MessageSchema(
                 subject=f"✨ New Property Alert: {property_data.get('name', 'Your Dream Home')} in {property_data.get('city', 'Your City')}",
@@ -230,6 +249,6 @@ Best regards,
 Your Real Estate Team""",
                 subtype="plain",
             )
-            await self.mailer.send_message(message)
+            await self._deliver(message)
 
 
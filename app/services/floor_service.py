@@ -4,6 +4,7 @@ from sqlalchemy import func
 from database.models import Floor as FloorModel
 from schemas.property_schema import FloorCreate, Floor
 from services.base_service import BaseService
+from services.cache_service import invalidate_property_listings
 
 
 def get_ordinal(num: int) -> str:
@@ -97,7 +98,9 @@ class FloorService(BaseService):
         self.validate_floor(db, property_id, floor_in)
         self.set_default_floor_name(floor_in)
         floor_in.property_id = property_id
-        return self.create(db, floor_in)
+        floor = self.create(db, floor_in)
+        invalidate_property_listings(property_id)
+        return floor
 
     def get_floor(self, db: Session, floor_id: int) -> Optional[Floor]:
         return self.get(db, floor_id)
@@ -122,7 +125,15 @@ class FloorService(BaseService):
 
         self.set_default_floor_name(floor_in)
 
-        return self.update(db, db_obj, floor_in)
+        floor = self.update(db, db_obj, floor_in)
+        invalidate_property_listings(property_id)
+        return floor
 
     def delete_floor(self, db: Session, floor_id: int) -> bool:
-        return self.delete(db, floor_id)
+        db_obj = self.get(db, floor_id)
+        if not db_obj:
+            return False
+        property_id = db_obj.property_id
+        deleted = self.delete(db, floor_id)
+        invalidate_property_listings(property_id)
+        return deleted
@@ -15,6 +15,7 @@ from database.models import (
 )
 from database.models import Property, Unit
 from services.base_service import BaseService
+from services.cache_service import invalidate_property_listings
 from fastapi import UploadFile
 import os
 from config import UPLOAD_DIR
@@ -109,6 +110,7 @@ class ImageService:
                 db.delete(existing_thumbnail)
                 db.commit()
 
+            invalidate_property_listings(property_id)
             return new_thumbnail
         except Exception as e:
             db.rollback()
@@ -160,7 +162,9 @@ class ImageService:
             image = PropertyImageCreate(
                 property_id=property_id, image_path=str(file_path)
             )
-            return self.property_image_service.create(db, image)
+            new_image = self.property_image_service.create(db, image)
+            invalidate_property_listings(property_id)
+            return new_image
         except Exception as e:
             db.rollback()
             raise e
@@ -206,7 +210,9 @@ class ImageService:
             )
 
             image = UnitImageCreate(unit_id=unit_id, image_path=str(file_path))
-            return self.unit_image_service.create(db, image)
+            new_image = self.unit_image_service.create(db, image)
+            invalidate_property_listings(unit.property_id)
+            return new_image
         except Exception as e:
             db.rollback()
             raise e
@@ -245,6 +251,7 @@ class ImageService:
 
             db.delete(image)
             db.commit()
+            invalidate_property_listings(property.id)
         except Exception as e:
             db.rollback()
             raise e
@@ -283,6 +290,7 @@ class ImageService:
             # Delete from database
             db.delete(image)
             db.commit()
+            invalidate_property_listings(property.id)
         except Exception as e:
             db.rollback()
             raise e
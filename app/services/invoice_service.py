@@ -1,12 +1,29 @@
-from sqlalchemy.orm import Session, joinedload
+import logging
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 from sqlalchemy import or_
 from fastapi import HTTPException
-from database.models import Invoice, Booking, Property, User, InvoiceLineItem
+from database.models import Invoice, Booking, Property, User, InvoiceLineItem, TenantRequest, Unit
 from schemas.invoice_schema import InvoiceCreate, InvoiceUpdate, InvoiceLineItemCreate
 from datetime import timedelta, datetime, timezone
 from enums.invoice_status import InvoiceStatus
 from utils.id_generator import generate_invoice_id
+from utils.pagination import Page, paginate
+
+logger = logging.getLogger(__name__)
+
+# Everything the invoice response reads, loaded with a fixed number of
+# queries however many invoices are on the page
+INVOICE_RESPONSE_OPTIONS = (
+    selectinload(Invoice.line_items),
+    selectinload(Invoice.booking).options(
+        selectinload(Booking.tenant),
+        selectinload(Booking.property).selectinload(Property.owner),
+        selectinload(Booking.floor),
+        selectinload(Booking.unit).selectinload(Unit.images),
+        selectinload(Booking.tenant_request).selectinload(TenantRequest.tenant),
+    ),
+)
 
 
 class InvoiceService:
@@ -17,12 +34,19 @@ class InvoiceService:
     def get(self, db: Session, invoice_id: int):
         return db.query(self.model).filter(self.model.id == invoice_id).first()
 
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100):
-        return db.query(self.model).offset(skip).limit(limit).all()
+    def get_all(
+        self, db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None
+    ) -> Page:
+        return paginate(db.query(self.model), [self.model.id], limit, after=after, skip=skip)
 
     def get_for_user(
-        self, db: Session, current_user: User, skip: int = 0, limit: int = 100
-    ) -> List[Invoice]:
+        self,
+        db: Session,
+        current_user: User,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+    ) -> Page:
         query = (
             db.query(self.model)
             .join(Invoice.booking)
@@ -33,11 +57,13 @@ class InvoiceService:
                     Property.owner_id == current_user.id,
                 )
             )
-            .options(joinedload(self.model.line_items))
+            .options(*INVOICE_RESPONSE_OPTIONS)
             .distinct()
         )
 
-        return query.offset(skip).limit(limit).all()
+        return paginate(
+            query, [self.model.created_at, self.model.id], limit, after=after, skip=skip
+        )
 
     def get_by_reference(self, db: Session, reference_number: str) -> Optional[Invoice]:
         return (
@@ -119,7 +145,7 @@ class InvoiceService:
             .first()
         )
         if db_invoice:
-            _ = db_invoice.booking
+            booking = db_invoice.booking
             db.delete(db_invoice)
             db.commit()
         return db_invoice   
@@ -171,7 +197,7 @@ class InvoiceService:
 
             return self.create(db, invoice_data)
         except Exception as e:
-            print(f"Error creating invoice from booking: {str(e)}")
+            logger.exception(f"Error creating invoice from booking: {str(e)}")
             return str(e)
 
     def get_by_month(self, db: Session, year: int, month: int) -> List[Invoice]:
@@ -200,10 +226,7 @@ class InvoiceService:
             .filter(
                 Booking.tenant_id == tenant_id
             )
-            .options(
-                joinedload(self.model.line_items),
-                joinedload(self.model.booking)
-            )
+            .options(*INVOICE_RESPONSE_OPTIONS)
             .order_by(self.model.month.desc())
             .all()
         )
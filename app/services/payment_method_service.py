@@ -1,3 +1,4 @@
+import logging
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from database.models.payment_method_model import PaymentMethod
@@ -6,6 +7,8 @@ from schemas.booking_response import PaymentMethodResponse
 from enums.payment_method import PaymentMethodType, PaymentMethodCategory
 from typing import Optional, Union
 
+logger = logging.getLogger(__name__)
+
 
 def service_create_payment_method(
     db: Session, payment_method: PaymentMethodCreate
@@ -53,7 +56,7 @@ def get_payment_method_by_key(db: Session, key: str) -> Optional[PaymentMethodRe
             else None
         )
     except SQLAlchemyError as e:
-        print(f"Error retrieving payment method: {str(e)}")
+        logger.error(f"Error retrieving payment method: {str(e)}")
         return None
 
 
@@ -61,7 +64,7 @@ def get_payment_method_model_by_key(db: Session, key: str) -> Optional[PaymentMe
     try:
         return db.query(PaymentMethod).filter(PaymentMethod.key == key).first()
     except SQLAlchemyError as e:
-        print(f"Error retrieving payment method: {str(e)}")
+        logger.error(f"Error retrieving payment method: {str(e)}")
         return None
 
 
@@ -82,7 +85,7 @@ def get_payment_method_model_for_update(
     try:
         return db.query(PaymentMethod).filter(PaymentMethod.key == key).first()
     except SQLAlchemyError as e:
-        print(f"Error retrieving payment method: {str(e)}")
+        logger.error(f"Error retrieving payment method: {str(e)}")
         return None
 
 
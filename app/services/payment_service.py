@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, select, union_all
 from typing import List, Optional
 from datetime import datetime
 
@@ -10,6 +11,7 @@ from schemas.payment_schema import PaymentCreate, PaymentUpdate
 from enums.payment_status import PaymentStatus
 from enums.booking_status import BookingStatus
 from responses.error import not_found_error
+from utils.pagination import Page, decode_cursor, encode_cursor, paginate
 
 
 class PaymentService:
@@ -97,57 +99,115 @@ class PaymentService:
         return db_payment
 
     def get_payments_for_booking(
-        self, db: Session, booking_id: int, skip: int = 0, limit: int = 100
-    ) -> List[Payment]:
-        return (
-            db.query(Payment)
-            .filter(Payment.booking_id == booking_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        self,
+        db: Session,
+        booking_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+    ) -> Page:
+        query = db.query(Payment).filter(Payment.booking_id == booking_id)
+        return paginate(query, [Payment.id], limit, after=after, skip=skip)
     
     def get_payments_for_owner(
-        self, db: Session, owner_id: int, skip: int = 0, limit: int = 100
-    ) -> List[Payment]:
-        return (
+        self,
+        db: Session,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+    ) -> Page:
+        query = (
             db.query(Payment)
             .join(Payment.booking)
             .join(Booking.property)
             .filter(Property.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, [Payment.id], limit, after=after, skip=skip)
 
     def get_payments_for_invoice(
-        self, db: Session, invoice_id: int, skip: int = 0, limit: int = 100
-    ) -> List[Payment]:
-        return (
-            db.query(Payment)
-            .filter(Payment.invoice_id == invoice_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-
-    def get_payments_by_user(
-        self, db: Session, user_id: int, skip: int = 0, limit: int = 100
-    ) -> List[Payment]:
-        tenant_payments = (
-            db.query(Payment)
+        self,
+        db: Session,
+        invoice_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+    ) -> Page:
+        query = db.query(Payment).filter(Payment.invoice_id == invoice_id)
+        return paginate(query, [Payment.id], limit, after=after, skip=skip)
+
+    def _payments_by_user_branches(self, db: Session, user_id: int):
+        """
+        Payment id selects for the payments a user made and received.
+
+        An OR across the booking and property tables cannot use either index,
+        so the listing is split into a tenant branch and an owner branch that
+        each walk their own index. The owner branch leaves out the payments of
+        the owner's own bookings, which the tenant branch already returns, so
+        the branches can be combined with UNION ALL.
+
+        Args:
+            db: Database session
+            user_id: The tenant / owner
+
+        Returns:
+            tuple: The tenant and owner ``Query`` objects selecting ``Payment.id``
+        """
+        tenant = (
+            db.query(Payment.id)
             .join(Payment.booking)
             .filter(Booking.tenant_id == user_id)
-            .all()
         )
-
-        owner_payments = (
-            db.query(Payment)
+        owner = (
+            db.query(Payment.id)
             .join(Payment.booking)
             .join(Booking.property)
-            .filter(Property.owner_id == user_id)
-            .all()
+            .filter(
+                Property.owner_id == user_id,
+                or_(Booking.tenant_id.is_(None), Booking.tenant_id != user_id),
+            )
         )
+        return tenant, owner
 
-        all_payments = tenant_payments + owner_payments
-        return all_payments[skip : skip + limit]
+    def get_payments_by_user(
+        self,
+        db: Session,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+    ) -> Page:
+        """Payments made by the user as a tenant or received as a property owner"""
+        keys = [Payment.id]
+        after_id = decode_cursor(after, keys)[0] if after else None
+        offset = 0 if after else skip
+
+        # Each branch is keyset ordered and limited on its own, so neither
+        # reads past the rows the merged page can use
+        branches = []
+        for branch in self._payments_by_user_branches(db, user_id):
+            if after_id is not None:
+                branch = branch.filter(Payment.id > after_id)
+            branches.append(
+                branch.order_by(Payment.id.asc()).limit(offset + limit + 1).subquery().select()
+            )
+        merged = union_all(*branches).subquery()
+        ids = [
+            row[0]
+            for row in db.execute(
+                select(merged.c.id).order_by(merged.c.id.asc()).offset(offset).limit(limit + 1)
+            )
+        ]
+
+        has_next = len(ids) > limit
+        ids = ids[:limit]
+        by_id = {payment.id: payment for payment in db.query(Payment).filter(Payment.id.in_(ids))} if ids else {}
+        items = [by_id[payment_id] for payment_id in ids if payment_id in by_id]
+        next_cursor = encode_cursor(keys, [ids[-1]]) if has_next else None
+        return Page(items, next_cursor)
+
+    def count_payments_by_user(self, db: Session, user_id: int) -> int:
+        return sum(
+            branch.with_entities(func.count(Payment.id)).scalar()
+            for branch in self._payments_by_user_branches(db, user_id)
+        )
@@ -1,6 +1,8 @@
-from datetime import datetime, timedelta
-from typing import Dict, Any, List
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, NamedTuple, Optional
 import os
+import threading
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
@@ -8,6 +10,21 @@ import joblib
 from sqlalchemy.orm import Session
 from database.models import SearchHistory
 from database.models.user_model import User
+from services.recommendation_provider import MODEL_FILE_NAME
+from utils.metrics import RECOMMENDER_MATCH_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationModel(NamedTuple):
+    """A trained model. Replaced as a whole so readers never see a half-updated one."""
+    vectorizer: TfidfVectorizer
+    search_history: pd.DataFrame
+    users: pd.DataFrame
+    trained_at: datetime
+    # TF-IDF rows of search_history, computed once instead of on every match
+    search_vectors: Any = None
+
 
 class PropertyRecommendationSystem:
     """
@@ -18,9 +35,14 @@ class PropertyRecommendationSystem:
     def __init__(self, model_path="recommendation_models"):
         """Initialize the recommendation system."""
         self.model_path = model_path
-        self.tfidf_vectorizer = None
-        self.search_history_df = None
-        self.users_df = None
+        self.model: Optional[RecommendationModel] = None
+        # empty -> loaded (from disk) / ready (trained here); "training" while a refresh runs
+        self.state = "empty"
+        self.last_error: Optional[str] = None
+        self._train_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        # mtime of the model file this process last loaded or wrote
+        self._loaded_mtime: Optional[float] = None
         
         # Create model directory if it doesn't exist
         if not os.path.exists(model_path):
@@ -28,10 +50,10 @@ class PropertyRecommendationSystem:
     
     def preprocess_search_history(self, db: Session) -> pd.DataFrame:
         """Extract and preprocess user search history data."""
-        # Get all search history from the last 30 days
+        # Get all searches repeated in the last 30 days (compacted rows carry last_seen_at)
         thirty_days_ago = datetime.now() - timedelta(days=30)
         search_history = db.query(SearchHistory).filter(
-            SearchHistory.created_at >= thirty_days_ago
+            SearchHistory.last_seen_at >= thirty_days_ago
         ).all()
         
         # Convert to DataFrame
@@ -44,7 +66,8 @@ class PropertyRecommendationSystem:
                 'query_city': sh.query_city or '',
                 'monthly_rent_gt': sh.monthly_rent_gt or 0,
                 'monthly_rent_lt': sh.monthly_rent_lt or float('inf'),
-                'created_at': sh.created_at
+                'created_at': sh.created_at,
+                'hit_count': sh.hit_count or 1,
             })
         
         search_df = pd.DataFrame(search_data)
@@ -75,28 +98,52 @@ class PropertyRecommendationSystem:
         return search_df
     
     def train_model(self, db: Session) -> None:
-        """Train the recommendation model using search history data."""
-        print("Starting model training...")
+        """
+        Train the recommendation model using search history data.
+
+        The new model is built and saved aside, then swapped in at once, so
+        matching keeps using the previous model while training runs.
+        """
+        with self._train_lock:
+            previous_state = self.state
+            self.state = "training"
+            try:
+                model = self._train(db)
+            except Exception as e:
+                self.state = previous_state
+                self.last_error = str(e)
+                raise
+            if model is None:
+                self.state = previous_state
+                return
+            self._save(model)
+            self._loaded_mtime = self._model_file_mtime()
+            self.model = model
+            self.state = "ready"
+            self.last_error = None
+
+    def _train(self, db: Session) -> Optional[RecommendationModel]:
+        logger.info("Starting model training...")
         
         # Get and preprocess data
-        self.search_history_df = self.preprocess_search_history(db)
-        self.users_df = self.preprocess_users(db)
+        search_history_df = self.preprocess_search_history(db)
+        users_df = self.preprocess_users(db)
         
-        if len(self.search_history_df) == 0:
-            print("No search history data available for training.")
-            return
+        if len(search_history_df) == 0:
+            logger.warning("No search history data available for training.")
+            return None
         
         # Create text features
-        self.search_history_df = self.create_text_features(self.search_history_df)
+        search_history_df = self.create_text_features(search_history_df)
         
         # Add a default token to prevent empty vocabulary
         # Ensure text features are not empty
-        self.search_history_df['text_features'] = self.search_history_df['text_features'].apply(
+        search_history_df['text_features'] = search_history_df['text_features'].apply(
             lambda x: x if x.strip() else 'default_token'
         )
         
         # Create and fit TF-IDF vectorizer on search text
-        self.tfidf_vectorizer = TfidfVectorizer(
+        tfidf_vectorizer = TfidfVectorizer(
             min_df=1, 
             stop_words='english',
             lowercase=True,
@@ -106,39 +153,104 @@ class PropertyRecommendationSystem:
         
         try:
             # Fit the vectorizer
-            self.tfidf_vectorizer.fit(self.search_history_df['text_features'].values)
+            tfidf_vectorizer.fit(search_history_df['text_features'].values)
         except ValueError as e:
-            print(f"Error fitting vectorizer: {e}")
+            logger.error(f"Error fitting vectorizer: {e}")
             # Create a simple vectorizer with no filtering as fallback
-            self.tfidf_vectorizer = TfidfVectorizer(
+            tfidf_vectorizer = TfidfVectorizer(
                 lowercase=True,
                 stop_words=None,
                 token_pattern=r'(?u)\b\w\w*\b',  # Match any word with at least one character
                 min_df=0
             )
             # Add a dummy document if we have no valid text
-            texts = list(self.search_history_df['text_features'].values)
+            texts = list(search_history_df['text_features'].values)
             if not texts or all(not text.strip() for text in texts):
                 texts.append("default_token")
-            self.tfidf_vectorizer.fit(texts)
-        
-        # Save the model
-        joblib.dump(self.tfidf_vectorizer, os.path.join(self.model_path, 'tfidf_vectorizer.pkl'))
-        self.search_history_df.to_pickle(os.path.join(self.model_path, 'search_history.pkl'))
-        self.users_df.to_pickle(os.path.join(self.model_path, 'users.pkl'))
-        
-        print("Model training completed and saved.")
+            tfidf_vectorizer.fit(texts)
+        
+        logger.info("Model training completed.")
+        return RecommendationModel(
+            vectorizer=tfidf_vectorizer,
+            search_history=search_history_df,
+            users=users_df,
+            trained_at=datetime.now(timezone.utc),
+            search_vectors=tfidf_vectorizer.transform(search_history_df['text_features'].values),
+        )
+
+    def _model_file(self) -> str:
+        return os.path.join(self.model_path, MODEL_FILE_NAME)
+
+    def _model_file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self._model_file()).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _save(self, model: RecommendationModel) -> None:
+        # Write next to the live file and rename over it, so a worker loading
+        # the model never reads a partially written file
+        path = self._model_file()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(model._asdict(), tmp_path)
+        os.replace(tmp_path, path)
     
     def load_model(self) -> bool:
-        """Load the trained recommendation model."""
+        """Load the last persisted model. Returns False when none has been saved yet."""
+        # Taken before reading, so a file replaced meanwhile is loaded again
+        mtime = self._model_file_mtime()
         try:
-            self.tfidf_vectorizer = joblib.load(os.path.join(self.model_path, 'tfidf_vectorizer.pkl'))
-            self.search_history_df = pd.read_pickle(os.path.join(self.model_path, 'search_history.pkl'))
-            self.users_df = pd.read_pickle(os.path.join(self.model_path, 'users.pkl'))
-            return True
+            model = RecommendationModel(**joblib.load(self._model_file()))
         except FileNotFoundError:
-            print("Model files not found. Please train the model first.")
+            logger.warning("Model files not found. Please train the model first.")
             return False
+        self._loaded_mtime = mtime
+        if model.search_vectors is None:
+            model = model._replace(
+                search_vectors=model.vectorizer.transform(model.search_history['text_features'].values)
+            )
+        # Never replace a model trained in this process with an older one from disk
+        if self.model is None or self.model.trained_at < model.trained_at:
+            self.model = model
+            if self.state == "empty":
+                self.state = "loaded"
+        return True
+
+    def _current_model(self) -> Optional[RecommendationModel]:
+        """
+        The model to match with, reloaded when the model file has changed.
+
+        The job worker retrains and rewrites the file; every other process
+        picks the new model up on its next match, at the cost of a stat call.
+        """
+        if self._model_file_mtime() != self._loaded_mtime:
+            with self._load_lock:
+                mtime = self._model_file_mtime()
+                if mtime is not None and mtime != self._loaded_mtime:
+                    try:
+                        self.load_model()
+                    except Exception as e:
+                        # Not retried until the file changes again
+                        self._loaded_mtime = mtime
+                        self.last_error = str(e)
+                        logger.error(f"Could not reload the recommendation model: {e}")
+        return self.model
+
+    def status(self) -> Dict[str, Any]:
+        """Model state and freshness for the readiness endpoint."""
+        model = self.model
+        trained_at = model.trained_at if model is not None else None
+        return {
+            "state": self.state,
+            "model_file_available": self._model_file_mtime() is not None,
+            "trained_at": trained_at.isoformat() if trained_at else None,
+            "age_seconds": (
+                round((datetime.now(timezone.utc) - trained_at).total_seconds())
+                if trained_at else None
+            ),
+            "search_history_rows": len(model.search_history) if model is not None else 0,
+            "last_error": self.last_error,
+        }
     
     def match_property_with_searches(self, property_data: Dict[str, Any], min_similarity: float = 0.2) -> List[Dict[str, Any]]:
         """
@@ -151,61 +263,25 @@ class PropertyRecommendationSystem:
         Returns:
             List of users to notify with relevance scores
         """
-        # Ensure we have all necessary data
-        if self.search_history_df is None or self.users_df is None:
-            # If data is not loaded, try loading from files
-            try:
-                self.search_history_df = pd.read_pickle(os.path.join(self.model_path, 'search_history.pkl'))
-                self.users_df = pd.read_pickle(os.path.join(self.model_path, 'users.pkl'))
-                self.tfidf_vectorizer = joblib.load(os.path.join(self.model_path, 'tfidf_vectorizer.pkl'))
-            except FileNotFoundError:
-                return []
-        
-        # Create property text feature
-        property_text = f"{property_data.get('name', '')} {property_data.get('city', '')}"
-        # Ensure property text is not empty
-        if not property_text.strip():
-            property_text = "default_token"
-        
-        try:
-            # Transform using the vectorizer
-            property_vector = self.tfidf_vectorizer.transform([property_text])
-            search_vectors = self.tfidf_vectorizer.transform(self.search_history_df['text_features'].values)
-        except Exception as e:
-            print(f"Error in vectorizer transform: {e}")
-            # Return empty list if transformation fails
-            return []
-        
-        # Calculate similarity scores
-        similarity_scores = cosine_similarity(property_vector, search_vectors).flatten()
-        
-        # Create a DataFrame with search IDs and similarity scores
-        matches_df = pd.DataFrame({
-            'search_id': self.search_history_df['id'],
-            'user_id': self.search_history_df['user_id'],
-            'similarity_score': similarity_scores
-        })
-        
-        # Filter by minimum similarity and price range
-        filtered_matches = matches_df[
-            (matches_df['similarity_score'] >= min_similarity) &
-            (self.search_history_df['monthly_rent_gt'] <= property_data.get('monthly_rent', 0)) &
-            (self.search_history_df['monthly_rent_lt'] >= property_data.get('monthly_rent', 0))
-        ]
-        
-        # Group by user_id and take the maximum similarity score for each user
-        user_matches = filtered_matches.groupby('user_id').agg({
-            'similarity_score': 'max'
-        }).reset_index()
-        
-        # Join with users DataFrame to get user details
-        if not self.users_df.empty and not user_matches.empty:
-            user_matches = user_matches.merge(self.users_df, left_on='user_id', right_on='id', how='inner')
-        
-        # Convert to list of dictionaries for notification
-        notification_list = user_matches.to_dict(orient='records')
-        
-        return notification_list
+        return self.match_properties_with_searches([property_data], min_similarity)[0]
+
+    def match_properties_with_searches(
+        self, properties: List[Dict[str, Any]], min_similarity: float = 0.2
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Match several properties in one pass over the search history.
+
+        Args:
+            properties: Dictionaries containing property information
+            min_similarity: Minimum similarity threshold (must be above 0)
+
+        Returns:
+            For each property, in order, the users to notify with relevance scores
+        """
+        texts = [f"{p.get('name', '')} {p.get('city', '')}" for p in properties]
+        rents = [p.get('monthly_rent') or 0 for p in properties]
+        with RECOMMENDER_MATCH_DURATION.time():
+            return self._match_texts(texts, rents, min_similarity)
     
     def match_unit_with_searches(self, unit_data: Dict[str, Any], property_data: Dict[str, Any], 
                                 min_similarity: float = 0.2) -> List[Dict[str, Any]]:
@@ -220,43 +296,57 @@ class PropertyRecommendationSystem:
         Returns:
             List of users to notify with relevance scores
         """
-        if not self.load_model():
-            return []
-        
         # Create unit text feature by combining unit and property information
         unit_text = f"{unit_data.get('name', '')} {property_data.get('name', '')} {property_data.get('city', '')}"
-        
-        # Transform using the vectorizer
-        unit_vector = self.tfidf_vectorizer.transform([unit_text])
-        search_vectors = self.tfidf_vectorizer.transform(self.search_history_df['text_features'].values)
-        
-        # Calculate similarity scores
-        similarity_scores = cosine_similarity(unit_vector, search_vectors).flatten()
-        
-        # Create a DataFrame with search IDs and similarity scores
-        matches_df = pd.DataFrame({
-            'search_id': self.search_history_df['id'],
-            'user_id': self.search_history_df['user_id'],
-            'similarity_score': similarity_scores
-        })
-        
-        # Filter by minimum similarity and price range
-        filtered_matches = matches_df[
-            (matches_df['similarity_score'] >= min_similarity) &
-            (self.search_history_df['monthly_rent_gt'] <= unit_data.get('monthly_rent', 0)) &
-            (self.search_history_df['monthly_rent_lt'] >= unit_data.get('monthly_rent', 0))
-        ]
-        
-        # Group by user_id and take the maximum similarity score for each user
-        user_matches = filtered_matches.groupby('user_id').agg({
-            'similarity_score': 'max'
-        }).reset_index()
-        
-        # Join with users DataFrame to get user details
-        if not self.users_df.empty and not user_matches.empty:
-            user_matches = user_matches.merge(self.users_df, left_on='user_id', right_on='id', how='inner')
-        
-        # Convert to list of dictionaries for notification
-        notification_list = user_matches.to_dict(orient='records')
-        
-        return notification_list
+        with RECOMMENDER_MATCH_DURATION.time():
+            return self._match_texts([unit_text], [unit_data.get('monthly_rent') or 0], min_similarity)[0]
+
+    def _match_texts(
+        self, texts: List[str], rents: List[float], min_similarity: float
+    ) -> List[List[Dict[str, Any]]]:
+        # Use one model snapshot for the whole call, even if a refresh swaps it
+        model = self._current_model()
+        if model is None or not texts:
+            return [[] for _ in texts]
+
+        # Ensure texts are not empty
+        texts = [text if text.strip() else "default_token" for text in texts]
+        try:
+            vectors = model.vectorizer.transform(texts)
+        except Exception as e:
+            logger.error(f"Error in vectorizer transform: {e}")
+            return [[] for _ in texts]
+
+        # Sparse result: only searches sharing a term with the listing are scored
+        similarity = cosine_similarity(vectors, model.search_vectors, dense_output=False).tocsr()
+
+        history = model.search_history
+        user_ids = history['user_id'].to_numpy()
+        rent_gt = history['monthly_rent_gt'].to_numpy()
+        rent_lt = history['monthly_rent_lt'].to_numpy()
+
+        results = []
+        for row, rent in enumerate(rents):
+            start, end = similarity.indptr[row], similarity.indptr[row + 1]
+            columns = similarity.indices[start:end]
+            scores = similarity.data[start:end]
+
+            # Filter by minimum similarity and price range
+            keep = (scores >= min_similarity) & (rent_gt[columns] <= rent) & (rent_lt[columns] >= rent)
+            matches_df = pd.DataFrame({
+                'user_id': user_ids[columns[keep]],
+                'similarity_score': scores[keep],
+            })
+
+            # Group by user_id and take the maximum similarity score for each user
+            user_matches = matches_df.groupby('user_id').agg({
+                'similarity_score': 'max'
+            }).reset_index()
+
+            # Join with users DataFrame to get user details
+            if not model.users.empty and not user_matches.empty:
+                user_matches = user_matches.merge(model.users, left_on='user_id', right_on='id', how='inner')
+
+            # Convert to list of dictionaries for notification
+            results.append(user_matches.to_dict(orient='records'))
+        return results
@@ -1,9 +1,12 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
 from database.models import Property as PropertyModel, Booking
+from database.models import Unit
 from schemas.property_schema import PropertyCreate, Property
 from services.base_service import BaseService
-from sqlalchemy import func
+from services.cache_service import invalidate_property_listings
+from utils.pagination import Page, paginate
+from sqlalchemy import func, case
 from datetime import datetime, timezone
 
 class PropertyService(BaseService):
@@ -14,7 +17,9 @@ class PropertyService(BaseService):
         self, db: Session, owner_id: int, property_in: PropertyCreate
     ) -> Property:
         property_in.owner_id = owner_id
-        return self.create(db, property_in)
+        property_obj = self.create(db, property_in)
+        invalidate_property_listings()
+        return property_obj
 
     def get_property(self, db: Session, property_id: int) -> Optional[Property]:
         property_obj = db.query(self.model).filter(self.model.id == property_id).first()
@@ -30,9 +35,24 @@ class PropertyService(BaseService):
         is_occupied: Optional[bool] = None,
         city: Optional[str] = None,
         is_published: Optional[bool] = None,
-        owner_id: Optional[int] = None, 
-    ) -> List[Property]:
+        owner_id: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Page:
         query = db.query(self.model).options(joinedload(self.model.owner))
+        query = self._filter_properties(query, is_occupied, city, is_published, owner_id)
+
+        page = paginate(query, [self.model.id], limit, after=after, skip=skip)
+        db.commit()  
+        return page
+
+    def _filter_properties(
+        self,
+        query,
+        is_occupied: Optional[bool] = None,
+        city: Optional[str] = None,
+        is_published: Optional[bool] = None,
+        owner_id: Optional[int] = None,
+    ):
         if city:
             query = query.filter(func.lower(self.model.city).like(f"%{city.lower()}%"))
         if is_published is not None:
@@ -41,21 +61,38 @@ class PropertyService(BaseService):
             query = query.filter(self.model.is_occupied == is_occupied)
         if owner_id is not None:
             query = query.filter(self.model.owner_id == owner_id)
-        
-        properties = query.offset(skip).limit(limit).all()
-        db.commit()  
-        return properties
+        return query
+
+    def calculate_occupation_status(self, db: Session, property_obj: Property) -> bool:
+        """A property is occupied when it is booked as a whole or all of its units are"""
+        if property_obj.is_occupied:
+            return True
+        total_units, occupied_units = (
+            db.query(
+                func.count(Unit.id),
+                func.sum(case((Unit.is_occupied == True, 1), else_=0)),
+            )
+            .filter(Unit.property_id == property_obj.id)
+            .one()
+        )
+        return bool(total_units) and occupied_units == total_units
 
     def update_property(
         self, db: Session, property_id: int, property_in: PropertyCreate
     ) -> Optional[Property]:
         db_obj = self.get(db, property_id)
         if db_obj:
-            return self.update(db, db_obj, property_in)
+            property_obj = self.update(db, db_obj, property_in)
+            # A city or rent change can move the property between listing pages
+            invalidate_property_listings()
+            return property_obj
         return None
 
     def delete_property(self, db: Session, property_id: int) -> bool:
-        return self.delete(db, property_id)
+        deleted = self.delete(db, property_id)
+        if deleted:
+            invalidate_property_listings()
+        return deleted
 
     def update_property_publish_status(
         self, db: Session, property_id: int, is_published: bool
@@ -65,6 +102,7 @@ class PropertyService(BaseService):
             db_obj.is_published = is_published
             db.commit()
             db.refresh(db_obj)
+            invalidate_property_listings()
             return db_obj
         return None
 
@@ -73,6 +111,7 @@ class PropertyService(BaseService):
         property_obj = db.query(self.model).filter(self.model.id == id).first()
         return property_obj
 
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Property]:
-        properties = db.query(self.model).offset(skip).limit(limit).all()
-        return properties
+    def get_all(
+        self, db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None
+    ) -> Page:
+        return paginate(db.query(self.model), [self.model.id], limit, after=after, skip=skip)
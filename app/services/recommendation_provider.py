@@ -0,0 +1,101 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from config import RECOMMENDER_MODEL_MAX_AGE_MINUTES
+from database.init import SessionLocal
+from utils.metrics import time_job
+
+logger = logging.getLogger(__name__)
+
+# Where the job worker persists the trained model for every other process
+MODEL_DIR = "recommendation_models"
+MODEL_FILE_NAME = "recommendation_model.pkl"
+
+_recommendation_system = None
+_lock = threading.Lock()
+_refresh_thread = None
+
+
+def get_recommendation_system():
+    """
+    Shared PropertyRecommendationSystem of this process.
+
+    pandas, scikit-learn and joblib are only imported when the recommender is
+    first used, so workers that never match or train do not pay for them.
+
+    Returns:
+        PropertyRecommendationSystem: The process-wide instance
+    """
+    global _recommendation_system
+    if _recommendation_system is None:
+        with _lock:
+            if _recommendation_system is None:
+                from services.property_recommendation_service import PropertyRecommendationSystem
+
+                _recommendation_system = PropertyRecommendationSystem(model_path=MODEL_DIR)
+    return _recommendation_system
+
+
+def _load_and_refresh(retrain: bool) -> None:
+    system = get_recommendation_system()
+    try:
+        system.load_model()
+    except Exception as e:
+        logger.warning(f"Could not load the persisted recommendation model: {e}")
+
+    if not retrain:
+        return
+    db = SessionLocal()
+    try:
+        with time_job("recommender_refresh"):
+            system.train_model(db)
+    except Exception as e:
+        logger.error(f"Background recommendation model refresh failed: {e}")
+    finally:
+        SessionLocal.remove()
+
+
+def start_background_refresh(retrain: bool = True) -> None:
+    """
+    Load the last persisted model and retrain it off the startup path.
+
+    The worker serves requests right away; until the thread has loaded a
+    model, matching returns no recommendations.
+    """
+    global _refresh_thread
+    if _refresh_thread is not None and _refresh_thread.is_alive():
+        return
+    _refresh_thread = threading.Thread(
+        target=_load_and_refresh, args=(retrain,), name="recommendation-refresh", daemon=True
+    )
+    _refresh_thread.start()
+
+
+def recommendation_status() -> Dict[str, Any]:
+    """
+    Model freshness, without importing the ML stack if nothing has used it yet.
+
+    A process that has not matched yet loads the model on first use, so until
+    then its state is ``available`` when the job worker has persisted a model
+    (aged by the file's mtime) and ``not_loaded`` when there is none.
+    """
+    if _recommendation_system is None:
+        try:
+            mtime = os.stat(os.path.join(MODEL_DIR, MODEL_FILE_NAME)).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        status = {
+            "state": "available" if mtime is not None else "not_loaded",
+            "model_file_available": mtime is not None,
+            "trained_at": None,
+            "age_seconds": round(time.time() - mtime) if mtime is not None else None,
+        }
+    else:
+        status = _recommendation_system.status()
+    status["refreshing"] = _refresh_thread is not None and _refresh_thread.is_alive()
+    age = status["age_seconds"]
+    status["fresh"] = age is not None and age <= RECOMMENDER_MODEL_MAX_AGE_MINUTES * 60
+    return status
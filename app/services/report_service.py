@@ -1,19 +1,64 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_, or_
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy import Integer, case, event, func, inspect, update
+from sqlalchemy.exc import IntegrityError
+from datetime import date, datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
 
 from database.models.booking_model import Booking
 from database.models.payment_model import Payment
 from database.models.invoice_model import Invoice
-from database.models.property_model import Property
-from database.models.user_model import User
+from database.models.property_model import Property, Unit
+from database.models.report_rollup_model import OwnerReportRollup, TenantReportRollup
 from enums.booking_status import BookingStatus
 from enums.invoice_status import InvoiceStatus
 from enums.payment_status import PaymentStatus
+from services.cache_service import LRUTTLCache
+from config import (
+    REPORT_CLOSED_MONTH_CACHE_MAX_ENTRIES,
+    REPORT_CLOSED_MONTH_CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Finished months of the owner time series; keys carry the version of the
+# owner's rollup row, which every write to the owner's bookings, payments or
+# invoices bumps in its own transaction. Each worker reads the version from
+# the database, so once a late edit to an old month commits no worker serves
+# the months cached before it.
+closed_month_cache = LRUTTLCache(
+    max_entries=REPORT_CLOSED_MONTH_CACHE_MAX_ENTRIES,
+    ttl=REPORT_CLOSED_MONTH_CACHE_TTL_SECONDS,
+)
+
+
+def month_range(start: date, end: date) -> List[date]:
+    """First day of every month from ``start`` to ``end`` inclusive"""
+    months = []
+    current = start.replace(day=1)
+    while current <= end:
+        months.append(current)
+        current = _next_month(current)
+    return months
+
+
+def _next_month(month: date) -> date:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
 
 
 class ReportService:
+    """
+    Owner and tenant dashboards.
+
+    Reports are served from per-owner and per-tenant rollup rows. Writes to
+    bookings, payments, invoices and properties add their changes to the rows
+    of the owner and tenant they touch in the write's own transaction (see
+    ``_apply_rollup_deltas``), and ``rebuild_rollups`` recomputes every row
+    from scratch so the nightly job can correct any drift.
+    """
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -30,37 +75,27 @@ class ReportService:
         # Get current time in UTC for the report generation timestamp
         report_time = datetime.now(timezone.utc)
 
-        # Get properties owned by this owner
-        properties = self.db.query(Property).filter(Property.owner_id == owner_id).all()
-        property_ids = [p.id for p in properties]
-
-        if not property_ids:
-            return {
-                "booking_stats": {"total": 0, "active": 0, "closed": 0},
-                "payment_stats": {"total_received": 0.0, "total_upcoming": 0.0},
-                "invoice_stats": {"total_paid": 0, "total_overdue": 0},
-                "generated_at": report_time,
-                "property_count": 0,
-            }
-
-        bookings = self.db.query(Booking).filter(Booking.property_id.in_(property_ids)).all()
-        booking_ids = [b.id for b in bookings]
-
-        # Get booking statistics for owner's properties
-        booking_stats = self._get_booking_stats(property_ids=property_ids, booking_ids=booking_ids)
-
-        # Get payment statistics for owner's properties
-        payment_stats = self._get_payment_stats(property_ids=property_ids, booking_ids=booking_ids)
-
-        # Get invoice statistics for owner's properties
-        invoice_stats = self._get_invoice_stats(property_ids=property_ids, booking_ids=booking_ids)
+        rollup = self.db.get(OwnerReportRollup, owner_id)
+        if rollup is None:
+            rollup = self.refresh_owner(owner_id)
 
         return {
-            "booking_stats": booking_stats,
-            "payment_stats": payment_stats,
-            "invoice_stats": invoice_stats,
+            "booking_stats": {
+                "total": rollup.bookings_total,
+                "active": rollup.bookings_active,
+                "closed": rollup.bookings_closed,
+            },
+            "payment_stats": {
+                "total_received": round(rollup.payments_received, 2),
+                "total_upcoming": round(rollup.upcoming_total, 2),
+                "total_pending": round(rollup.payments_pending, 2),
+            },
+            "invoice_stats": {
+                "total_paid": rollup.invoices_paid,
+                "total_overdue": rollup.invoices_overdue,
+            },
             "generated_at": report_time,
-            "property_count": len(property_ids),
+            "property_count": rollup.property_count,
         }
 
     def get_tenant_report(self, tenant_id: int) -> Dict[str, Any]:
@@ -76,192 +111,692 @@ class ReportService:
         # Get current time in UTC for the report generation timestamp
         report_time = datetime.now(timezone.utc)
 
-        # Get bookings for this tenant
-        bookings = self.db.query(Booking).filter(Booking.tenant_id == tenant_id).all()
-        booking_ids = [b.id for b in bookings]
-
-        if not booking_ids:
-            return {
-                "booking_stats": {"total": 0, "active": 0, "closed": 0},
-                "payment_stats": {"total_given": 0.0, "total_upcoming": 0.0},
-                "invoice_stats": {"total_paid": 0, "total_overdue": 0},
-                "generated_at": report_time,
-                "active_booking_count": 0,
-            }
-
-        # Get booking statistics for tenant's bookings
-        booking_stats = self._get_booking_stats(booking_ids=booking_ids)
-
-        # Calculate total_given: sum of completed payments for tenant's bookings
-        total_given_result = (
-            self.db.query(func.sum(Payment.amount))
-            .filter(Payment.booking_id.in_(booking_ids), Payment.status == PaymentStatus.COMPLETED)
-            .first()
-        )
-        total_given = float(total_given_result[0]) if total_given_result[0] is not None else 0.0
-
-        # Calculate total_upcoming: sum of unpaid invoice amounts for tenant's bookings
-        upcoming_query = self.db.query(Booking).filter(
-            Booking.id.in_(booking_ids),
-            Booking.status.in_([BookingStatus.ACTIVE])
-        ).all()
-
-        total_upcoming = sum([b.total_price for b in upcoming_query])
-
-        payment_stats = {"total_given": round(total_given, 2), "total_upcoming": round(total_upcoming, 2)}
-
-        # Get invoice statistics for tenant's bookings
-        invoice_stats = self._get_invoice_stats(booking_ids=booking_ids)
-
-        # Count active bookings
-        active_bookings = sum(1 for b in bookings if b.status == BookingStatus.ACTIVE)
+        rollup = self.db.get(TenantReportRollup, tenant_id)
+        if rollup is None:
+            rollup = self.refresh_tenant(tenant_id)
 
         return {
-            "booking_stats": booking_stats,
-            "payment_stats": payment_stats,
-            "invoice_stats": invoice_stats,
+            "booking_stats": {
+                "total": rollup.bookings_total,
+                "active": rollup.bookings_active,
+                "closed": rollup.bookings_closed,
+            },
+            "payment_stats": {
+                "total_given": round(rollup.payments_given, 2),
+                "total_upcoming": round(rollup.upcoming_total, 2),
+                "total_pending": round(rollup.payments_pending, 2),
+            },
+            "invoice_stats": {
+                "total_paid": rollup.invoices_paid,
+                "total_overdue": rollup.invoices_overdue,
+            },
             "generated_at": report_time,
-            "active_booking_count": active_bookings,
+            "active_booking_count": rollup.bookings_active,
         }
 
-    def _get_booking_stats(
-        self, property_ids: list[int] = None, booking_ids: list[int] = None
-    ) -> Dict[str, int]:
+    def get_owner_timeseries(self, owner_id: int, start: date, end: date) -> Dict[str, Any]:
         """
-        Get statistics about bookings.
+        Revenue, invoicing and occupancy of an owner per calendar month.
+
+        Finished months are served from ``closed_month_cache``; only the
+        months missing from it (and the current month) hit the database, in
+        one bucketed query per source table.
 
         Args:
-            property_ids: Optional list of property IDs to filter by
-            booking_ids: Optional list of booking IDs to filter by
+            owner_id: ID of the property owner
+            start: Any day of the first month to include
+            end: Any day of the last month to include
 
         Returns:
-            Dict containing booking statistics
+            Dict with the granularity and one bucket per month, oldest first
         """
-        query = self.db.query(Booking)
-
-        # Apply filters if provided
-        if property_ids is not None:
-            query = query.filter(Booking.property_id.in_(property_ids))
-        if booking_ids is not None:
-            query = query.filter(Booking.id.in_(booking_ids))
-
-        # Get total number of bookings
-        total_bookings = query.count()
-
-        # Get active bookings (status = 'active')
-        active_bookings = query.filter(Booking.status == BookingStatus.ACTIVE).count()
-
-        # Get closed bookings (status = 'closed')
-        closed_bookings = query.filter(Booking.status == BookingStatus.CLOSED).count()
+        months = month_range(start, end)
+        current_month = datetime.now(timezone.utc).date().replace(day=1)
+        version = self._owner_version(owner_id)
+
+        buckets: Dict[date, Dict[str, Any]] = {}
+        missing = []
+        for month in months:
+            cached = None
+            if month < current_month:
+                cached = closed_month_cache.get(f"{owner_id}:{version}:{month:%Y-%m}")
+            if cached is None:
+                missing.append(month)
+            else:
+                buckets[month] = cached
+
+        if missing:
+            computed = self._owner_month_buckets(owner_id, missing[0], _next_month(missing[-1]))
+            for month in missing:
+                bucket = computed.get(f"{month:%Y-%m}", self._empty_month_bucket())
+                buckets[month] = bucket
+                if month < current_month:
+                    closed_month_cache.set(f"{owner_id}:{version}:{month:%Y-%m}", bucket)
+
+        total_units = (
+            self.db.query(func.count(Unit.id))
+            .join(Property, Unit.property_id == Property.id)
+            .filter(Property.owner_id == owner_id)
+            .scalar()
+        )
+        series = []
+        for month in months:
+            bucket = dict(buckets[month])
+            bucket["occupancy_rate"] = (
+                round(bucket["occupied_units"] / total_units, 4) if total_units else 0.0
+            )
+            series.append({"period": f"{month:%Y-%m}", **bucket})
 
         return {
-            "total": total_bookings,
-            "active": active_bookings,
-            "closed": closed_bookings,
+            "granularity": "month",
+            "from": f"{months[0]:%Y-%m}" if months else None,
+            "to": f"{months[-1]:%Y-%m}" if months else None,
+            "total_units": total_units,
+            "buckets": series,
         }
 
-    def _get_payment_stats(
-        self, property_ids: list[int] = None, booking_ids: list[int] = None
-    ) -> Dict[str, float]:
-        """
-        Get statistics about payments.
-
-        Args:
-            property_ids: Optional list of property IDs to filter by
-            booking_ids: Optional list of booking IDs to filter by
-
-        Returns:
-            Dict containing payment statistics
-        """
-        # Base query for completed payments
-        completed_query = (
-            self.db.query(func.sum(Payment.amount))
-            .join(Booking, Payment.booking_id == Booking.id)
-            .filter(Payment.status == PaymentStatus.COMPLETED)
+    def _owner_version(self, owner_id: int) -> int:
+        """Version of the owner's rollup row, creating the row if it is missing"""
+        version = (
+            self.db.query(OwnerReportRollup.version)
+            .filter(OwnerReportRollup.owner_id == owner_id)
+            .scalar()
         )
-
-        # Base query for pending payments
-        pending_query = (
-            self.db.query(func.sum(Payment.amount))
+        if version is None:
+            version = self.refresh_owner(owner_id).version
+        return version
+
+    def _owner_month_buckets(
+        self, owner_id: int, start: date, end: date
+    ) -> Dict[str, Dict[str, Any]]:
+        """Month buckets for ``start`` <= month < ``end`` keyed by YYYY-MM"""
+        buckets: Dict[str, Dict[str, Any]] = {}
+        owner_filter = Property.owner_id == owner_id
+
+        payment_month = self._month_bucket(Payment.payment_date)
+        payments = (
+            self.db.query(
+                payment_month,
+                self._sum_where(Payment.status == PaymentStatus.COMPLETED, Payment.amount),
+                self._count_where(Payment.status == PaymentStatus.COMPLETED),
+            )
+            .select_from(Payment)
             .join(Booking, Payment.booking_id == Booking.id)
-            .filter(Payment.status == PaymentStatus.PENDING)
+            .join(Property, Booking.property_id == Property.id)
+            .filter(
+                owner_filter,
+                Payment.payment_date >= start,
+                Payment.payment_date < end,
+            )
+            .group_by(payment_month)
         )
-
-        # Apply filters if provided
-        if property_ids is not None:
-            completed_query = completed_query.filter(
-                Booking.property_id.in_(property_ids)
+        for period, revenue, payment_count in payments:
+            buckets.setdefault(period, self._empty_month_bucket()).update(
+                revenue=round(float(revenue), 2), payments_completed=payment_count
             )
-            pending_query = pending_query.filter(Booking.property_id.in_(property_ids))
-        if booking_ids is not None:
-            completed_query = completed_query.filter(
-                Payment.booking_id.in_(booking_ids)
+
+        invoice_month = self._month_bucket(Invoice.month)
+        invoices = (
+            self.db.query(
+                invoice_month,
+                func.coalesce(func.sum(Invoice.amount), 0),
+                self._count_where(Invoice.status == InvoiceStatus.PAID.value),
+                self._count_where(Invoice.status == InvoiceStatus.OVERDUE.value),
+                func.count(func.distinct(Invoice.booking_id)),
+                func.count(func.distinct(Booking.unit_id)),
             )
-            pending_query = pending_query.filter(Payment.booking_id.in_(booking_ids))
-
-        # Get total received amount (sum of all completed payments)
-        total_received_result = completed_query.first()
-        total_received = (
-            float(total_received_result[0])
-            if total_received_result[0] is not None
-            else 0.0
+            .select_from(Invoice)
+            .join(Booking, Invoice.booking_id == Booking.id)
+            .join(Property, Booking.property_id == Property.id)
+            .filter(owner_filter, Invoice.month >= start, Invoice.month < end)
+            .group_by(invoice_month)
         )
+        for period, invoiced, paid, overdue, billed_bookings, occupied_units in invoices:
+            buckets.setdefault(period, self._empty_month_bucket()).update(
+                invoiced=round(float(invoiced), 2),
+                invoices_paid=paid,
+                invoices_overdue=overdue,
+                billed_bookings=billed_bookings,
+                occupied_units=occupied_units,
+            )
+        return buckets
+
+    def _month_bucket(self, column):
+        """SQL expression formatting a date/datetime column as YYYY-MM"""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            return func.strftime("%Y-%m", column)
+        if dialect == "postgresql":
+            return func.to_char(column, "YYYY-MM")
+        return func.date_format(column, "%Y-%m")
+
+    @staticmethod
+    def _empty_month_bucket() -> Dict[str, Any]:
+        return {
+            "revenue": 0.0,
+            "payments_completed": 0,
+            "invoiced": 0.0,
+            "invoices_paid": 0,
+            "invoices_overdue": 0,
+            "billed_bookings": 0,
+            "occupied_units": 0,
+        }
 
-        upcoming_query = self.db.query(Booking).filter(
-            Booking.id.in_(booking_ids),
-            Booking.status.in_([BookingStatus.ACTIVE])
-        ).all()
+    def refresh_owner(self, owner_id: int) -> OwnerReportRollup:
+        """
+        Recompute and store the rollup row of one owner.
 
-        total_upcoming = sum([b.total_price for b in upcoming_query])
+        Args:
+            owner_id: ID of the property owner
 
-        return {
-            "total_received": round(total_received, 2),
-            "total_upcoming": round(total_upcoming, 2),
-        }
+        Returns:
+            The refreshed OwnerReportRollup
+        """
+        values = {**self._owner_defaults(), **self._owner_aggregates(owner_id).get(owner_id, {})}
+        return self._upsert(OwnerReportRollup, owner_id=owner_id, **values)
 
-    def _get_invoice_stats(
-        self, property_ids: list[int] = None, booking_ids: list[int] = None
-    ) -> Dict[str, int]:
+    def refresh_tenant(self, tenant_id: int) -> TenantReportRollup:
         """
-        Get statistics about invoices.
+        Recompute and store the rollup row of one tenant.
 
         Args:
-            property_ids: Optional list of property IDs to filter by
-            booking_ids: Optional list of booking IDs to filter by
+            tenant_id: ID of the tenant
 
         Returns:
-            Dict containing invoice statistics
+            The refreshed TenantReportRollup
         """
-        # Base query for paid invoices
-        paid_query = self.db.query(Invoice).filter(Invoice.status == InvoiceStatus.PAID)
+        values = {**self._tenant_defaults(), **self._tenant_aggregates(tenant_id).get(tenant_id, {})}
+        return self._upsert(TenantReportRollup, tenant_id=tenant_id, **values)
 
-        # Base query for overdue invoices
-        overdue_query = self.db.query(Invoice).filter(
-            Invoice.status == InvoiceStatus.OVERDUE
+    def rebuild_rollups(self) -> Dict[str, int]:
+        """
+        Recompute every owner and tenant rollup from the source tables.
+
+        Returns:
+            Dict with the number of owner and tenant rows written
+        """
+        owners = self._owner_aggregates()
+        tenants = self._tenant_aggregates()
+        # Versions carry over, and owners left without figures keep a zeroed
+        # row, so a version never goes back to one used for cached months
+        versions = dict(
+            self.db.query(OwnerReportRollup.owner_id, OwnerReportRollup.version)
         )
+        for owner_id in versions:
+            owners.setdefault(owner_id, {})
+        try:
+            self.db.query(OwnerReportRollup).delete(synchronize_session=False)
+            self.db.query(TenantReportRollup).delete(synchronize_session=False)
+            # Forget rows loaded earlier so the fresh ones don't clash with them
+            for obj in list(self.db.identity_map.values()):
+                if isinstance(obj, (OwnerReportRollup, TenantReportRollup)):
+                    self.db.expunge(obj)
+            self.db.add_all(
+                OwnerReportRollup(
+                    owner_id=owner_id,
+                    version=versions.get(owner_id, 0),
+                    **{**self._owner_defaults(), **values},
+                )
+                for owner_id, values in owners.items()
+            )
+            self.db.add_all(
+                TenantReportRollup(tenant_id=tenant_id, **{**self._tenant_defaults(), **values})
+                for tenant_id, values in tenants.items()
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return {"owners": len(owners), "tenants": len(tenants)}
+
+    def _owner_aggregates(self, owner_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Owner figures grouped by owner, for one owner or for all of them.
 
-        # Apply filters if provided
-        if property_ids is not None or booking_ids is not None:
-            # Join with bookings table if filtering by property or booking
-            paid_query = paid_query.join(Booking, Invoice.booking_id == Booking.id)
-            overdue_query = overdue_query.join(
-                Booking, Invoice.booking_id == Booking.id
+        Three aggregate queries: properties with their bookings, payments and
+        invoices, each joined up to properties.owner_id.
+        """
+        owner_key = Property.owner_id
+        results: Dict[int, Dict[str, Any]] = {}
+
+        bookings = (
+            self.db.query(
+                owner_key,
+                func.count(func.distinct(Property.id)),
+                func.count(Booking.id),
+                self._count_where(Booking.status == BookingStatus.ACTIVE.value),
+                self._count_where(Booking.status == BookingStatus.CLOSED.value),
+                self._sum_where(
+                    Booking.status == BookingStatus.ACTIVE.value, Booking.total_price
+                ),
             )
+            .select_from(Property)
+            .outerjoin(Booking, Booking.property_id == Property.id)
+        )
+        payments = (
+            self.db.query(
+                owner_key,
+                self._sum_where(Payment.status == PaymentStatus.COMPLETED, Payment.amount),
+                self._sum_where(Payment.status == PaymentStatus.PENDING, Payment.amount),
+            )
+            .select_from(Payment)
+            .join(Booking, Payment.booking_id == Booking.id)
+            .join(Property, Booking.property_id == Property.id)
+        )
+        invoices = self._invoice_counts(owner_key).join(
+            Property, Booking.property_id == Property.id
+        )
 
-            if property_ids is not None:
-                paid_query = paid_query.filter(Booking.property_id.in_(property_ids))
-                overdue_query = overdue_query.filter(
-                    Booking.property_id.in_(property_ids)
-                )
+        if owner_id is not None:
+            bookings = bookings.filter(owner_key == owner_id)
+            payments = payments.filter(owner_key == owner_id)
+            invoices = invoices.filter(owner_key == owner_id)
+
+        for key, property_count, total, active, closed, upcoming in bookings.group_by(owner_key):
+            results.setdefault(key, {}).update(
+                property_count=property_count,
+                bookings_total=total,
+                bookings_active=active,
+                bookings_closed=closed,
+                upcoming_total=float(upcoming),
+            )
+        for key, received, pending in payments.group_by(owner_key):
+            results.setdefault(key, {}).update(
+                payments_received=float(received), payments_pending=float(pending)
+            )
+        for key, paid, overdue in invoices.group_by(owner_key):
+            results.setdefault(key, {}).update(invoices_paid=paid, invoices_overdue=overdue)
+
+        results.pop(None, None)
+        return results
+
+    def _tenant_aggregates(self, tenant_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """Tenant figures grouped by tenant, for one tenant or for all of them."""
+        tenant_key = Booking.tenant_id
+        results: Dict[int, Dict[str, Any]] = {}
+
+        bookings = self.db.query(
+            tenant_key,
+            func.count(Booking.id),
+            self._count_where(Booking.status == BookingStatus.ACTIVE.value),
+            self._count_where(Booking.status == BookingStatus.CLOSED.value),
+            self._sum_where(Booking.status == BookingStatus.ACTIVE.value, Booking.total_price),
+        )
+        payments = (
+            self.db.query(
+                tenant_key,
+                self._sum_where(Payment.status == PaymentStatus.COMPLETED, Payment.amount),
+                self._sum_where(Payment.status == PaymentStatus.PENDING, Payment.amount),
+            )
+            .select_from(Payment)
+            .join(Booking, Payment.booking_id == Booking.id)
+        )
+        invoices = self._invoice_counts(tenant_key)
+
+        if tenant_id is not None:
+            bookings = bookings.filter(tenant_key == tenant_id)
+            payments = payments.filter(tenant_key == tenant_id)
+            invoices = invoices.filter(tenant_key == tenant_id)
+
+        for key, total, active, closed, upcoming in bookings.group_by(tenant_key):
+            results.setdefault(key, {}).update(
+                bookings_total=total,
+                bookings_active=active,
+                bookings_closed=closed,
+                upcoming_total=float(upcoming),
+            )
+        for key, given, pending in payments.group_by(tenant_key):
+            results.setdefault(key, {}).update(
+                payments_given=float(given), payments_pending=float(pending)
+            )
+        for key, paid, overdue in invoices.group_by(tenant_key):
+            results.setdefault(key, {}).update(invoices_paid=paid, invoices_overdue=overdue)
+
+        # Bookings made by an owner for a walk-in tenant have no tenant_id
+        results.pop(None, None)
+        return results
+
+    def _upsert(self, model, **values):
+        try:
+            rollup = self.db.merge(model(**values))
+            self.db.commit()
+        except IntegrityError:
+            # Another request inserted the row first; merge now finds it
+            self.db.rollback()
+            rollup = self.db.merge(model(**values))
+            self.db.commit()
+        return rollup
+
+    def _invoice_counts(self, group_key):
+        return (
+            self.db.query(
+                group_key,
+                self._count_where(Invoice.status == InvoiceStatus.PAID.value),
+                self._count_where(Invoice.status == InvoiceStatus.OVERDUE.value),
+            )
+            .select_from(Invoice)
+            .join(Booking, Invoice.booking_id == Booking.id)
+        )
 
-            if booking_ids is not None:
-                paid_query = paid_query.filter(Invoice.booking_id.in_(booking_ids))
-                overdue_query = overdue_query.filter(
-                    Invoice.booking_id.in_(booking_ids)
-                )
+    @staticmethod
+    def _owner_defaults() -> Dict[str, Any]:
+        return {
+            "property_count": 0,
+            "bookings_total": 0,
+            "bookings_active": 0,
+            "bookings_closed": 0,
+            "upcoming_total": 0.0,
+            "payments_received": 0.0,
+            "payments_pending": 0.0,
+            "invoices_paid": 0,
+            "invoices_overdue": 0,
+        }
 
-        # Get counts
-        total_paid = paid_query.count()
-        total_overdue = overdue_query.count()
+    @staticmethod
+    def _tenant_defaults() -> Dict[str, Any]:
+        return {
+            "bookings_total": 0,
+            "bookings_active": 0,
+            "bookings_closed": 0,
+            "upcoming_total": 0.0,
+            "payments_given": 0.0,
+            "payments_pending": 0.0,
+            "invoices_paid": 0,
+            "invoices_overdue": 0,
+        }
 
-        return {"total_paid": total_paid, "total_overdue": total_overdue}
+    @staticmethod
+    def _count_where(condition):
+        """COUNT of rows matching ``condition``; 0 (not NULL) on empty input"""
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0).cast(Integer)
+
+    @staticmethod
+    def _sum_where(condition, column):
+        """SUM of ``column`` over rows matching ``condition``; 0 on empty input"""
+        return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+
+# Rollup maintenance
+#
+# Every flush that adds, changes or deletes bookings, payments, invoices or
+# properties moves their figures in the rollup rows of the owners and tenants
+# they belong to, with ``col = col + :delta`` UPDATEs in the same transaction.
+# Rows that do not exist yet are left alone; the first report read creates
+# them from the source tables. The listeners are installed by
+# ``register_rollup_maintenance`` at process startup.
+
+# Columns a row's figures or the owner time series depend on. Active history
+# makes SQLAlchemy load the old value when one of them is set on an expired
+# object, so the flush can take the old figures back out. A change to any of
+# them bumps the version of the owners involved, even when no figure moves.
+_TRACKED_COLUMNS = {
+    Booking: ("property_id", "tenant_id", "status", "total_price", "unit_id"),
+    Payment: ("booking_id", "status", "amount", "payment_date"),
+    Invoice: ("booking_id", "status", "amount", "month"),
+    Property: ("owner_id",),
+}
+
+Parties = Tuple[Optional[int], Optional[int]]
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+def _status(value) -> Optional[str]:
+    return getattr(value, "value", value)
+
+
+def _old_values(obj, columns) -> Dict[str, Any]:
+    """Values of ``columns`` as the database has them before this flush"""
+    attrs = inspect(obj).attrs
+    values = {}
+    for column in columns:
+        history = attrs[column].history
+        if history.deleted:
+            values[column] = history.deleted[0]
+        elif history.unchanged:
+            values[column] = history.unchanged[0]
+        else:
+            values[column] = getattr(obj, column)
+    return values
+
+
+def _new_values(obj, columns) -> Dict[str, Any]:
+    """Values of ``columns`` after this flush, column defaults filled in for inserts"""
+    values = {column: getattr(obj, column) for column in columns}
+    if inspect(obj).pending:
+        table = type(obj).__table__
+        for column, value in values.items():
+            default = table.c[column].default
+            if value is None and default is not None and default.is_scalar:
+                values[column] = default.arg
+    return values
+
+
+def _booking_figures(values: Dict[str, Any]) -> Dict[str, float]:
+    active = _status(values["status"]) == BookingStatus.ACTIVE.value
+    return {
+        "bookings_total": 1,
+        "bookings_active": int(active),
+        "bookings_closed": int(_status(values["status"]) == BookingStatus.CLOSED.value),
+        "upcoming_total": float(values["total_price"] or 0) if active else 0.0,
+    }
+
+
+def _payment_figures(values: Dict[str, Any]) -> Dict[str, float]:
+    status = _status(values["status"])
+    amount = float(values["amount"] or 0)
+    return {
+        "payments_received": amount if status == PaymentStatus.COMPLETED.value else 0.0,
+        "payments_pending": amount if status == PaymentStatus.PENDING.value else 0.0,
+    }
+
+
+def _invoice_figures(values: Dict[str, Any]) -> Dict[str, float]:
+    status = _status(values["status"])
+    return {
+        "invoices_paid": int(status == InvoiceStatus.PAID.value),
+        "invoices_overdue": int(status == InvoiceStatus.OVERDUE.value),
+    }
+
+
+def _tenant_figures(figures: Dict[str, float]) -> Dict[str, float]:
+    """Tenant rollups call the payments an owner received the payments given"""
+    figures = dict(figures)
+    figures.pop("property_count", None)
+    if "payments_received" in figures:
+        figures["payments_given"] = figures.pop("payments_received")
+    return figures
+
+
+class _RollupDeltas:
+    """Owner and tenant figure changes collected from one flush"""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.owners: Dict[int, Dict[str, float]] = {}
+        self.tenants: Dict[int, Dict[str, float]] = {}
+
+    def add(self, parties: Parties, figures: Dict[str, float], sign: int) -> None:
+        owner_id, tenant_id = parties
+        if owner_id is not None:
+            self._add(self.owners, owner_id, figures, sign)
+        if tenant_id is not None:
+            self._add(self.tenants, tenant_id, _tenant_figures(figures), sign)
+
+    @staticmethod
+    def _add(target, key, figures, sign) -> None:
+        totals = target.setdefault(key, {})
+        for column, value in figures.items():
+            totals[column] = totals.get(column, 0) + sign * value
+
+    def apply(self) -> None:
+        connection = self.session.connection()
+        # Fixed order, so concurrent writes lock shared rollup rows alike
+        for model, key_column, deltas in (
+            (OwnerReportRollup, OwnerReportRollup.owner_id, self.owners),
+            (TenantReportRollup, TenantReportRollup.tenant_id, self.tenants),
+        ):
+            for key in sorted(deltas):
+                changes = {
+                    column: getattr(model, column) + delta
+                    for column, delta in deltas[key].items()
+                    if delta
+                }
+                if model is OwnerReportRollup:
+                    # Every owner the flush touched, so edits that only move
+                    # a row between months retire the cached months too
+                    changes["version"] = OwnerReportRollup.version + 1
+                if not changes:
+                    continue
+                connection.execute(update(model).where(key_column == key).values(changes))
+
+
+def _collect_changes(session: Session) -> List[Tuple[int, Any, Dict[str, Any]]]:
+    """(sign, object, values) of every tracked row this flush inserts, updates or deletes"""
+    changes = []
+    for obj in session.new:
+        columns = _TRACKED_COLUMNS.get(type(obj))
+        if columns:
+            changes.append((1, obj, _new_values(obj, columns)))
+    for obj in session.deleted:
+        columns = _TRACKED_COLUMNS.get(type(obj))
+        if columns:
+            changes.append((-1, obj, _old_values(obj, columns)))
+    for obj in session.dirty:
+        columns = _TRACKED_COLUMNS.get(type(obj))
+        if not columns or obj in session.deleted:
+            continue
+        old, new = _old_values(obj, columns), _new_values(obj, columns)
+        if old != new:
+            changes.append((-1, obj, old))
+            changes.append((1, obj, new))
+    return changes
+
+
+def _apply_rollup_deltas(session: Session, flush_context, instances) -> None:
+    changes = _collect_changes(session)
+    if not changes:
+        return
+
+    # Owners of the properties the bookings point at, in one query
+    property_ids = {
+        values["property_id"]
+        for _, obj, values in changes
+        if isinstance(obj, Booking) and values["property_id"] is not None
+    }
+    property_owners = dict(
+        session.query(Property.id, Property.owner_id).filter(Property.id.in_(property_ids))
+        if property_ids
+        else []
+    )
+
+    def booking_parties(booking: Booking, values: Dict[str, Any]) -> Parties:
+        if values["property_id"] is None:
+            # Property added in the same flush
+            owner_id = booking.property.owner_id if booking.property is not None else None
+        else:
+            owner_id = property_owners.get(values["property_id"])
+        return owner_id, values["tenant_id"]
+
+    deltas = _RollupDeltas(session)
+    # booking id -> (parties before, parties after or None when deleted) of
+    # bookings whose owner or tenant this flush changes
+    moved: Dict[int, Tuple[Parties, Optional[Parties]]] = {}
+    for sign, obj, values in changes:
+        if isinstance(obj, Property):
+            deltas.add((values["owner_id"], None), {"property_count": 1}, sign)
+        elif isinstance(obj, Booking):
+            parties = booking_parties(obj, values)
+            deltas.add(parties, _booking_figures(values), sign)
+            if obj.id is None:
+                continue
+            before, after = moved.get(obj.id, (None, None))
+            if sign < 0:
+                before = parties
+            else:
+                after = parties
+            moved[obj.id] = (before, after)
+    moved = {
+        booking_id: parties
+        for booking_id, parties in moved.items()
+        if parties[0] is not None and parties[0] != parties[1]
+    }
+
+    # Parties of the bookings the payments and invoices point at, as stored
+    child_changes = [change for change in changes if isinstance(change[1], (Payment, Invoice))]
+    booking_ids = {
+        values["booking_id"] for _, _, values in child_changes if values["booking_id"] is not None
+    }
+    stored_parties: Dict[int, Parties] = {}
+    if booking_ids:
+        rows = (
+            session.query(Booking.id, Property.owner_id, Booking.tenant_id)
+            .outerjoin(Property, Booking.property_id == Property.id)
+            .filter(Booking.id.in_(booking_ids))
+        )
+        stored_parties = {booking_id: (owner_id, tenant_id) for booking_id, owner_id, tenant_id in rows}
+
+    for sign, obj, values in child_changes:
+        booking_id = values["booking_id"]
+        if booking_id is None:
+            booking = inspect(obj).dict.get("booking")
+            if booking is None:
+                continue
+            # Booking added in the same flush
+            parties = booking_parties(booking, _new_values(booking, _TRACKED_COLUMNS[Booking]))
+        elif booking_id in moved:
+            parties = moved[booking_id][0] if sign < 0 else moved[booking_id][1]
+            if parties is None:
+                continue
+        else:
+            parties = stored_parties.get(booking_id)
+            if parties is None:
+                continue
+        figures = _payment_figures(values) if isinstance(obj, Payment) else _invoice_figures(values)
+        deltas.add(parties, figures, sign)
+
+    if moved:
+        # Payments and invoices this flush leaves alone follow their booking
+        # to its new owner and tenant
+        flushed_ids = {
+            (type(obj), obj.id) for _, obj, _ in child_changes if obj.id is not None
+        }
+        for model, columns, figures_of in (
+            (Payment, (Payment.status, Payment.amount), _payment_figures),
+            (Invoice, (Invoice.status,), _invoice_figures),
+        ):
+            rows = session.query(model.id, model.booking_id, *columns).filter(
+                model.booking_id.in_(moved)
+            )
+            for row in rows:
+                if (model, row.id) in flushed_ids:
+                    continue
+                figures = figures_of(row._asdict())
+                before, after = moved[row.booking_id]
+                deltas.add(before, figures, -1)
+                if after is not None:
+                    deltas.add(after, figures, 1)
+
+    deltas.apply()
+
+
+def register_rollup_maintenance() -> None:
+    """
+    Keep the rollup rows up to date on every ORM flush in this process.
+
+    Called once at startup by the API (main.py), the job worker and the
+    tests; calling it again does nothing. Only writes that go through the
+    unit of work are seen: bulk ``query.update()`` / ``query.delete()`` and
+    raw SQL on bookings, payments, invoices or properties bypass the flush,
+    so code that uses them must call ``ReportService.refresh_owner`` /
+    ``refresh_tenant`` for the parties it touched. The nightly
+    ``rebuild_rollups`` job repairs any drift that is left.
+    """
+    if event.contains(Session, "before_flush", _apply_rollup_deltas):
+        return
+    for model, columns in _TRACKED_COLUMNS.items():
+        for column in columns:
+            event.listen(getattr(model, column), "set", _keep_old_value, active_history=True)
+    event.listen(Session, "before_flush", _apply_rollup_deltas)
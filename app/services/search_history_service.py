@@ -1,14 +1,39 @@
-from sqlalchemy.orm import Session
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, func, insert
+from sqlalchemy.orm import Session, aliased
+from database.init import engine
 from database.models.search_history_model import SearchHistory
 from schemas.search_history_schema import SearchHistoryCreate
 from database.models.user_model import User
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from config import (
+    SEARCH_HISTORY_BUFFER_CAPACITY,
+    SEARCH_HISTORY_BUFFER_ENABLED,
+    SEARCH_HISTORY_FLUSH_INTERVAL_MS,
+    SEARCH_HISTORY_FLUSH_ROWS,
+    SEARCH_HISTORY_RETENTION_DAYS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Searches with the same key are the same search repeated
+SEARCH_KEY = (
+    SearchHistory.user_id,
+    SearchHistory.query_name,
+    SearchHistory.query_city,
+    SearchHistory.monthly_rent_gt,
+    SearchHistory.monthly_rent_lt,
+)
 
 
 def create_search_history(
     db: Session, search_data: SearchHistoryCreate
 ) -> SearchHistory:
-    db_obj = SearchHistory(**search_data.model_dump())
+    now = datetime.now(timezone.utc)
+    db_obj = SearchHistory(**search_data.model_dump(), created_at=now, last_seen_at=now)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
@@ -24,3 +49,243 @@ def get_user_search_history(db: Session, user_id: int, skip: int = 0, limit: int
         .limit(limit)
         .all()
     )
+
+
+class SearchHistoryBuffer:
+    """
+    In-memory ring buffer of search events, written with bulk INSERTs.
+
+    A background thread flushes the buffer every ``flush_interval_ms`` or as
+    soon as ``flush_rows`` events are waiting. When the database falls behind
+    and the buffer is full, the oldest events are dropped rather than slowing
+    searches down.
+    """
+
+    def __init__(
+        self,
+        capacity: int = SEARCH_HISTORY_BUFFER_CAPACITY,
+        flush_rows: int = SEARCH_HISTORY_FLUSH_ROWS,
+        flush_interval_ms: int = SEARCH_HISTORY_FLUSH_INTERVAL_MS,
+        bind=engine,
+    ):
+        self.capacity = capacity
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval_ms / 1000
+        self.bind = bind
+        self._rows: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def add(self, search_data: SearchHistoryCreate) -> None:
+        """Queue a search event. Never touches the database."""
+        row = search_data.model_dump()
+        # Stamp the event now, not when it happens to be flushed
+        row["created_at"] = row["last_seen_at"] = datetime.now(timezone.utc)
+        row["hit_count"] = 1
+        with self._lock:
+            if len(self._rows) == self.capacity:
+                self.dropped += 1
+            self._rows.append(row)
+            pending = len(self._rows)
+        self._ensure_started()
+        if pending >= self.flush_rows:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Write every queued event in one INSERT, repeated searches in the
+        batch folded into a single row.
+
+        Returns:
+            int: Number of rows written
+        """
+        with self._flush_lock:
+            with self._lock:
+                events = list(self._rows)
+                self._rows.clear()
+            if not events:
+                return 0
+            rows = _collapse_repeats(events)
+            try:
+                with self.bind.begin() as connection:
+                    connection.execute(insert(SearchHistory), rows)
+            except Exception as e:
+                # Search history is best effort; a bad batch must not wedge the buffer
+                self.failed += len(events)
+                logger.error(f"Failed to write {len(events)} search history events: {e}")
+                return 0
+            self.written += len(events)
+            return len(rows)
+
+    def stop(self) -> None:
+        """Stop the flush thread and write whatever is still queued."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.flush_interval * 5, 5))
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._rows),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None or self._stopping.is_set():
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="search-history-flush", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+def _search_key(row: Dict[str, Any]) -> tuple:
+    return tuple(row[column.key] for column in SEARCH_KEY)
+
+
+def _collapse_repeats(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fold identical searches into one row with a hit count, keeping first/last seen."""
+    collapsed: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        key = _search_key(row)
+        existing = collapsed.get(key)
+        if existing is None:
+            collapsed[key] = dict(row)
+        else:
+            existing["hit_count"] += row["hit_count"]
+            existing["created_at"] = min(existing["created_at"], row["created_at"])
+            existing["last_seen_at"] = max(existing["last_seen_at"], row["last_seen_at"])
+    return list(collapsed.values())
+
+
+search_history_buffer = SearchHistoryBuffer()
+
+
+def record_search(db: Session, search_data: SearchHistoryCreate) -> None:
+    """
+    Record a search without delaying it: queued for a bulk write when the
+    buffer is enabled, written in the request transaction otherwise.
+    """
+    if SEARCH_HISTORY_BUFFER_ENABLED:
+        search_history_buffer.add(search_data)
+    else:
+        create_search_history(db, search_data)
+
+
+def compact_search_history(
+    db: Session,
+    retention_days: int = SEARCH_HISTORY_RETENTION_DAYS,
+    batch_size: int = 500,
+) -> Dict[str, int]:
+    """
+    Delete searches not repeated within the retention window, then collapse
+    repeated searches into one row per (user, name, city, rent range).
+
+    The surviving row of a group is its oldest one; it gets the summed hit
+    count, the first ``created_at`` and the latest ``last_seen_at``.
+
+    Args:
+        db: Database session
+        retention_days: Searches last seen longer ago than this are deleted
+        batch_size: Rows deleted or groups merged per transaction
+
+    Returns:
+        Dict: Number of rows expired, rows merged away and groups merged
+    """
+    # Timestamps are stored as naive UTC
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
+    stats = {"expired": 0, "merged": 0, "groups": 0}
+
+    while True:
+        ids = [
+            row.id
+            for row in db.query(SearchHistory.id)
+            .filter(SearchHistory.last_seen_at < cutoff)
+            .limit(batch_size)
+        ]
+        if not ids:
+            break
+        stats["expired"] += (
+            db.query(SearchHistory)
+            .filter(SearchHistory.id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+
+    # The oldest id of every duplicate group, in one pass over the table,
+    # grouped exactly as GROUP BY groups them (collation, float comparison)
+    keep_ids = [
+        row.keep_id
+        for row in db.query(func.min(SearchHistory.id).label("keep_id"))
+        .group_by(*SEARCH_KEY)
+        .having(func.count(SearchHistory.id) > 1)
+        .order_by(func.min(SearchHistory.id))
+    ]
+
+    # Each batch reads the rows of its groups through the user index: every
+    # row whose key equals (NULLs included) the key of a surviving row
+    keep = aliased(SearchHistory)
+    same_search = and_(
+        *[column.is_not_distinct_from(getattr(keep, column.key)) for column in SEARCH_KEY]
+    )
+    for start in range(0, len(keep_ids), batch_size):
+        groups: Dict[int, List[Any]] = {}
+        members = (
+            db.query(
+                SearchHistory.id,
+                SearchHistory.hit_count,
+                SearchHistory.created_at,
+                SearchHistory.last_seen_at,
+                keep.id.label("keep_id"),
+            )
+            .join(keep, same_search)
+            .filter(keep.id.in_(keep_ids[start:start + batch_size]), SearchHistory.id >= keep.id)
+        )
+        for row in members:
+            groups.setdefault(row.keep_id, []).append(row)
+
+        merged = 0
+        for keep_id, rows in groups.items():
+            duplicate_ids = [row.id for row in rows if row.id != keep_id]
+            if not duplicate_ids:
+                continue
+            # Totals of exactly the rows read, so rows added since are untouched
+            db.query(SearchHistory).filter(SearchHistory.id == keep_id).update(
+                {
+                    SearchHistory.hit_count: sum(row.hit_count or 0 for row in rows),
+                    SearchHistory.created_at: min(
+                        (row.created_at for row in rows if row.created_at), default=None
+                    ),
+                    SearchHistory.last_seen_at: max(
+                        (row.last_seen_at for row in rows if row.last_seen_at), default=None
+                    ),
+                },
+                synchronize_session=False,
+            )
+            merged += (
+                db.query(SearchHistory)
+                .filter(SearchHistory.id.in_(duplicate_ids))
+                .delete(synchronize_session=False)
+            )
+            stats["groups"] += 1
+        db.commit()
+        stats["merged"] += merged
+
+    return stats
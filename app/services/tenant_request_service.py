@@ -1,4 +1,6 @@
+import logging
 from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
 from responses.error import internal_server_error
 from enums.tenant_request_type import TenantRequestType
 from sqlalchemy.orm import Session, joinedload
@@ -13,6 +15,9 @@ from datetime import datetime, timezone
 from database.models.booking_model import Booking
 from enums.tenant_request_status import TenantRequestStatus
 from database.models.user_model import User
+from utils.pagination import Page, paginate
+
+logger = logging.getLogger(__name__)
 
 class TenantRequestService:
     def __init__(self):
@@ -60,19 +65,20 @@ class TenantRequestService:
         )
 
     def get_all(
-        self, db: Session, skip: int = 0, limit: int = 100
-    ) -> List[TenantRequest]:
-        return (
-            db.query(TenantRequest)
-            .options(
-                joinedload(TenantRequest.tenant),
-                joinedload(TenantRequest.property),
-                joinedload(TenantRequest.floor),
-                joinedload(TenantRequest.unit),
-            )
-            .offset(skip)
-            .limit(limit)
-            .all()
+        self, db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None
+    ) -> Page:
+        query = db.query(TenantRequest).options(
+            joinedload(TenantRequest.tenant),
+            joinedload(TenantRequest.property),
+            joinedload(TenantRequest.floor),
+            joinedload(TenantRequest.unit),
+        )
+        return paginate(
+            query,
+            [TenantRequest.created_at, TenantRequest.id],
+            limit,
+            after=after,
+            skip=skip,
         )
     
     def get_all_cancellation_requests(
@@ -191,7 +197,9 @@ class TenantRequestService:
                 db.commit()
                 db.refresh(tenant_request)
 
-                booking = self.booking_service.create_booking_from_tenant_request(
+                # Waits on the unit lock and sleeps between retries, so off the event loop
+                booking = await run_in_threadpool(
+                    self.booking_service.create_booking_from_tenant_request,
                     db=db,
                     tenant_request=tenant_request
                 )
@@ -210,7 +218,7 @@ class TenantRequestService:
                             booking.id
                         )
                 else:
-                    print(f"Failed to create booking: {booking}")     
+                    logger.warning(f"Failed to create booking: {booking}")     
                                        
             elif new_status in [status.value for status in TenantRequestStatus]:
                 tenant_request.status = new_status
@@ -233,7 +241,7 @@ class TenantRequestService:
             return tenant_request
 
         except Exception as e:
-            print(f"Error in update_status: {str(e)}")
+            logger.exception(f"Error in update_status: {str(e)}")
             db.rollback()
             raise e
 
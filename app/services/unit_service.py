@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from database.models import Unit as UnitModel
 from schemas.property_schema import UnitCreate, Unit
 from services.base_service import BaseService
+from services.cache_service import invalidate_property_listings
 
 
 class UnitService(BaseService):
@@ -14,7 +15,9 @@ class UnitService(BaseService):
     ) -> Unit:
         unit_in.floor_id = floor_id
         unit_in.property_id = property_id
-        return self.create(db, unit_in)
+        unit = self.create(db, unit_in)
+        invalidate_property_listings(property_id)
+        return unit
 
     def get_unit(self, db: Session, unit_id: int) -> Optional[Unit]:
         return self.get(db, unit_id)
@@ -46,11 +49,19 @@ class UnitService(BaseService):
     ) -> Optional[Unit]:
         db_obj = self.get(db, unit_id)
         if db_obj:
-            return self.update(db, db_obj, unit_in)
+            unit = self.update(db, db_obj, unit_in)
+            invalidate_property_listings(unit.property_id)
+            return unit
         return None
 
     def delete_unit(self, db: Session, unit_id: int) -> bool:
-        return self.delete(db, unit_id)
+        db_obj = self.get(db, unit_id)
+        if not db_obj:
+            return False
+        property_id = db_obj.property_id
+        deleted = self.delete(db, unit_id)
+        invalidate_property_listings(property_id)
+        return deleted
 
 
     def get_all_available_units(
@@ -0,0 +1,53 @@
+"""
+Tests run against a scratch SQLite database, or against TEST_DATABASE_URL
+when it is set (use a MySQL schema to exercise SELECT ... FOR UPDATE).
+
+    cd app
+    pip install -r tests/requirements.txt
+    python -m pytest tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+_scratch_dir = tempfile.mkdtemp(prefix="ai-pres-tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or (
+    f"sqlite:///{os.path.join(_scratch_dir, 'test.db')}"
+)
+
+import pytest  # noqa: E402
+
+from database.init import Base, SessionLocal, engine  # noqa: E402
+import database.models  # noqa: E402,F401
+from services.availability_service import register_availability_versioning  # noqa: E402
+from services.report_service import register_rollup_maintenance  # noqa: E402
+
+# As at API and job worker startup
+register_rollup_maintenance()
+register_availability_versioning()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+    shutil.rmtree(_scratch_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def session_factory():
+    """Opens independent sessions, one per simulated request."""
+    return SessionLocal.session_factory
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
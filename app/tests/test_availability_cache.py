@@ -0,0 +1,107 @@
+"""
+The cached availability index of a property must follow every write to its
+bookings and units, whichever session, service or worker commits it.
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from database.models import Booking, Property, Unit, User
+from enums.booking_status import BookingStatus
+from enums.property_type import PropertyType
+from enums.unit_type import UnitType
+from services.availability_service import AvailabilityService
+
+JANUARY = (datetime(2026, 1, 1), datetime(2026, 2, 1))
+
+
+@pytest.fixture
+def unit(db):
+    owner = User(name="owner", email=f"owner-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x", city="Lahore")
+    property_obj = Property(
+        name=f"Property {uuid.uuid4().hex[:8]}",
+        city="Lahore",
+        property_type=list(PropertyType)[0],
+        address="1 Test Street",
+        monthly_rent=1000,
+        owner=owner,
+    )
+    unit = Unit(property=property_obj, name="A1", unit_type=list(UnitType)[0], monthly_rent=500)
+    db.add_all([owner, property_obj, unit])
+    db.commit()
+    return unit
+
+
+def _calendar(db, property_id):
+    availability = AvailabilityService().get_property_availability(db, property_id)
+    db.commit()
+    return availability.calendar(*JANUARY)[0]
+
+
+def test_booking_written_by_another_session_is_seen(db, session_factory, unit):
+    assert _calendar(db, unit.property_id)["is_free"]
+
+    # Written straight through the ORM, not through the booking service
+    other = session_factory()
+    other.add(
+        Booking(
+            property_id=unit.property_id,
+            unit_id=unit.id,
+            start_date=datetime(2026, 1, 10),
+            end_date=datetime(2026, 1, 20),
+            total_price=500.0,
+            status=BookingStatus.ACTIVE.value,
+        )
+    )
+    other.commit()
+    other.close()
+
+    assert _calendar(db, unit.property_id)["busy"] == [
+        {"start": datetime(2026, 1, 10), "end": datetime(2026, 1, 20)}
+    ]
+
+
+def test_booking_cancelled_by_another_worker_is_seen(db, session_factory, unit):
+    booking = Booking(
+        property_id=unit.property_id,
+        unit_id=unit.id,
+        start_date=datetime(2026, 1, 10),
+        total_price=500.0,
+        status=BookingStatus.ACTIVE.value,
+    )
+    db.add(booking)
+    db.commit()
+    assert not _calendar(db, unit.property_id)["is_free"]
+
+    # The cancellation and version bump as another worker's transaction
+    # leaves them: nothing in this process is told about it
+    other_worker = session_factory()
+    other_worker.execute(
+        text("UPDATE bookings SET status = :status WHERE id = :booking_id"),
+        {"status": BookingStatus.CLOSED.value, "booking_id": booking.id},
+    )
+    other_worker.execute(
+        text("UPDATE properties SET availability_version = availability_version + 1 WHERE id = :property_id"),
+        {"property_id": unit.property_id},
+    )
+    other_worker.commit()
+    other_worker.close()
+
+    assert _calendar(db, unit.property_id)["is_free"]
+
+
+def test_unit_rename_is_seen_and_keeps_the_property_edit_time(db, session_factory, unit):
+    assert _calendar(db, unit.property_id)["name"] == "A1"
+    updated_at = db.get(Property, unit.property_id).updated_at
+
+    other = session_factory()
+    other.get(Unit, unit.id).name = "B2"
+    other.commit()
+    other.close()
+
+    assert _calendar(db, unit.property_id)["name"] == "B2"
+    db.expire_all()
+    assert db.get(Property, unit.property_id).updated_at == updated_at
@@ -0,0 +1,176 @@
+"""
+Concurrent booking creation must never double-book a unit.
+
+Threads with a session each book periods of the same unit at the same moment,
+the way parallel requests would; afterwards the unit's active bookings must
+not overlap.
+
+Runs against MySQL only: on SQLite bookings are serialized by an in-process
+lock, which says nothing about SELECT ... FOR UPDATE between workers.
+"""
+
+import os
+import random
+import threading
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from database.models import Booking, Floor, Property, Unit, User
+from enums.booking_status import BookingStatus
+from enums.property_type import PropertyType
+from enums.unit_type import UnitType
+from schemas.booking_schema import BookingCreate
+from services.booking_service import BookingService
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("TEST_DATABASE_URL"),
+    reason=(
+        "booking concurrency needs real row locks: set TEST_DATABASE_URL to a scratch "
+        "MySQL schema (see README, Tests); SQLite would only exercise the in-process lock"
+    ),
+)
+
+THREADS = 16
+UNAVAILABLE = "Unit is not available for the requested period"
+
+
+@pytest.fixture
+def unit(db):
+    suffix = uuid.uuid4().hex[:8]
+    owner = User(name="Owner", email=f"owner-{suffix}@example.com", hashed_password="x", city="Lahore")
+    tenant = User(name="Tenant", email=f"tenant-{suffix}@example.com", hashed_password="x", city="Lahore")
+    db.add_all([owner, tenant])
+    db.flush()
+    property_obj = Property(
+        name=f"Property {suffix}",
+        city="Lahore",
+        property_type=list(PropertyType)[0],
+        address="1 Test Street",
+        monthly_rent=1000,
+        is_published=True,
+        owner_id=owner.id,
+    )
+    db.add(property_obj)
+    db.flush()
+    floor = Floor(number=1, name="Ground", property_id=property_obj.id)
+    db.add(floor)
+    db.flush()
+    unit = Unit(
+        property_id=property_obj.id,
+        floor_id=floor.id,
+        name="A1",
+        unit_type=list(UnitType)[0],
+        monthly_rent=500,
+        is_occupied=False,
+    )
+    db.add(unit)
+    db.commit()
+    return {"unit_id": unit.id, "tenant_id": tenant.id}
+
+
+def _first_of_next_year() -> datetime:
+    today = datetime.now(timezone.utc)
+    return datetime(today.year + 1, 1, 1)
+
+
+def _book_concurrently(session_factory, unit, periods):
+    """Create one booking per period, all threads starting together."""
+    barrier = threading.Barrier(len(periods))
+    results = [None] * len(periods)
+    errors = []
+
+    def book(index, start, end):
+        db = session_factory()
+        try:
+            booking_in = BookingCreate(
+                unit_id=unit["unit_id"], start_date=start, end_date=end, total_price=500
+            )
+            barrier.wait()
+            result = BookingService().create(
+                db, booking_in, actual_tenant_id=unit["tenant_id"], booked_by_owner=True
+            )
+            results[index] = result.id if isinstance(result, Booking) else result
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [
+        threading.Thread(target=book, args=(index, start, end))
+        for index, (start, end) in enumerate(periods)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def _active_bookings(db, unit_id):
+    db.expire_all()
+    return (
+        db.query(Booking)
+        .filter(Booking.unit_id == unit_id, Booking.status == BookingStatus.ACTIVE.value)
+        .order_by(Booking.start_date)
+        .all()
+    )
+
+
+def _assert_no_overlaps(bookings):
+    for previous, current in zip(bookings, bookings[1:]):
+        assert previous.end_date is not None and previous.end_date <= current.start_date, (
+            f"bookings {previous.id} and {current.id} overlap"
+        )
+
+
+def test_same_period_is_booked_once(session_factory, db, unit):
+    start = _first_of_next_year()
+    periods = [(start, start + relativedelta(months=3))] * THREADS
+
+    results, errors = _book_concurrently(session_factory, unit, periods)
+
+    assert not errors
+    created = [result for result in results if isinstance(result, int)]
+    assert len(created) == 1
+    assert results.count(UNAVAILABLE) == THREADS - 1
+    assert [booking.id for booking in _active_bookings(db, unit["unit_id"])] == created
+
+
+def test_overlapping_periods_never_double_book(session_factory, db, unit):
+    rng = random.Random(50)
+    base = _first_of_next_year()
+    periods = []
+    for _ in range(THREADS):
+        start = base + relativedelta(months=rng.randint(0, 11))
+        periods.append((start, start + relativedelta(months=rng.randint(1, 4))))
+
+    results, errors = _book_concurrently(session_factory, unit, periods)
+
+    assert not errors
+    assert all(isinstance(result, int) or result == UNAVAILABLE for result in results)
+    bookings = _active_bookings(db, unit["unit_id"])
+    assert bookings
+    assert sorted(booking.id for booking in bookings) == sorted(
+        result for result in results if isinstance(result, int)
+    )
+    _assert_no_overlaps(bookings)
+
+
+def test_open_ended_booking_blocks_later_periods(session_factory, db, unit):
+    start = _first_of_next_year()
+    periods = [(start, None)] + [
+        (start + relativedelta(months=offset), start + relativedelta(months=offset + 2))
+        for offset in range(1, THREADS)
+    ]
+
+    results, errors = _book_concurrently(session_factory, unit, periods)
+
+    assert not errors
+    bookings = _active_bookings(db, unit["unit_id"])
+    _assert_no_overlaps(bookings)
+    # Either the open-ended booking won, or it lost to a later period
+    if results[0] != UNAVAILABLE:
+        assert len(bookings) == 1
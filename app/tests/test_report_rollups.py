@@ -0,0 +1,243 @@
+"""
+Rollup rows kept up to date by flush deltas must match a recompute from the
+source tables after every kind of write, and a write committed by any worker
+must retire the cached months of the owner time series.
+"""
+
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import text
+
+from database.models import Booking, Invoice, Payment, Property, User
+from database.models.report_rollup_model import OwnerReportRollup, TenantReportRollup
+from enums.booking_status import BookingStatus
+from enums.invoice_status import InvoiceStatus
+from enums.payment_status import PaymentStatus
+from enums.property_type import PropertyType
+from services.report_service import ReportService, register_rollup_maintenance
+
+OWNER_COLUMNS = list(ReportService._owner_defaults())
+TENANT_COLUMNS = list(ReportService._tenant_defaults())
+
+
+def _user(db, role):
+    suffix = uuid.uuid4().hex[:8]
+    user = User(name=role, email=f"{role}-{suffix}@example.com", hashed_password="x", city="Lahore")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _property(db, owner):
+    property_obj = Property(
+        name=f"Property {uuid.uuid4().hex[:8]}",
+        city="Lahore",
+        property_type=list(PropertyType)[0],
+        address="1 Test Street",
+        monthly_rent=1000,
+        owner_id=owner.id,
+    )
+    db.add(property_obj)
+    return property_obj
+
+
+def _invoice(booking, status):
+    return Invoice(
+        booking=booking,
+        amount=booking.total_price,
+        status=status,
+        reference_number=uuid.uuid4().hex[:8],
+        month=date(2026, 1, 1),
+    )
+
+
+@pytest.fixture
+def parties(db):
+    owner, other_owner = _user(db, "owner"), _user(db, "owner")
+    tenant, other_tenant = _user(db, "tenant"), _user(db, "tenant")
+    db.commit()
+    # Rows exist before the writes, as after the first report read
+    report_service = ReportService(db)
+    for owner_id in (owner.id, other_owner.id):
+        report_service.refresh_owner(owner_id)
+    for tenant_id in (tenant.id, other_tenant.id):
+        report_service.refresh_tenant(tenant_id)
+    return owner, other_owner, tenant, other_tenant
+
+
+def _assert_rollups_match_source(db, owners, tenants):
+    db.expire_all()
+    report_service = ReportService(db)
+    for owner in owners:
+        expected = {**report_service._owner_defaults(), **report_service._owner_aggregates(owner.id).get(owner.id, {})}
+        rollup = db.get(OwnerReportRollup, owner.id)
+        assert {column: getattr(rollup, column) for column in OWNER_COLUMNS} == pytest.approx(expected)
+    for tenant in tenants:
+        expected = {**report_service._tenant_defaults(), **report_service._tenant_aggregates(tenant.id).get(tenant.id, {})}
+        rollup = db.get(TenantReportRollup, tenant.id)
+        assert {column: getattr(rollup, column) for column in TENANT_COLUMNS} == pytest.approx(expected)
+
+
+def test_writes_keep_rollups_equal_to_a_recompute(db, parties):
+    owner, other_owner, tenant, other_tenant = parties
+    owners, tenants = (owner, other_owner), (tenant, other_tenant)
+
+    # Property, booking and invoice added in one flush
+    property_obj = _property(db, owner)
+    booking = Booking(
+        property=property_obj,
+        tenant_id=tenant.id,
+        start_date=datetime(2026, 1, 1),
+        total_price=1200.0,
+        status=BookingStatus.ACTIVE.value,
+    )
+    invoice = _invoice(booking, InvoiceStatus.OVERDUE.value)
+    db.add_all([booking, invoice])
+    db.commit()
+    _assert_rollups_match_source(db, owners, tenants)
+
+    payment = Payment(booking_id=booking.id, invoice_id=invoice.id, amount=1200.0, payment_method_id=1, status=PaymentStatus.PENDING)
+    db.add(payment)
+    db.commit()
+    _assert_rollups_match_source(db, owners, tenants)
+
+    # Status changes on expired objects, as the services make them
+    payment.status = PaymentStatus.COMPLETED
+    invoice.status = InvoiceStatus.PAID
+    db.commit()
+    _assert_rollups_match_source(db, owners, tenants)
+
+    booking.total_price = 900.0
+    db.commit()
+    _assert_rollups_match_source(db, owners, tenants)
+
+    # Moving the booking takes its payments and invoices along
+    other_property = _property(db, other_owner)
+    db.flush()
+    booking.property_id = other_property.id
+    booking.tenant_id = other_tenant.id
+    db.commit()
+    _assert_rollups_match_source(db, owners, tenants)
+
+    booking.status = BookingStatus.CLOSED.value
+    db.commit()
+    _assert_rollups_match_source(db, owners, tenants)
+
+    db.delete(invoice)
+    db.delete(payment)
+    db.commit()
+    _assert_rollups_match_source(db, owners, tenants)
+
+    db.delete(booking)
+    db.delete(property_obj)
+    db.commit()
+    _assert_rollups_match_source(db, owners, tenants)
+
+
+def test_rolled_back_write_leaves_rollups_alone(db, parties):
+    owner, _, tenant, _ = parties
+    before = db.get(OwnerReportRollup, owner.id).property_count
+    _property(db, owner)
+    db.flush()
+    db.rollback()
+    assert db.get(OwnerReportRollup, owner.id).property_count == before
+
+
+def test_write_by_another_worker_retires_cached_months(db, session_factory, parties):
+    owner, _, tenant, _ = parties
+    property_obj = _property(db, owner)
+    booking = Booking(
+        property=property_obj,
+        tenant_id=tenant.id,
+        start_date=datetime(2025, 1, 1),
+        total_price=1000.0,
+        status=BookingStatus.ACTIVE.value,
+    )
+    db.add(booking)
+    db.add(Payment(booking=booking, amount=100.0, payment_method_id=1, status=PaymentStatus.COMPLETED, payment_date=datetime(2025, 1, 15)))
+    db.commit()
+
+    def january_revenue():
+        series = ReportService(db).get_owner_timeseries(owner.id, date(2025, 1, 1), date(2025, 1, 31))
+        db.commit()
+        return series["buckets"][0]["revenue"]
+
+    assert january_revenue() == 100.0
+
+    # A payment and the version bump written the way another worker's
+    # transaction leaves them: nothing in this process is told about it
+    other_worker = session_factory()
+    other_worker.execute(
+        text(
+            "INSERT INTO payments (booking_id, amount, payment_method_id, status, payment_date) "
+            "VALUES (:booking_id, 50.0, 1, 'COMPLETED', '2025-01-20 00:00:00')"
+        ),
+        {"booking_id": booking.id},
+    )
+    other_worker.execute(
+        text("UPDATE owner_report_rollups SET version = version + 1 WHERE owner_id = :owner_id"),
+        {"owner_id": owner.id},
+    )
+    other_worker.commit()
+    other_worker.close()
+
+    assert january_revenue() == 150.0
+
+
+def test_moving_a_payment_or_repricing_an_invoice_retires_cached_months(db, parties):
+    owner, _, tenant, _ = parties
+    property_obj = _property(db, owner)
+    booking = Booking(
+        property=property_obj,
+        tenant_id=tenant.id,
+        start_date=datetime(2025, 1, 1),
+        total_price=1000.0,
+        status=BookingStatus.ACTIVE.value,
+    )
+    invoice = Invoice(
+        booking=booking,
+        amount=1000.0,
+        status=InvoiceStatus.PAID.value,
+        reference_number=uuid.uuid4().hex[:8],
+        month=date(2025, 1, 1),
+    )
+    payment = Payment(booking=booking, amount=100.0, payment_method_id=1, status=PaymentStatus.COMPLETED, payment_date=datetime(2025, 1, 15))
+    db.add_all([booking, invoice, payment])
+    db.commit()
+
+    def series():
+        buckets = ReportService(db).get_owner_timeseries(owner.id, date(2025, 1, 1), date(2025, 2, 28))["buckets"]
+        db.commit()
+        return [(bucket["revenue"], bucket["invoiced"]) for bucket in buckets]
+
+    assert series() == [(100.0, 1000.0), (0.0, 0.0)]
+
+    # Neither edit changes a rollup figure, only the months the series reads
+    payment.payment_date = datetime(2025, 2, 3)
+    db.commit()
+    assert series() == [(0.0, 1000.0), (100.0, 0.0)]
+
+    invoice.amount = 800.0
+    db.commit()
+    assert series() == [(0.0, 800.0), (100.0, 0.0)]
+
+
+def test_rebuild_keeps_owner_versions(db, parties):
+    owner = parties[0]
+    _property(db, owner)
+    db.commit()
+    version = db.get(OwnerReportRollup, owner.id).version
+    assert version > 0
+
+    ReportService(db).rebuild_rollups()
+    assert db.get(OwnerReportRollup, owner.id).version == version
+
+
+def test_registering_maintenance_again_does_not_double_count(db, parties):
+    owner = parties[0]
+    register_rollup_maintenance()
+    _property(db, owner)
+    db.commit()
+    _assert_rollups_match_source(db, [owner], [])
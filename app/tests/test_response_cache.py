@@ -0,0 +1,84 @@
+"""
+Tag invalidation across workers sharing the Redis tier.
+
+Each ResponseCache stands for one uvicorn worker; the workers share a
+fakeredis server, so invalidations travel over pubsub as in production.
+"""
+
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from services import cache_service  # noqa: E402
+from services.cache_service import CachedResponse, ResponseCache, property_tag  # noqa: E402
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        cache_service,
+        "redis",
+        SimpleNamespace(Redis=SimpleNamespace(from_url=lambda url: fakeredis.FakeRedis(server=server))),
+    )
+    route = f"test:{uuid.uuid4().hex[:8]}"
+    caches = [
+        ResponseCache(route, max_entries=100, ttl=60, enabled=True, shared_url="redis://test")
+        for _ in range(2)
+    ]
+    yield caches
+    for cache in caches:
+        cache.shared._listener.stop()
+
+
+def _wait_for_invalidation(cache, generation, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while cache.generation == generation:
+        assert time.monotonic() < deadline, "invalidation was not received"
+        time.sleep(0.01)
+
+
+def test_invalidation_on_another_worker_drops_local_copy(workers):
+    worker_a, worker_b = workers
+    key = worker_a.make_key(page=1)
+    worker_a.set(key, CachedResponse('"v1"', b"[]"), tags=[property_tag(1)])
+
+    generation = worker_a.generation
+    worker_b.invalidate([property_tag(1)])
+    _wait_for_invalidation(worker_a, generation)
+
+    assert worker_a.get(key) is None
+
+
+def test_entry_filled_from_shared_tier_is_invalidated_by_tag(workers):
+    worker_a, worker_b = workers
+    key = worker_a.make_key(page=1)
+    worker_b.set(key, CachedResponse('"v1"', b"[]"), tags=[property_tag(1)])
+
+    # Worker A serves the entry from Redis and keeps a local copy
+    assert worker_a.get(key) == CachedResponse('"v1"', b"[]")
+    assert key in worker_a.local.keys()
+
+    generation = worker_a.generation
+    worker_b.invalidate([property_tag(1)])
+    _wait_for_invalidation(worker_a, generation)
+
+    assert key not in worker_a.local.keys()
+    assert worker_a.get(key) is None
+
+
+def test_other_tags_keep_entry(workers):
+    worker_a, worker_b = workers
+    key = worker_a.make_key(page=1)
+    worker_b.set(key, CachedResponse('"v1"', b"[]"), tags=[property_tag(1)])
+    assert worker_a.get(key) is not None
+
+    generation = worker_a.generation
+    worker_b.invalidate([property_tag(2)])
+    _wait_for_invalidation(worker_a, generation)
+
+    assert worker_a.get(key) == CachedResponse('"v1"', b"[]")
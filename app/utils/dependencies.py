@@ -8,7 +8,7 @@ from typing import Optional
 
 from database.init import get_db
 from database.models.user_model import User
-from config import ALGORITHM, SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES
+from config import ALGORITHM, SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES, ADMIN_EMAILS
 
 from responses.error import unauthorized_error, not_found_error
 
@@ -79,3 +79,10 @@ def tenant_required(db: Session = Depends(get_db), current_user: User = Depends(
     if not is_tenant(current_user, db):
         raise HTTPException(status_code=403, detail="Only tenants can access this endpoint")
     return current_user
+
+
+def admin_required(current_user: User = Depends(get_current_user)):
+    """Dependency to ensure the current user is listed in ADMIN_EMAILS"""
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Only administrators can access this endpoint")
+    return current_user
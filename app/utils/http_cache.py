@@ -0,0 +1,52 @@
+"""
+Utility functions for HTTP conditional requests (ETag / If-None-Match).
+"""
+
+import hashlib
+from typing import Optional
+
+
+def body_etag(body: bytes) -> str:
+    """
+    Build a strong ETag from a serialized response body.
+
+    Any change to the representation changes the tag, however close together
+    two edits land.
+
+    Args:
+        body: The exact bytes sent to the client
+
+    Returns:
+        str: A quoted ETag (e.g., "3f2a...")
+    """
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses the weak comparison required for If-None-Match, so a W/ prefix added
+    by the compression middleware still matches the strong tag.
+
+    Args:
+        if_none_match: Raw If-None-Match header value, if any
+        etag: The current ETag of the resource
+
+    Returns:
+        bool: True if the client already has the current representation
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
@@ -0,0 +1,141 @@
+"""
+Non-blocking logging setup.
+
+Application threads only put records on an in-memory queue; a QueueListener
+thread formats them (JSON or text) and writes them to stdout and a rotating
+log file. Every record carries the correlation ID of the request it was
+logged in, set by RequestIdMiddleware.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import (
+    LOG_BACKUP_COUNT,
+    LOG_FILE,
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_MAX_BYTES,
+    LOG_QUEUE_SIZE,
+    LOG_ROTATE_WHEN,
+    LOG_ROTATION,
+    SQL_LOG_LEVEL,
+)
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the correlation ID of the request being handled."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any extra= fields merged in."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback in the calling thread (arguments may
+        # change after the call), but leave formatting to the listener thread
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never block a request on logging; drop the record instead
+            pass
+
+
+def _file_handler() -> logging.Handler:
+    if LOG_ROTATION == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            LOG_FILE, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", utc=True
+        )
+    return logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+
+
+def setup_logging() -> None:
+    """
+    Route all logging through a queue drained by a background listener.
+
+    Safe to call more than once; later calls are ignored.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    if LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+        )
+
+    handlers = [logging.StreamHandler()]
+    if LOG_FILE:
+        handlers.append(_file_handler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+    logging.getLogger("sqlalchemy.engine").setLevel(SQL_LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Write out the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,141 @@
+"""
+Prometheus metrics of the API worker, served on GET /metrics.
+
+Counters and histograms are updated where the work happens; gauges that
+describe state owned elsewhere (connection pool, search history buffer,
+recommendation model) are read by a collector at scrape time. Every worker
+process exposes its own series.
+"""
+
+import time
+from contextlib import contextmanager
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+# Request latencies from 5ms up to the slow report/search endpoints
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per request",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL per request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+EMAIL_OUTBOX_DEPTH = Gauge(
+    "email_outbox_depth",
+    "Emails handed to the mailer that have not been delivered yet",
+)
+EMAILS_SENT = Counter(
+    "emails_sent_total",
+    "Emails handed to the SMTP server",
+    ["outcome"],
+)
+RECOMMENDER_MATCH_DURATION = Histogram(
+    "recommender_match_duration_seconds",
+    "Time to match listings against the search history",
+    buckets=LATENCY_BUCKETS,
+)
+BOOKING_LOCK_CONFLICTS = Counter(
+    "booking_lock_conflicts_total",
+    "Booking inserts retried after a deadlock or lock wait timeout",
+)
+BACKGROUND_JOB_DURATION = Histogram(
+    "background_job_duration_seconds",
+    "Duration of scheduled and background jobs",
+    ["job"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+BACKGROUND_JOB_FAILURES = Counter(
+    "background_job_failures_total",
+    "Scheduled and background jobs that raised",
+    ["job"],
+)
+
+
+@contextmanager
+def time_job(job: str):
+    """Record the duration of a background job, and a failure when it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        BACKGROUND_JOB_FAILURES.labels(job).inc()
+        raise
+    finally:
+        BACKGROUND_JOB_DURATION.labels(job).observe(time.perf_counter() - started)
+
+
+class StateCollector:
+    """Gauges read from the connection pool, search history buffer and recommender at scrape time."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def describe(self):
+        # Without this the registry calls collect() once at registration
+        return []
+
+    def collect(self):
+        pool = self.engine.pool
+        # Only QueuePool reports usage; the SQLite test pools do not
+        if hasattr(pool, "checkedout"):
+            for name, value, help_text in (
+                ("db_pool_size", pool.size(), "Configured connection pool size"),
+                ("db_pool_checked_out", pool.checkedout(), "Connections in use"),
+                ("db_pool_checked_in", pool.checkedin(), "Idle connections in the pool"),
+                ("db_pool_overflow", max(pool.overflow(), 0), "Connections opened beyond the pool size"),
+            ):
+                yield GaugeMetricFamily(name, help_text, value=value)
+
+        from services.search_history_service import search_history_buffer
+
+        buffer = search_history_buffer.stats()
+        yield GaugeMetricFamily(
+            "search_history_buffer_pending", "Search events waiting to be written", value=buffer["pending"]
+        )
+        for key in ("written", "dropped", "failed"):
+            yield GaugeMetricFamily(
+                f"search_history_buffer_{key}", f"Search events {key} since worker start", value=buffer[key]
+            )
+
+        from services.recommendation_provider import recommendation_status
+
+        status = recommendation_status()
+        yield GaugeMetricFamily(
+            "recommender_model_age_seconds",
+            "Age of the loaded recommendation model (NaN when none is loaded)",
+            value=status["age_seconds"] if status["age_seconds"] is not None else float("nan"),
+        )
+        yield GaugeMetricFamily(
+            "recommender_model_fresh", "1 when the loaded model is within its maximum age", value=int(status["fresh"])
+        )
+
+
+_state_collector = None
+
+
+def register_state_collector(engine) -> None:
+    """Register the scrape-time gauges for ``engine`` once per process."""
+    global _state_collector
+    if _state_collector is None:
+        _state_collector = StateCollector(engine)
+        REGISTRY.register(_state_collector)
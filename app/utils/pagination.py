@@ -0,0 +1,146 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are ordered by one or more unique-together key columns, e.g. ``id`` or
+``(created_at, id)``. The cursor handed to the client is an opaque token that
+encodes the key values of the last row on the page; the next page starts
+strictly after it, so deep pages cost the same as the first one and rows do
+not shift when new records are inserted.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor that cannot be decoded."""
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def _key_names(keys: Sequence) -> List[str]:
+    return [key.key for key in keys]
+
+
+def encode_cursor(keys: Sequence, values: Sequence[Any]) -> str:
+    """
+    Encode the key values of a row into an opaque cursor.
+
+    Args:
+        keys: The key columns the page is ordered by
+        values: The values of those columns for the last row of the page
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = {
+        "k": _key_names(keys),
+        "v": [
+            value.isoformat() if isinstance(value, (date, datetime)) else value
+            for value in values
+        ],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor`` for the same key columns.
+
+    Args:
+        cursor: The cursor token sent by the client
+        keys: The key columns the page is ordered by
+
+    Returns:
+        List: The key values to continue after
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for
+            a different ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        names, raw_values = payload["k"], payload["v"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    if names != _key_names(keys) or len(raw_values) != len(keys):
+        raise InvalidCursorError("Pagination cursor does not match this listing")
+
+    values = []
+    for key, value in zip(keys, raw_values):
+        try:
+            python_type = key.type.python_type
+        except NotImplementedError:
+            python_type = None
+        try:
+            if value is not None and python_type in (datetime, date):
+                value = python_type.fromisoformat(value)
+            elif value is not None and python_type is int:
+                value = int(value)
+        except (ValueError, TypeError):
+            raise InvalidCursorError("Invalid pagination cursor")
+        values.append(value)
+    return values
+
+
+def _after_predicate(keys: Sequence, values: Sequence[Any]):
+    """Build ``(k1, k2, ...) > (v1, v2, ...)`` portably across dialects."""
+    clauses = []
+    for index, key in enumerate(keys):
+        equal_prefix = [keys[i] == values[i] for i in range(index)]
+        clauses.append(and_(*equal_prefix, key > values[index]))
+    return or_(*clauses)
+
+
+def paginate(
+    query: Query,
+    keys: Sequence,
+    limit: int,
+    after: Optional[str] = None,
+    skip: int = 0,
+) -> Page:
+    """
+    Fetch one page of ``query`` ordered by ``keys``.
+
+    When ``after`` is given the page starts right after that cursor and
+    ``skip`` is ignored; otherwise ``skip`` is applied as a plain offset so
+    existing clients keep working.
+
+    Args:
+        query: The filtered query to paginate (without ordering or limits)
+        keys: Key columns that uniquely identify a row, most significant first
+        limit: Maximum number of rows in the page
+        after: Cursor returned as ``next_cursor`` by the previous page
+        skip: Offset for clients that do not use cursors yet
+
+    Returns:
+        Page: The rows and the cursor of the next page (None on the last page)
+
+    Raises:
+        InvalidCursorError: If ``after`` cannot be decoded
+    """
+    query = query.order_by(*[key.asc() for key in keys])
+    if after:
+        query = query.filter(_after_predicate(keys, decode_cursor(after, keys)))
+    elif skip:
+        query = query.offset(skip)
+
+    # One extra row tells us whether there is a next page without a COUNT
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return Page(rows, None)
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, encode_cursor(keys, [getattr(last, key.key) for key in keys]))
@@ -0,0 +1,176 @@
+"""
+On-demand stack sampling profiler.
+
+An admin starts a session for the next N requests whose path matches a route
+(``/properties/search`` or a template like ``/properties/{property_id}``), or
+for a time window. While a matching request is in flight a background thread
+samples the stacks of every other thread, and the samples are returned in the
+folded format that flamegraph.pl, speedscope and inferno read.
+
+Nothing runs while no session is active: the middleware only checks
+``profiler.session``.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+# Leaf frames of threads that are idle (event loop waiting in select, threadpool
+# workers waiting for work); sampling them would bury the hot path
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py")
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _route_pattern(route: str):
+    # /properties/{property_id} matches /properties/12; plain paths match exactly
+    pattern = re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(route.rstrip("/") or "/"))
+    return re.compile(f"^{pattern}/?$")
+
+
+class ProfilingSession:
+    """One capture: which requests to profile, for how long, and the samples taken."""
+
+    def __init__(self, route: Optional[str], requests: Optional[int], seconds: float, interval_ms: float):
+        self.id = uuid.uuid4().hex[:12]
+        self.route = route
+        self.route_pattern = _route_pattern(route) if route else None
+        self.max_requests = requests
+        self.seconds = seconds
+        self.interval = interval_ms / 1000
+        self.started_at = datetime.now(timezone.utc)
+        self.deadline = time.monotonic() + seconds
+        self.stopped_at: Optional[datetime] = None
+        self.stop_reason: Optional[str] = None
+
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.requests_started = 0
+        self.requests_finished = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{self.id}", daemon=True)
+
+    @property
+    def active(self) -> bool:
+        return not self._stop.is_set()
+
+    def claim(self, path: str) -> bool:
+        """Whether a request for ``path`` is profiled; counts it against the request limit."""
+        if self.route_pattern is not None and not self.route_pattern.match(path):
+            return False
+        with self._lock:
+            if not self.active:
+                return False
+            if self.max_requests is not None and self.requests_started >= self.max_requests:
+                return False
+            self.requests_started += 1
+            self._in_flight += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.requests_finished += 1
+            done = self.max_requests is not None and self.requests_finished >= self.max_requests
+        if done:
+            self.stop("request limit reached")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, reason: str = "stopped") -> None:
+        with self._lock:
+            if self._stop.is_set():
+                return
+            self.stop_reason = reason
+            self.stopped_at = datetime.now(timezone.utc)
+            self._stop.set()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        # A route or request limit samples only while such a request runs;
+        # otherwise the whole window is sampled
+        window_only = self.route_pattern is None and self.max_requests is None
+        while not self._stop.wait(self.interval):
+            if time.monotonic() >= self.deadline:
+                self.stop("time window elapsed")
+                break
+            if not window_only and self._in_flight == 0:
+                continue
+            self._sample(own)
+
+    def _sample(self, own: int) -> None:
+        sampled = False
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own or os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+            sampled = True
+        if sampled:
+            self.sample_count += 1
+
+    def folded(self) -> str:
+        """Samples as ``frame;frame;frame count`` lines, hottest first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "active": self.active,
+            "route": self.route,
+            "max_requests": self.max_requests,
+            "seconds": self.seconds,
+            "interval_ms": self.interval * 1000,
+            "started_at": self.started_at.isoformat(),
+            "stopped_at": self.stopped_at.isoformat() if self.stopped_at else None,
+            "stop_reason": self.stop_reason,
+            "requests_profiled": self.requests_finished,
+            "samples": self.sample_count,
+            "distinct_stacks": len(self.samples),
+        }
+
+
+class Profiler:
+    """Holds the current profiling session of this worker; one at a time."""
+
+    def __init__(self):
+        self.session: Optional[ProfilingSession] = None
+        self._lock = threading.Lock()
+
+    def start(self, route: Optional[str], requests: Optional[int], seconds: float, interval_ms: float) -> ProfilingSession:
+        """
+        Start a new session, replacing a finished one.
+
+        Raises:
+            RuntimeError: If a session is still running
+        """
+        with self._lock:
+            if self.session is not None and self.session.active:
+                raise RuntimeError(f"Profiling session {self.session.id} is still running")
+            session = ProfilingSession(route, requests, seconds, interval_ms)
+            session.start()
+            self.session = session
+        return session
+
+    def stop(self) -> Optional[ProfilingSession]:
+        session = self.session
+        if session is not None:
+            session.stop()
+        return session
+
+
+profiler = Profiler()
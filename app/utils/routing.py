@@ -0,0 +1,40 @@
+"""
+Helpers for resolving the route template (e.g. /properties/{property_id})
+that handled a request, so per-route statistics don't explode in cardinality.
+"""
+
+from typing import Dict
+
+UNMATCHED_ROUTE = "unmatched"
+
+_endpoint_paths: Dict[int, Dict[object, str]] = {}
+
+
+def route_template(scope: dict) -> str:
+    """
+    Return the path template of the route that handled the request.
+
+    The router writes the matched endpoint back into the ASGI scope, so this
+    must be called after the downstream app has started responding.
+
+    Args:
+        scope: The ASGI scope of the request
+
+    Returns:
+        str: The route path template, or "unmatched" when no route handled it
+    """
+    router = scope.get("router")
+    endpoint = scope.get("endpoint")
+    if router is None or endpoint is None:
+        return UNMATCHED_ROUTE
+
+    paths = _endpoint_paths.get(id(router))
+    if paths is None:
+        paths = {}
+        for route in router.routes:
+            route_endpoint = getattr(route, "endpoint", None) or getattr(route, "app", None)
+            if route_endpoint is not None and hasattr(route, "path"):
+                paths.setdefault(route_endpoint, route.path or "/")
+        _endpoint_paths[id(router)] = paths
+
+    return paths.get(endpoint, UNMATCHED_ROUTE)
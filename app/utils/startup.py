@@ -0,0 +1,61 @@
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Records how long each phase of the worker boot took.
+
+    Phases are consecutive: ``mark(name)`` closes the phase that started at the
+    previous mark (or when the timer was created) and opens the next one.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._last = self._start
+        self.phases: List[Tuple[str, float]] = []
+        self.total: Optional[float] = None
+        self.details: Dict[str, Any] = {}
+
+    def mark(self, phase: str) -> float:
+        """
+        Close the current phase.
+
+        Args:
+            phase: Name of the phase that just finished
+
+        Returns:
+            float: Duration of the phase in seconds
+        """
+        now = time.perf_counter()
+        duration = now - self._last
+        self.phases.append((phase, duration))
+        self._last = now
+        return duration
+
+    def finish(self) -> float:
+        """Stop the timer and log the startup report."""
+        self.total = self._last - self._start
+        report = ", ".join(f"{name}={duration * 1000:.0f}ms" for name, duration in self.phases)
+        logger.info(f"Startup finished in {self.total * 1000:.0f}ms ({report})")
+        return self.total
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished": self.total is not None,
+            "total_ms": round(self.total * 1000, 1) if self.total is not None else None,
+            "phases": [
+                {"name": name, "duration_ms": round(duration * 1000, 1)}
+                for name, duration in self.phases
+            ],
+            **self.details,
+        }
+
+
+startup_timer = StartupTimer()